@@ -0,0 +1,90 @@
+"""Benchmark rejected calls per second for an open `CircuitBreaker`.
+
+Compares the default rejection path (warning log and formatted message per
+call) with ``fast_reject=True``. Log records are
+formatted and written to ``os.devnull`` so that the logging cost is included
+the way it would be in a service with a configured handler.
+
+Usage::
+
+    python benchmarks/circuit_breaker_reject.py [--calls N] [--repeats N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import time
+from typing import Any
+
+from frostbound.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerError
+
+
+def _noop() -> None:
+    return None
+
+
+def _open_breaker(fast_reject: bool) -> CircuitBreaker[None]:
+    breaker: CircuitBreaker[None] = CircuitBreaker(
+        failure_threshold=1,
+        reset_timeout_seconds=3600.0,
+        fast_reject=fast_reject,
+    )
+    breaker.state.record_failure()
+    return breaker
+
+
+def _rejections_per_second(fast_reject: bool, calls: int) -> float:
+    breaker = _open_breaker(fast_reject)
+    execute = breaker.execute
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        try:  # noqa: SIM105 - contextlib.suppress would dominate the measurement
+            execute(_noop)
+        except CircuitBreakerError:
+            pass
+    elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000, help="Rejected calls per repeat")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of repeats (best is reported)")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        root = logging.getLogger()
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+
+        results: dict[str, Any] = {}
+        for mode, fast_reject in (("default", False), ("fast_reject", True)):
+            rates = [_rejections_per_second(fast_reject, args.calls) for _ in range(args.repeats)]
+            results[mode] = {"best_calls_per_second": max(rates), "calls_per_second": rates}
+
+        root.removeHandler(handler)
+
+    results["speedup"] = results["fast_reject"]["best_calls_per_second"] / results["default"]["best_calls_per_second"]
+    print(
+        json.dumps(
+            {
+                "benchmark": "circuit_breaker_reject",
+                "python": platform.python_version(),
+                "calls": args.calls,
+                "repeats": args.repeats,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Benchmark suite for frostbound's own hot paths.
+
+Measures the per-call overhead of the library on its fast paths with
+:class:`frostbound.instrumentation.bench.BenchmarkRunner`:
+
+- ``retry.success``: a ``Retry``-decorated function that succeeds at once;
+- ``circuit_breaker.closed``: ``CircuitBreaker.execute`` in the closed state;
+- ``circuit_breaker.open`` / ``circuit_breaker.open_fast_reject``: rejected
+  calls in the open state, with and without ``fast_reject``
+  (see also ``circuit_breaker_reject.py`` for raw throughput);
+- ``immutable_proxy.getattr`` / ``immutable_proxy.iter``: attribute access on
+  and iteration over an ``ImmutableProxy``;
+- ``config_factory.create``: ``ConfigFactory.create`` of a small config;
+- ``experiment.record_metric``: ``Experiment.record_metric`` on local storage;
+- ``local_storage.save`` / ``local_storage.list``: ``LocalFileStorage``;
+- ``git_info.get``: ``get_git_info`` on this repository.
+
+Results are printed (or written with ``--output``) as JSON with a stable
+layout. With ``--baseline``, each benchmark is compared against the same
+benchmark in a previous results file; a summary is printed to stderr and the
+exit code is 1 if any benchmark regressed significantly by more than
+``--threshold``.
+
+Usage::
+
+    python benchmarks/suite.py [-k PATTERN] [--quick] [--output FILE]
+    python benchmarks/suite.py --baseline FILE [--threshold 0.10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from fractions import Fraction
+from pathlib import Path
+
+from frostbound.experiments.experiment import Experiment
+from frostbound.experiments.storage import LocalFileStorage
+from frostbound.instrumentation.bench import BenchmarkRunner, load_results
+from frostbound.proxy.immutable import ImmutableProxy
+from frostbound.pydanticonf.base import DynamicConfig
+from frostbound.pydanticonf.factory import ConfigFactory
+from frostbound.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from frostbound.resilience.retry import Retry
+from frostbound.versioning.git_info import get_git_info
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+Case = Callable[[], AbstractContextManager[Callable[[], object]]]
+BENCHMARKS: dict[str, Case] = {}
+
+
+def benchmark(name: str) -> Callable[[Case], Case]:
+    """Register a case: a context manager yielding the zero-argument callable to measure."""
+
+    def register(case: Case) -> Case:
+        BENCHMARKS[name] = case
+        return case
+
+    return register
+
+
+def _noop() -> None:
+    return None
+
+
+class FractionConfig(DynamicConfig[Fraction]):
+    target_: str = "fractions.Fraction"
+    numerator: int = 3
+    denominator: int = 4
+
+
+class Settings:
+    def __init__(self) -> None:
+        self.learning_rate = 0.001
+        self.layers = [64, 64, 32]
+
+
+@benchmark("retry.success")
+@contextmanager
+def _retry_success() -> Generator[Callable[[], object]]:
+    yield Retry(max_attempts=3)(_noop)
+
+
+@benchmark("circuit_breaker.closed")
+@contextmanager
+def _circuit_breaker_closed() -> Generator[Callable[[], object]]:
+    breaker: CircuitBreaker[None] = CircuitBreaker(failure_threshold=5)
+    yield lambda: breaker.execute(_noop)
+
+
+def _open_breaker_case(fast_reject: bool) -> Generator[Callable[[], object]]:
+    breaker: CircuitBreaker[None] = CircuitBreaker(
+        failure_threshold=1,
+        reset_timeout_seconds=3600.0,
+        fast_reject=fast_reject,
+    )
+    breaker.state.record_failure()
+    execute = breaker.execute
+
+    def rejected_call() -> None:
+        try:  # noqa: SIM105 - contextlib.suppress would dominate the measurement
+            execute(_noop)
+        except CircuitBreakerError:
+            pass
+
+    yield rejected_call
+
+
+@benchmark("circuit_breaker.open")
+@contextmanager
+def _circuit_breaker_open() -> Generator[Callable[[], object]]:
+    yield from _open_breaker_case(fast_reject=False)
+
+
+@benchmark("circuit_breaker.open_fast_reject")
+@contextmanager
+def _circuit_breaker_open_fast_reject() -> Generator[Callable[[], object]]:
+    yield from _open_breaker_case(fast_reject=True)
+
+
+@benchmark("immutable_proxy.getattr")
+@contextmanager
+def _immutable_proxy_getattr() -> Generator[Callable[[], object]]:
+    proxy = ImmutableProxy(Settings())
+    yield lambda: proxy.learning_rate
+
+
+@benchmark("immutable_proxy.iter")
+@contextmanager
+def _immutable_proxy_iter() -> Generator[Callable[[], object]]:
+    proxy = ImmutableProxy(list(range(100)))
+    yield lambda: list(proxy)
+
+
+@benchmark("config_factory.create")
+@contextmanager
+def _config_factory_create() -> Generator[Callable[[], object]]:
+    config = FractionConfig()
+    yield lambda: ConfigFactory.create(config)
+
+
+@benchmark("experiment.record_metric")
+@contextmanager
+def _experiment_record_metric() -> Generator[Callable[[], object]]:
+    with tempfile.TemporaryDirectory() as directory:
+        experiment = Experiment(experiment_id="bench", storage=LocalFileStorage(directory))
+        yield lambda: experiment.record_metric("loss", 0.25)
+
+
+@benchmark("local_storage.save")
+@contextmanager
+def _local_storage_save() -> Generator[Callable[[], object]]:
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source.bin"
+        source.write_bytes(os.urandom(4096))
+        storage = LocalFileStorage(Path(directory) / "store")
+        yield lambda: storage.save("bench/artifacts/file.bin", source)
+
+
+@benchmark("local_storage.list")
+@contextmanager
+def _local_storage_list() -> Generator[Callable[[], object]]:
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source.bin"
+        source.write_bytes(b"x")
+        storage = LocalFileStorage(Path(directory) / "store")
+        for index in range(200):
+            storage.save(f"bench/artifacts/{index // 20}/file_{index}.bin", source)
+        yield lambda: storage.list("bench/artifacts")
+
+
+@benchmark("git_info.get")
+@contextmanager
+def _git_info_get() -> Generator[Callable[[], object]]:
+    yield lambda: get_git_info(REPO_ROOT)
+
+
+def _summarize(runner: BenchmarkRunner, threshold: float) -> bool:
+    """Print the baseline comparisons to stderr and return whether any regressed."""
+    regressed = False
+    for comparison in runner.comparisons:
+        status = "unchanged"
+        if comparison.significant and comparison.ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressed = True
+        elif comparison.significant and comparison.ratio < 1 - threshold:
+            status = "improvement"
+        print(
+            f"{comparison.candidate:<36} {comparison.ratio:6.3f}x  p={comparison.p_value:.4f}  {status}",
+            file=sys.stderr,
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    parser.add_argument("--quick", action="store_true", help="Fewer and shorter samples, for smoke runs")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="Compare against results from a previous run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as regression")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return
+
+    runner = BenchmarkRunner()
+    if args.quick:
+        runner.repeats, runner.warmup, runner.target_sample_seconds = 7, 1, 0.005
+    baseline = load_results(args.baseline) if args.baseline else {}
+
+    # NOTE: Route library logging (e.g. breaker rejections) to a formatted null
+    # handler, so its cost is measured the way it is with a configured handler
+    # and the output stays machine-readable.
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        root = logging.getLogger()
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        try:
+            for name in names:
+                print(f"running {name}", file=sys.stderr)
+                with BENCHMARKS[name]() as func:
+                    result = runner.run(func, name=name)
+                if name in baseline:
+                    runner.compare(baseline[name], result)
+        finally:
+            root.removeHandler(handler)
+
+    if args.output is not None:
+        runner.write_json(args.output)
+    else:
+        print(runner.to_json())
+
+    if baseline and _summarize(runner, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
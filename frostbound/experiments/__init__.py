@@ -1,5 +1,7 @@
 from frostbound.experiments.builder import ExperimentBuilder
+from frostbound.experiments.content_store import ContentAddressedStorage
 from frostbound.experiments.experiment import Experiment
+from frostbound.experiments.metric_log import MetricLogReader, MetricLogWriter
 from frostbound.experiments.models import (
     ArtifactMetadata,
     ExperimentConfig,
@@ -7,18 +9,33 @@ from frostbound.experiments.models import (
 )
 from frostbound.experiments.protocols import (
     ExperimentProtocol,
+    ExtendedStorageBackend,
+    SeekableStorageBackend,
     StorageBackend,
 )
-from frostbound.experiments.storage import InMemoryStorage, LocalFileStorage
+from frostbound.experiments.series import MetricSeries
+from frostbound.experiments.storage import InMemoryStorage, LegacyStorageAdapter, LocalFileStorage
+from frostbound.experiments.upload import ArtifactProgress, ArtifactUploadError
+from frostbound.experiments.writer import BackgroundWriter
 
 __all__ = [
     "ArtifactMetadata",
+    "ArtifactProgress",
+    "ArtifactUploadError",
+    "BackgroundWriter",
+    "ContentAddressedStorage",
     "Experiment",
     "ExperimentBuilder",
     "ExperimentConfig",
     "ExperimentMetadataModel",
     "ExperimentProtocol",
+    "ExtendedStorageBackend",
     "InMemoryStorage",
+    "LegacyStorageAdapter",
     "LocalFileStorage",
+    "MetricLogReader",
+    "MetricLogWriter",
+    "MetricSeries",
+    "SeekableStorageBackend",
     "StorageBackend",
 ]
@@ -20,6 +20,7 @@ class FileNames(str, Enum):
     EXPERIMENT_METADATA = "experiment.json"
     PARAMETERS = "parameters.json"
     METRICS_SUMMARY = "summary.json"
+    METRICS_SERIES = "series.bin"
 
     def __str__(self) -> str:
         return self.value
@@ -56,6 +57,27 @@ EMPTY_STRING = ""
 class StorageBackends(str, Enum):
     LOCAL = "local"
     MEMORY = "memory"
+    CONTENT_ADDRESSED = "content_addressed"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Durability(str, Enum):
+    NONE = "none"
+    FSYNC = "fsync"
+    GROUP_COMMIT = "group_commit"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class IngestMode(str, Enum):
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY_FILE_RANGE = "copy_file_range"
+    COPY = "copy"
+    DEDUPLICATED = "deduplicated"
 
     def __str__(self) -> str:
         return self.value
@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import types
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Self
+
+from frostbound.experiments.constants import IngestMode
+from frostbound.experiments.durability import create_temp, temp_path_for
+from frostbound.experiments.ingest import ingest_file
+from frostbound.experiments.protocols import ExtendedStorageBackend
+from frostbound.experiments.types import StorageKey
+
+if TYPE_CHECKING:
+    from hashlib import _Hash
+
+    from _typeshed import ReadableBuffer, WriteableBuffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALGORITHM = "sha256"
+_READ_SIZE = 1 << 20
+_INDEX_FILE = "index.sqlite"
+_BLOBS_DIR = "blobs"
+# NOTE: Hardlinks are left out: a stored blob is shared by every key holding the
+# same content, so a link to a file the caller may modify would corrupt them all.
+_INGEST_MODES = (IngestMode.REFLINK, IngestMode.COPY_FILE_RANGE, IngestMode.COPY)
+
+# NOTE: ContentAddressedStorage.list() shadows the builtin in the class body.
+_Paths = list[Path]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL, refcount INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY, size INTEGER NOT NULL, blobs TEXT NOT NULL, refcount INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (key TEXT PRIMARY KEY, digest TEXT NOT NULL);
+"""
+
+
+class ContentAddressedStorage(ExtendedStorageBackend):
+    """
+    Storage backend keeping each distinct content once, however many keys hold it.
+
+    Content is stored in immutable blob files named by their hash. Every key refers
+    to an object (the hash of its whole content) made of one blob, or of several
+    fixed-size chunk blobs when ``chunk_size`` is set. An SQLite index under
+    ``base_dir`` maps keys to objects and counts the references to objects and blobs;
+    a blob file is deleted when its last reference goes.
+
+    Parameters
+    ----------
+    base_dir : Path | str
+        Directory holding the index and the blobs, created if missing.
+    chunk_size : int | None, optional
+        Split content into chunks of this many bytes, stored and deduplicated one by
+        one, so files differing in a few chunks share the others, by default None
+        (whole files)
+    algorithm : str, optional
+        ``hashlib`` algorithm naming the content, by default ``"sha256"``
+
+    Examples
+    --------
+    >>> storage = ContentAddressedStorage("runs/cas")
+    >>> experiment = Experiment("llama_0250609_122016", storage)
+    >>> experiment.save_artifact("data/tokenizer.json")  # stored
+    >>> other = Experiment("llama_0250609_131544", storage)
+    >>> other.save_artifact("data/tokenizer.json")  # hashed, no bytes written
+    >>> other.artifact_metadata["llama_0250609_131544/artifacts/tokenizer.json"].checksum
+    'sha256:5a1c...'
+    >>> storage.stats()
+    {'keys': 2, 'objects': 1, 'blobs': 1, 'logical_bytes': 4213, 'stored_bytes': 4213}
+
+    Notes
+    -----
+    - **Ingest**: Without chunking, ingesting a file costs one hash pass; only new
+      content is then cloned or copied in and hashed again, so a file modified
+      meanwhile is stored under the hash of the bytes actually copied. With chunking,
+      the file is read once and new chunks are written from memory
+    - **Concurrency**: Safe across threads and processes; hashing and copying run
+      outside the index transaction
+    - **Chunking**: Fixed-size chunks share data between files whose changes do not
+      shift the bytes after them, such as checkpoints updated in place
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        chunk_size: int | None = None,
+        algorithm: str = DEFAULT_ALGORITHM,
+    ) -> None:
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        hashlib.new(algorithm)
+        self.base_dir = Path(base_dir)
+        self.chunk_size = chunk_size
+        self.algorithm = algorithm
+        self._blobs_dir = self.base_dir / _BLOBS_DIR
+        self._blobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.base_dir / _INDEX_FILE, timeout=60.0, isolation_level=None, check_same_thread=False
+        )
+        # NOTE: WAL lets readers run while another process commits; NORMAL
+        # synchronization cannot corrupt the index, only lose its last commits.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index."""
+        with self._lock:
+            self._connection.close()
+
+    def save(self, key: StorageKey, path: Path) -> None:
+        self.ingest(key, path)
+
+    def ingest(self, key: StorageKey, path: Path) -> IngestMode:
+        """
+        Store the file at ``path`` under ``key``, writing only content not stored yet.
+
+        Returns
+        -------
+        IngestMode
+            ``IngestMode.DEDUPLICATED`` if no new bytes were stored, otherwise how the
+            new content was brought in.
+        """
+        path = Path(path)
+        if self.chunk_size is not None:
+            with open(path, "rb") as source, self._build() as builder:
+                while data := source.read(self.chunk_size):
+                    builder.write(data)
+                builder.commit(key)
+            return IngestMode.COPY if builder.stored else IngestMode.DEDUPLICATED
+
+        with open(path, "rb") as source:
+            digest = hashlib.file_digest(source, self.algorithm).hexdigest()
+        if self._add_ref(key, digest):
+            return IngestMode.DEDUPLICATED
+
+        temp_path, fd = create_temp(self._blobs_dir / digest)
+        os.close(fd)
+        try:
+            mode = ingest_file(path, temp_path, _INGEST_MODES)
+            # NOTE: Clones and in-kernel copies never pass the bytes through here, so
+            # the copy is hashed again to name the blob after what it really holds.
+            with open(temp_path, "rb") as copy:
+                copied_digest = hashlib.file_digest(copy, self.algorithm).hexdigest()
+            if copied_digest != digest:
+                logger.warning(f"'{path}' changed while being stored under '{key}', storing the copied content")
+                digest = copied_digest
+            if not self._add_object(key, digest, temp_path.stat().st_size, [(digest, temp_path)]):
+                mode = IngestMode.DEDUPLICATED
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return mode
+
+    def load(self, key: StorageKey, path: Path) -> None:
+        blobs = self._blob_paths(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if len(blobs) == 1:
+            ingest_file(blobs[0], path, _INGEST_MODES)
+            return
+        with self.open_read(key) as source, open(path, "wb") as destination:
+            while data := source.read(_READ_SIZE):
+                destination.write(data)
+
+    def exists(self, key: StorageKey) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM refs WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def delete(self, key: StorageKey) -> None:
+        with self._transaction() as (connection, unused_blobs):
+            row = connection.execute("SELECT digest FROM refs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            connection.execute("DELETE FROM refs WHERE key = ?", (key,))
+            unused_blobs.extend(self._release_object(connection, row[0]))
+
+    def list(self, prefix: StorageKey) -> list[StorageKey]:
+        keys: list[StorageKey] = []
+        with self._lock:
+            for (key,) in self._connection.execute("SELECT key FROM refs WHERE key >= ? ORDER BY key", (prefix,)):
+                if not key.startswith(prefix):
+                    break
+                keys.append(key)
+        return keys
+
+    def put_bytes(self, key: StorageKey, data: bytes) -> None:
+        with self._build() as builder:
+            builder.write(data)
+            builder.commit(key)
+
+    def get_bytes(self, key: StorageKey) -> bytes:
+        with self.open_read(key) as file:
+            return file.read()
+
+    def open_write(self, key: StorageKey) -> BinaryIO:
+        return _ContentWriter(self._build(), key)
+
+    def open_read(self, key: StorageKey) -> BinaryIO:
+        blobs = self._blob_paths(key)
+        if len(blobs) == 1:
+            return open(blobs[0], "rb")
+        return io.BufferedReader(_ConcatenatedReader(blobs))
+
+    def checksum(self, key: StorageKey) -> str | None:
+        """Return the hash of the content of ``key`` as ``"<algorithm>:<hex digest>"``."""
+        with self._lock:
+            row = self._connection.execute("SELECT digest FROM refs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Key not found: {key}")
+        return f"{self.algorithm}:{row[0]}"
+
+    def stats(self) -> dict[str, int]:
+        """
+        Count keys, distinct objects and blobs, and the bytes they represent and take.
+
+        Returns
+        -------
+        dict[str, int]
+            ``keys``, ``objects``, ``blobs``, ``logical_bytes`` (content size summed
+            over keys) and ``stored_bytes`` (size of the blob files).
+        """
+        with self._lock:
+            keys, logical = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(objects.size), 0) FROM refs JOIN objects USING (digest)"
+            ).fetchone()
+            objects = self._connection.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+            blobs, stored = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return {"keys": keys, "objects": objects, "blobs": blobs, "logical_bytes": logical, "stored_bytes": stored}
+
+    def _build(self) -> _ObjectBuilder:
+        return _ObjectBuilder(self)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blobs_dir / digest[:2] / digest
+
+    def _blob_paths(self, key: StorageKey) -> _Paths:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT objects.blobs FROM refs JOIN objects USING (digest) WHERE refs.key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Key not found: {key}")
+        return [self._blob_path(digest) for digest in json.loads(row[0])]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[tuple[sqlite3.Connection, _Paths]]:
+        """Run a write transaction, deleting the blob files listed in it once committed."""
+        unused_blobs: list[Path] = []
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection, unused_blobs
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            if unused_blobs:
+                self._delete_blob_files(connection, unused_blobs)
+
+    def _delete_blob_files(self, connection: sqlite3.Connection, blob_paths: _Paths) -> None:
+        """Delete the files of blobs that are still not in the index."""
+        # NOTE: Another process may have stored the same content again since the
+        # commit. Stores move blob files into place inside a write transaction, so
+        # holding one while checking the index makes the check and unlink atomic.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for blob_path in blob_paths:
+                if connection.execute("SELECT 1 FROM blobs WHERE digest = ?", (blob_path.name,)).fetchone() is None:
+                    blob_path.unlink(missing_ok=True)
+        finally:
+            connection.execute("COMMIT")
+
+    def _add_ref(self, key: StorageKey, digest: str) -> bool:
+        """Point ``key`` at an existing object, returning False if it is not stored."""
+        with self._transaction() as (connection, unused_blobs):
+            if connection.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone() is None:
+                return False
+            unused_blobs.extend(self._set_ref(connection, key, digest))
+            return True
+
+    def _add_object(self, key: StorageKey, digest: str, size: int, blobs: Sequence[tuple[str, Path | None]]) -> bool:
+        """
+        Point ``key`` at an object made of ``blobs``, storing it if needed.
+
+        ``blobs`` pairs each blob digest with a temp file holding its content, moved
+        into place if the blob is not stored, or with None if an earlier entry has the
+        same digest. Returns whether any blob file was moved into place.
+        """
+        stored = False
+        with self._transaction() as (connection, unused_blobs):
+            if connection.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone() is None:
+                for blob_digest, temp_path in blobs:
+                    updated = connection.execute(
+                        "UPDATE blobs SET refcount = refcount + 1 WHERE digest = ?", (blob_digest,)
+                    ).rowcount
+                    if updated:
+                        continue
+                    if temp_path is None:
+                        raise FileNotFoundError(f"Blob {blob_digest} of '{key}' has no content to store")
+                    blob_path = self._blob_path(blob_digest)
+                    blob_path.parent.mkdir(exist_ok=True)
+                    size_bytes = temp_path.stat().st_size
+                    os.replace(temp_path, blob_path)
+                    connection.execute("INSERT INTO blobs VALUES (?, ?, 1)", (blob_digest, size_bytes))
+                    stored = True
+                connection.execute(
+                    "INSERT INTO objects VALUES (?, ?, ?, 0)",
+                    (digest, size, json.dumps([blob_digest for blob_digest, _ in blobs])),
+                )
+            unused_blobs.extend(self._set_ref(connection, key, digest))
+        return stored
+
+    def _has_blob(self, digest: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def _set_ref(self, connection: sqlite3.Connection, key: StorageKey, digest: str) -> _Paths:
+        """Point ``key`` at ``digest`` and return the blob files no longer referenced."""
+        row = connection.execute("SELECT digest FROM refs WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[0] == digest:
+            return []
+        connection.execute("INSERT OR REPLACE INTO refs VALUES (?, ?)", (key, digest))
+        connection.execute("UPDATE objects SET refcount = refcount + 1 WHERE digest = ?", (digest,))
+        return self._release_object(connection, row[0]) if row is not None else []
+
+    def _release_object(self, connection: sqlite3.Connection, digest: str) -> _Paths:
+        """Drop a reference to an object and return the blob files no longer referenced."""
+        connection.execute("UPDATE objects SET refcount = refcount - 1 WHERE digest = ?", (digest,))
+        row = connection.execute("SELECT refcount, blobs FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None or row[0] > 0:
+            return []
+        connection.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+        unused_blobs: list[Path] = []
+        for blob_digest in json.loads(row[1]):
+            connection.execute("UPDATE blobs SET refcount = refcount - 1 WHERE digest = ?", (blob_digest,))
+            if connection.execute("DELETE FROM blobs WHERE digest = ? AND refcount <= 0", (blob_digest,)).rowcount:
+                unused_blobs.append(self._blob_path(blob_digest))
+        return unused_blobs
+
+
+class _ObjectBuilder:
+    """Hash content as it is written and store it as an object once committed."""
+
+    def __init__(self, storage: ContentAddressedStorage) -> None:
+        self.storage = storage
+        self.stored = False
+        self._hash: _Hash = hashlib.new(storage.algorithm)
+        self._size = 0
+        self._blobs: list[tuple[str, Path | None]] = []
+        self._new_chunks: set[str] = set()
+        self._temp_paths: list[Path] = []
+        self._chunk = bytearray()
+        self._file: BinaryIO | None = None
+        if storage.chunk_size is None:
+            temp_path, fd = create_temp(storage._blobs_dir / "object")
+            self._temp_paths.append(temp_path)
+            self._file = io.BufferedWriter(io.FileIO(fd, "w"))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, data: bytes | memoryview) -> int:
+        self._hash.update(data)
+        self._size += len(data)
+        if self._file is not None:
+            return self._file.write(data)
+
+        chunk_size = self.storage.chunk_size or 0
+        view = memoryview(data)
+        while view:
+            taken = view[: chunk_size - len(self._chunk)]
+            self._chunk += taken
+            view = view[len(taken) :]
+            if len(self._chunk) == chunk_size:
+                self._flush_chunk()
+        return len(data)
+
+    def commit(self, key: StorageKey) -> str:
+        """Store the content written so far under ``key`` and return its digest."""
+        digest = self._hash.hexdigest()
+        if self._file is not None:
+            self._file.close()
+            self._blobs = [(digest, self._temp_paths[0])]
+        elif self._chunk:
+            self._flush_chunk()
+        self.stored = self.storage._add_object(key, digest, self._size, self._blobs)
+        return digest
+
+    def close(self) -> None:
+        """Delete the temp files of blobs that were not needed."""
+        if self._file is not None:
+            self._file.close()
+        for temp_path in self._temp_paths:
+            temp_path.unlink(missing_ok=True)
+
+    def _flush_chunk(self) -> None:
+        chunk = bytes(self._chunk)
+        self._chunk.clear()
+        digest = hashlib.new(self.storage.algorithm, chunk).hexdigest()
+        if digest in self._new_chunks:
+            self._blobs.append((digest, None))
+            return
+        self._new_chunks.add(digest)
+        if self.storage._has_blob(digest):
+            # NOTE: Another process may delete the blob before this object is stored;
+            # a link to its file, which never changes, then stores it again for free.
+            temp_path = temp_path_for(self.storage._blobs_dir / digest)
+            try:
+                os.link(self.storage._blob_path(digest), temp_path)
+            except OSError as e:
+                logger.debug(f"Cannot link blob {digest}, writing it again: {e}")
+            else:
+                self._temp_paths.append(temp_path)
+                self._blobs.append((digest, temp_path))
+                return
+        temp_path, fd = create_temp(self.storage._blobs_dir / digest)
+        self._temp_paths.append(temp_path)
+        with open(fd, "wb") as file:
+            file.write(chunk)
+        self._blobs.append((digest, temp_path))
+
+
+class _BuilderStream(io.RawIOBase):
+    """Raw stream feeding everything written to an :class:`_ObjectBuilder`."""
+
+    def __init__(self, builder: _ObjectBuilder) -> None:
+        self._builder = builder
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: ReadableBuffer, /) -> int:
+        return self._builder.write(memoryview(data))
+
+
+class _ContentWriter(io.BufferedWriter):
+    """Writable file storing its content under a key when closed."""
+
+    def __init__(self, builder: _ObjectBuilder, key: StorageKey) -> None:
+        super().__init__(_BuilderStream(builder))
+        self._builder = builder
+        self._key = key
+        self._discarded = False
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            self._discarded = True
+        self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            try:
+                if not self._discarded:
+                    self.flush()
+            finally:
+                super().close()
+            if not self._discarded:
+                self._builder.commit(self._key)
+        finally:
+            self._builder.close()
+
+
+class _ConcatenatedReader(io.RawIOBase):
+    """Raw stream reading several blob files in turn."""
+
+    def __init__(self, paths: Sequence[Path]) -> None:
+        self._paths = list(paths)
+        self._index = 0
+        self._file: io.FileIO | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer, /) -> int:
+        while self._index < len(self._paths):
+            if self._file is None:
+                self._file = io.FileIO(self._paths[self._index], "r")
+            read = self._file.readinto(buffer)
+            if read:
+                return read
+            self._file.close()
+            self._file = None
+            self._index += 1
+        return 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import io
+import logging
+import os
+import secrets
+import threading
+import time
+import types
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+logger = logging.getLogger(__name__)
+
+TEMP_SUFFIX = ".partial"
+DEFAULT_COMMIT_INTERVAL_SECONDS = 0.1
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def is_temp_path(path: Path) -> bool:
+    """Whether ``path`` is a temp file of a write still in progress."""
+    return path.name.startswith(".") and path.name.endswith(TEMP_SUFFIX)
+
+
+def temp_path_for(target: Path) -> Path:
+    """Return an unused temp file path next to ``target``, without creating it."""
+    return target.with_name(f".{target.name}.{secrets.token_hex(4)}{TEMP_SUFFIX}")
+
+
+def create_temp(target: Path) -> tuple[Path, int]:
+    """
+    Create an empty temp file next to ``target``, creating missing parents.
+
+    The temp file lives in the target's directory, so moving it onto the target is a
+    rename within one filesystem and therefore atomic.
+
+    Returns
+    -------
+    tuple[Path, int]
+        Path of the temp file and a descriptor open for writing.
+    """
+    temp = temp_path_for(target)
+    try:
+        return temp, os.open(temp, _TEMP_FLAGS, 0o666)
+    except FileNotFoundError:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return temp, os.open(temp, _TEMP_FLAGS, 0o666)
+
+
+def fsync_path(path: Path) -> None:
+    """Flush the content of the file at ``path`` to disk."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush the entries of ``directory`` to disk, making renames into it durable."""
+    if os.name != "posix":
+        # NOTE: Directories cannot be opened on Windows, where NTFS journals renames.
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class AtomicFile(io.BufferedWriter):
+    """
+    Binary file written to a temp file and moved onto its target when closed.
+
+    Readers see either the previous content of the target or the complete new one,
+    never a partial write. Leaving a ``with`` block with an exception, or calling
+    :meth:`discard`, deletes the temp file and leaves the target untouched.
+
+    Parameters
+    ----------
+    target : Path
+        File replaced on close.
+    publish : Callable[[Path, Path], None]
+        Called with the temp file and the target once the temp file is closed; moves
+        the former onto the latter.
+    fsync : bool, optional
+        Flush the content to disk before closing, by default False
+    """
+
+    def __init__(self, target: Path, publish: Callable[[Path, Path], None], fsync: bool = False) -> None:
+        self.target = target
+        self.temp_path, fd = create_temp(target)
+        super().__init__(io.FileIO(fd, "w"))
+        self._publish = publish
+        self._fsync = fsync
+        self._discarded = False
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            self._discarded = True
+        self.close()
+
+    def discard(self) -> None:
+        """Close the file without replacing the target."""
+        self._discarded = True
+        self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            try:
+                if not self._discarded:
+                    self.flush()
+                    if self._fsync:
+                        os.fsync(self.fileno())
+            finally:
+                super().close()
+            if not self._discarded:
+                self._publish(self.temp_path, self.target)
+                return
+        except BaseException:
+            self.temp_path.unlink(missing_ok=True)
+            raise
+        self.temp_path.unlink(missing_ok=True)
+
+
+class InPlaceFile(io.BufferedRandom):
+    """
+    Binary file read and written in place, created if missing.
+
+    Unlike :class:`AtomicFile`, a crash can leave a partial write behind, so it suits
+    formats that stay readable when their last append is torn, such as the metric log
+    of :class:`~frostbound.experiments.metric_log.MetricLogWriter`.
+
+    Parameters
+    ----------
+    path : Path
+        File to open for reading and writing.
+    fsync : bool, optional
+        Flush the content, and the directory entry of a created file, to disk before
+        closing, by default False
+    """
+
+    def __init__(self, path: Path, fsync: bool = False) -> None:
+        self.path = path
+        flags = os.O_RDWR | getattr(os, "O_BINARY", 0)
+        try:
+            fd = os.open(path, flags | os.O_CREAT | os.O_EXCL, 0o666)
+            self._created = True
+        except FileExistsError:
+            fd = os.open(path, flags)
+            self._created = False
+        super().__init__(io.FileIO(fd, "r+"))
+        self._fsync = fsync
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.flush()
+            if self._fsync:
+                os.fsync(self.fileno())
+        finally:
+            super().close()
+        if self._fsync and self._created:
+            fsync_directory(self.path.parent)
+
+
+class GroupCommitter:
+    """
+    Move written temp files onto their targets in batches sharing one disk flush.
+
+    Submitted temp files are committed every ``interval_seconds``: every temp file of
+    the batch is flushed to disk and renamed onto its target, then each directory
+    involved is flushed once. Until then the target keeps
+    its previous content, but :meth:`open` and :meth:`resolve` already return the
+    pending one, so a process reads its own writes.
+
+    Parameters
+    ----------
+    interval_seconds : float, optional
+        Longest time a write waits for its batch, by default 0.1
+
+    Notes
+    -----
+    - **Crash safety**: A crash loses at most the last ``interval_seconds`` of writes;
+      every target holds a complete version, either the old or the new one
+    - **Errors**: A failing commit is logged and raised by the next :meth:`sync`
+    - **Exit**: Pending writes are committed when the interpreter exits normally
+    """
+
+    def __init__(self, interval_seconds: float = DEFAULT_COMMIT_INTERVAL_SECONDS) -> None:
+        self.interval_seconds = interval_seconds
+        self._pending: dict[Path, Path] = {}
+        self._submitted = 0
+        self._committed = 0
+        self._committing = False
+        self._urgent = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, temp: Path, target: Path) -> None:
+        """Queue ``temp`` to replace ``target``, superseding any queued write of ``target``."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("GroupCommitter is closed")
+            superseded = self._pending.get(target)
+            self._pending[target] = temp
+            self._submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            if len(self._pending) == 1:
+                self._condition.notify_all()
+        if superseded is not None:
+            superseded.unlink(missing_ok=True)
+
+    def resolve(self, target: Path) -> Path:
+        """Return the file holding the latest content of ``target``."""
+        with self._condition:
+            return self._pending.get(target, target)
+
+    def open(self, target: Path) -> BinaryIO:
+        """Open the latest content of ``target`` for reading."""
+        # NOTE: Opening under the lock keeps the commit from renaming the file away
+        # in between; the open file survives the rename.
+        with self._condition:
+            return open(self._pending.get(target, target), "rb")
+
+    def is_pending(self, target: Path) -> bool:
+        """Whether a write of ``target`` is waiting for its batch."""
+        with self._condition:
+            return target in self._pending
+
+    def pending_targets(self) -> list[Path]:
+        """Return the targets with a write waiting for its batch."""
+        with self._condition:
+            return list(self._pending)
+
+    def discard(self, target: Path) -> None:
+        """Drop the queued write of ``target``, if any."""
+        with self._condition:
+            temp = self._pending.pop(target, None)
+            if not self._pending:
+                # NOTE: The discarded write was counted as submitted but will never
+                # be committed; wake sync(), which has nothing left to wait for.
+                self._condition.notify_all()
+        if temp is not None:
+            temp.unlink(missing_ok=True)
+
+    def sync(self) -> None:
+        """
+        Commit every write submitted so far and wait until it is durable.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a commit since the last sync.
+        """
+        with self._condition:
+            submitted = self._submitted
+            self._urgent = True
+            self._condition.notify_all()
+            while (
+                self._committed < submitted
+                and (self._pending or self._committing)
+                and self._thread is not None
+                and self._thread.is_alive()
+            ):
+                self._condition.wait()
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Commit pending writes and stop the commit thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+            atexit.unregister(self.close)
+        with self._condition:
+            error, self._error = self._error, None
+        if error is not None:
+            logger.warning(f"Error in group commit: {error}")
+
+    def _next_batch(self) -> tuple[dict[Path, Path], int] | None:
+        """Wait for a batch to be due and return it with the submission count it covers."""
+        with self._condition:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+            deadline = time.monotonic() + self.interval_seconds
+            while not self._urgent and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            self._urgent = False
+            self._committing = True
+            return dict(self._pending), self._submitted
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            pending, submitted = batch
+            try:
+                self._commit(pending)
+            except Exception as e:
+                logger.warning(f"Error committing {len(pending)} writes: {e}")
+                with self._condition:
+                    if self._error is None:
+                        self._error = e
+            with self._condition:
+                self._committed = submitted
+                self._committing = False
+                self._condition.notify_all()
+
+    def _commit(self, batch: dict[Path, Path]) -> None:
+        _sync_files(batch.values())
+        directories: set[Path] = set()
+        errors: list[OSError] = []
+        with self._condition:
+            for target, temp in batch.items():
+                # NOTE: A write submitted while syncing superseded this one and
+                # will be committed with the next batch.
+                if self._pending.get(target) != temp:
+                    continue
+                del self._pending[target]
+                try:
+                    os.replace(temp, target)
+                except OSError as e:
+                    temp.unlink(missing_ok=True)
+                    errors.append(e)
+                    continue
+                directories.add(target.parent)
+        for directory in directories:
+            fsync_directory(directory)
+        if errors:
+            raise errors[0]
+
+
+def _sync_files(paths: Iterable[Path]) -> None:
+    """Flush the content of ``paths`` to disk."""
+    # NOTE: fsync() of each file rather than sync(), which flushes every dirty page
+    # of the system and, on macOS, returns before the writes are done.
+    for path in paths:
+        with contextlib.suppress(FileNotFoundError):
+            fsync_path(path)
@@ -45,13 +45,14 @@ The two _save_metadata() calls will NOT overwrite each other destructively.
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import posixpath
-import tempfile
 import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 import yaml
 from pydantic import BaseModel
@@ -60,10 +61,11 @@ from frostbound.experiments.constants import (
     YAML_EXTENSIONS,
     Categories,
     ExperimentStatus,
-    FileExtensions,
     FileNames,
 )
+from frostbound.experiments.metric_log import MetricLogWriter
 from frostbound.experiments.models import (
+    ArtifactMetadata,
     ExperimentMetadataModel,
     FileWriteOptions,
     JsonSerializationOptions,
@@ -71,6 +73,9 @@ from frostbound.experiments.models import (
     SaveArtifactsRequest,
     YamlSerializationOptions,
 )
+from frostbound.experiments.protocols import SeekableStorageBackend
+from frostbound.experiments.series import MetricSeries
+from frostbound.experiments.storage import extend_storage
 from frostbound.experiments.types import (
     ArtifactKey,
     ArtifactPath,
@@ -81,11 +86,37 @@ from frostbound.experiments.types import (
     RelativePath,
     StorageKey,
 )
+from frostbound.experiments.upload import ArtifactProgress, ArtifactUploadError, save_in_parallel, scan_files
+from frostbound.experiments.writer import BackgroundWriter
 from frostbound.versioning.git_info import get_git_info
 
 if TYPE_CHECKING:
     from frostbound.experiments.protocols import StorageBackend
 
+_METRIC_FILE_OPTIONS = FileWriteOptions()
+# NOTE: Metric points recorded between two appends to metrics/series.bin: an append
+# costs a block per metric and a rewrite of the log's index.
+_SERIES_APPEND_POINTS = 4096
+# NOTE: Buffering does not change the bytes written, so it is accepted and ignored.
+_TEXT_EXTRA_KWARGS = frozenset({"errors", "buffering"})
+
+
+def _check_file_options(file_options: FileWriteOptions) -> None:
+    """Reject file options that have no meaning for text stored as a whole."""
+    if file_options.mode.replace("t", "").replace("+", "") not in ("w", "x"):
+        raise ValueError(f"Unsupported file mode {file_options.mode!r}: text files are written whole, use 'w' or 'x'")
+    unsupported = sorted(set(file_options.extra_kwargs) - _TEXT_EXTRA_KWARGS)
+    if unsupported:
+        raise ValueError(f"Unsupported file options {unsupported}, expected any of {sorted(_TEXT_EXTRA_KWARGS)}")
+
+
+def _encode_text(text: str, file_options: FileWriteOptions) -> bytes:
+    """Encode text the way a file opened with ``file_options`` would write it."""
+    newline = os.linesep if file_options.newline is None else file_options.newline
+    if newline not in ("", "\n"):
+        text = text.replace("\n", newline)
+    return text.encode(file_options.encoding, file_options.extra_kwargs.get("errors", "strict"))
+
 
 class Experiment:
     """
@@ -112,11 +143,18 @@ class Experiment:
     experiment_id : ExperimentID
         Unique identifier for the experiment (e.g., "llama_0250609_122016")
     storage : StorageBackend
-        Storage backend implementation for file operations
+        Storage backend implementation for file operations. Backends without the
+        methods of :class:`~frostbound.experiments.protocols.ExtendedStorageBackend`
+        are wrapped in a :class:`~frostbound.experiments.storage.LegacyStorageAdapter`
     description : str, optional
         Human-readable description of the experiment, by default ""
     tags : list[str] | None, optional
         List of tags for experiment categorization, by default None
+    writer : BackgroundWriter | None, optional
+        Write-behind queue for metrics and for files saved from memory (save_dict(),
+        save_text(), metadata). When given, these calls return without waiting on
+        storage; call flush() or complete() to wait for the writes. Files copied from
+        disk (save_artifact(), save_file()) are always saved immediately. By default None
 
     Examples
     --------
@@ -146,9 +184,11 @@ class Experiment:
         storage: StorageBackend,
         description: str = "",
         tags: list[str] | None = None,
+        writer: BackgroundWriter | None = None,
     ) -> None:
         self._id = experiment_id
-        self._storage = storage
+        self._storage = extend_storage(storage)
+        self._writer = writer
 
         self._metadata = ExperimentMetadataModel(
             experiment_id=experiment_id,
@@ -157,7 +197,13 @@ class Experiment:
             git_info=get_git_info().model_dump(),
         )
         self._artifacts: dict[ArtifactKey, StorageKey] = {}
+        self._artifact_metadata: dict[ArtifactKey, ArtifactMetadata] = {}
         self._metrics: dict[MetricKey, float | int] = {}
+        self._metric_series: dict[MetricKey, MetricSeries] = {}
+        self._seekable_storage = self._storage if isinstance(self._storage, SeekableStorageBackend) else None
+        self._stored_points: dict[MetricKey, int] = {}
+        self._unstored_points = 0
+        self._series_log_started = False
         self._parameters: dict[ParameterKey, Any] = {}
 
         self._start_experiment()
@@ -177,6 +223,17 @@ class Experiment:
     def artifacts(self) -> dict[ArtifactKey, StorageKey]:
         return self._artifacts.copy()
 
+    @property
+    def artifact_metadata(self) -> dict[ArtifactKey, ArtifactMetadata]:
+        """
+        Metadata of every artifact saved by this experiment.
+
+        ``metadata["ingest_mode"]`` tells how the storage brought the file in, e.g.
+        ``"reflink"`` when it was cloned instead of copied. ``checksum`` is only set by
+        backends that hash content, such as ContentAddressedStorage.
+        """
+        return self._artifact_metadata.copy()
+
     @property
     def metrics(self) -> dict[MetricKey, float | int]:
         return self._metrics.copy()
@@ -185,6 +242,37 @@ class Experiment:
     def parameters(self) -> dict[ParameterKey, Any]:
         return self._parameters.copy()
 
+    def metric_series(self, key: MetricKey) -> MetricSeries:
+        """
+        Return every recorded value of a metric with its step and timestamp.
+
+        Parameters
+        ----------
+        key : MetricKey
+            Metric passed to record_metric().
+
+        Returns
+        -------
+        MetricSeries
+            A copy of the series, with ``steps``, ``timestamps`` and ``values`` columns.
+
+        Raises
+        ------
+        KeyError
+            If the metric was never recorded.
+
+        Examples
+        --------
+        >>> for step in range(3):
+        ...     experiment.record_metric("loss", 1.0 / (step + 1))
+        >>> series = experiment.metric_series("loss")
+        >>> list(series.steps), list(series.values)
+        ([0, 1, 2], [1.0, 0.5, 0.3333333333333333])
+        """
+        if key not in self._metric_series:
+            raise KeyError(f"Metric not found: {key}")
+        return self._metric_series[key].copy()
+
     def save_artifact(self, source_file: FilePath, artifact_path: ArtifactPath | None = None) -> ArtifactKey:
         """
         Save a single file to the experiment's artifacts directory (category-based).
@@ -250,12 +338,15 @@ class Experiment:
         else:
             storage_key = self._generate_storage_key(Categories.ARTIFACTS, filename)
 
-        self._storage.save(storage_key, request.source_file)
-        self._artifacts[storage_key] = storage_key
+        self._ingest_artifact(storage_key, request.source_file)
         return storage_key
 
     def save_artifacts(
-        self, source_directory: FilePath, artifact_path: ArtifactPath | None = None
+        self,
+        source_directory: FilePath,
+        artifact_path: ArtifactPath | None = None,
+        max_workers: int | None = None,
+        on_progress: Callable[[ArtifactProgress], None] | None = None,
     ) -> list[ArtifactKey]:
         """
         Save an entire directory tree to the experiment's artifacts directory (category-based).
@@ -270,11 +361,23 @@ class Experiment:
         artifact_path : ArtifactPath | None, optional
             Subdirectory path within artifacts/ where the directory should be saved.
             If None, saves directly to artifacts/, by default None
+        max_workers : int | None, optional
+            Number of files saved concurrently, by default min(32, CPU count + 4).
+            Raise it for remote backends where per-file latency dominates
+        on_progress : Callable[[ArtifactProgress], None] | None, optional
+            Called after each file (saved or failed) from the worker thread that
+            handled it, one call at a time, by default None
 
         Returns
         -------
         list[ArtifactKey]
-            List of storage keys for all saved files
+            Storage keys of all saved files, sorted
+
+        Raises
+        ------
+        ArtifactUploadError
+            If some files could not be saved; its ``errors`` maps each failed path to
+            its error and ``saved`` lists the keys that were saved and recorded
 
         Examples
         --------
@@ -329,15 +432,16 @@ class Experiment:
         - Directory structure is preserved recursively
         - All files are saved under artifacts/ category
         - Empty directories are not created (only files are saved)
-        - Large directories may take significant time to process
+        - **Parallel**: Files are saved by a thread pool while the tree is still being
+          scanned, so large trees of small files are not bound by per-file latency
+        - **Partial failure**: A file that fails does not stop the others
         """
         request = SaveArtifactsRequest(source_directory=Path(source_directory), artifact_path=artifact_path)
 
-        artifact_keys: list[ArtifactKey] = []
+        scan_errors: dict[Path, BaseException] = {}
 
-        for root, _, files in os.walk(request.source_directory):
-            for file in files:
-                file_path = Path(root) / file
+        def files() -> Iterator[tuple[Path, StorageKey, int]]:
+            for file_path, size_bytes in scan_files(request.source_directory, scan_errors):
                 relative_path = file_path.relative_to(request.source_directory)
 
                 if request.artifact_path:
@@ -345,11 +449,18 @@ class Experiment:
                 else:
                     dest_path = relative_path.as_posix()
 
-                storage_key = self._generate_storage_key(Categories.ARTIFACTS, dest_path)
-                self._storage.save(storage_key, file_path)
-                self._artifacts[storage_key] = storage_key
-                artifact_keys.append(storage_key)
+                yield file_path, self._generate_storage_key(Categories.ARTIFACTS, dest_path), size_bytes
+
+        saved, errors = save_in_parallel(files(), self._ingest, max_workers, on_progress)
 
+        # NOTE: Recorded from this thread once all saves are done, in key order, so
+        # the result does not depend on which worker finished first.
+        artifact_keys = sorted(saved)
+        for storage_key in artifact_keys:
+            self._record_artifact(saved[storage_key])
+
+        if errors or scan_errors:
+            raise ArtifactUploadError({**scan_errors, **errors}, artifact_keys)
         return artifact_keys
 
     def save_file(self, source_file: FilePath, relative_path: RelativePath) -> StorageKey:
@@ -433,7 +544,7 @@ class Experiment:
             raise FileNotFoundError(f"Source file not found: {source_file}")
 
         storage_key = f"{self._id}/{relative_path}"
-        self._storage.save(storage_key, source_file_path)
+        self._storage.ingest(storage_key, source_file_path)
         return storage_key
 
     def save_dict(
@@ -463,13 +574,22 @@ class Experiment:
         yaml_options : YamlSerializationOptions | None, optional
             Custom YAML serialization options (indent, default_flow_style, allow_unicode, etc.)
         file_options : FileWriteOptions | None, optional
-            Custom file writing options (mode, encoding, newline)
+            Custom file writing options (mode, encoding, newline). Mode ``"x"`` fails if
+            the file exists; ``extra_kwargs`` may set ``errors``, the encoding error handler
 
         Returns
         -------
         StorageKey
             Storage key for the saved file (experiment_id/path)
 
+        Raises
+        ------
+        ValueError
+            If ``file_options`` has a mode other than ``"w"`` or ``"x"``, or ``extra_kwargs``
+            other than ``errors`` and ``buffering``.
+        FileExistsError
+            If the mode is ``"x"`` and the file already exists.
+
         Examples
         --------
         Save configuration to artifacts directory:
@@ -534,37 +654,24 @@ class Experiment:
         yaml_opts = yaml_options or YamlSerializationOptions()
         file_opts = file_options or FileWriteOptions()
 
-        with tempfile.NamedTemporaryFile(
-            mode=file_opts.mode,
-            encoding=file_opts.encoding,
-            newline=file_opts.newline,
-            delete=False,
-            **file_opts.extra_kwargs,
-        ) as tmp_file:
-            if extension in YAML_EXTENSIONS:
-                yaml.dump(
-                    dictionary,
-                    tmp_file,
-                    indent=yaml_opts.indent,
-                    default_flow_style=yaml_opts.default_flow_style,
-                    **yaml_opts.extra_kwargs,
-                )
-            else:
-                json.dump(
-                    dictionary,
-                    tmp_file,
-                    indent=json_opts.indent,
-                    ensure_ascii=json_opts.ensure_ascii,
-                    **json_opts.extra_kwargs,
-                )
-            tmp_path = tmp_file.name
-
-        try:
-            storage_key = f"{self._id}/{path}"
-            self._storage.save(storage_key, Path(tmp_path))
-            return storage_key
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+        if extension in YAML_EXTENSIONS:
+            text = yaml.dump(
+                dictionary,
+                indent=yaml_opts.indent,
+                default_flow_style=yaml_opts.default_flow_style,
+                **yaml_opts.extra_kwargs,
+            )
+        else:
+            text = json.dumps(
+                dictionary,
+                indent=json_opts.indent,
+                ensure_ascii=json_opts.ensure_ascii,
+                **json_opts.extra_kwargs,
+            )
+
+        storage_key = f"{self._id}/{path}"
+        self._write_text(storage_key, text, file_opts)
+        return storage_key
 
     def save_text(
         self,
@@ -587,13 +694,22 @@ class Experiment:
             Relative path within the experiment directory where the file should be saved,
             including filename.
         file_options : FileWriteOptions | None, optional
-            Custom file writing options (mode, encoding, newline)
+            Custom file writing options (mode, encoding, newline). Mode ``"x"`` fails if
+            the file exists; ``extra_kwargs`` may set ``errors``, the encoding error handler
 
         Returns
         -------
         StorageKey
             Storage key for the saved file (experiment_id/path)
 
+        Raises
+        ------
+        ValueError
+            If ``file_options`` has a mode other than ``"w"`` or ``"x"``, or ``extra_kwargs``
+            other than ``errors`` and ``buffering``.
+        FileExistsError
+            If the mode is ``"x"`` and the file already exists.
+
         Examples
         --------
         Save log content to logs directory:
@@ -645,22 +761,9 @@ class Experiment:
         path = posixpath.normpath(path)
         file_opts = file_options or FileWriteOptions()
 
-        with tempfile.NamedTemporaryFile(
-            mode=file_opts.mode,
-            encoding=file_opts.encoding,
-            newline=file_opts.newline,
-            delete=False,
-            **file_opts.extra_kwargs,
-        ) as tmp_file:
-            tmp_file.write(text)
-            tmp_path = tmp_file.name
-
-        try:
-            storage_key = f"{self._id}/{path}"
-            self._storage.save(storage_key, Path(tmp_path))
-            return storage_key
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+        storage_key = f"{self._id}/{path}"
+        self._write_text(storage_key, text, file_opts)
+        return storage_key
 
     def load_artifact(self, key: ArtifactKey, path: FilePath) -> None:
         if key not in self._artifacts:
@@ -669,12 +772,16 @@ class Experiment:
         storage_key = self._artifacts[key]
         self._storage.load(storage_key, Path(path))
 
-    def record_metric(self, key: MetricKey, value: float) -> None:
+    def record_metric(
+        self, key: MetricKey, value: float, step: int | None = None, timestamp: float | None = None
+    ) -> None:
         """
         Record a metric value and save it to the experiment's metrics directory (category-based).
 
         This method stores metrics both in memory and persists them as individual files
-        under the `metrics/` category for easy access and analysis.
+        under the `metrics/` category for easy access and analysis. Every value is also
+        appended to the metric's series, so the full history stays available through
+        metric_series().
 
         Parameters
         ----------
@@ -682,6 +789,11 @@ class Experiment:
             Unique identifier for the metric (e.g., "accuracy", "loss", "f1_score")
         value : float
             Numeric value of the metric
+        step : int | None, optional
+            Training step or iteration of the value, by default the previous step plus
+            one (0 for the first value)
+        timestamp : float | None, optional
+            Time of the value in seconds since the epoch, by default now
 
         Examples
         --------
@@ -708,16 +820,36 @@ class Experiment:
 
         Notes
         -----
-        - **Immediate persistence**: Metrics are saved immediately when recorded
+        - **Immediate persistence**: Metrics are saved immediately when recorded, or queued
+          on the experiment's writer, which only stores the latest value of each metric
         - **Individual files**: Each metric gets its own .txt file for easy parsing
         - **In-memory storage**: Metrics are also stored in memory for quick access
+        - **History**: Values are kept in compact per-metric columns (24 bytes per point)
+          and stored in metrics/series.bin. Storages that can open a file in place, such
+          as LocalFileStorage, get new points appended by flush() and every 4096 points;
+          with others the log is only written by complete(), and a process dying before
+          then loses the history, while the .txt files keep the latest value
         - **Category-based**: Always saves under metrics/ directory
         - **Automatic filename**: Filename is generated from the metric key
         - Use experiment.metrics property to access all recorded metrics
         """
+        series = self._metric_series.get(key)
+        if series is None:
+            series = self._metric_series[key] = MetricSeries(key)
+        if step is None:
+            last_step = series.last_step
+            step = 0 if last_step is None else last_step + 1
+        series.append(value, step, time.time() if timestamp is None else timestamp)
         self._metrics[key] = value
-        self._save_to_storage_via_tempfile(
-            data=value, category=Categories.METRICS, filename=f"{key}.txt", suffix=FileExtensions.TXT
+        self._unstored_points += 1
+        if self._unstored_points >= _SERIES_APPEND_POINTS and self._seekable_storage is not None:
+            self._append_metric_series(self._seekable_storage)
+        # NOTE: Serialization options do not affect a number, so the hot path skips
+        # building them and the encoder setup of _save_to_storage().
+        self._write_text(
+            self._generate_storage_key(Categories.METRICS, f"{key}.txt"),
+            json.dumps(value),
+            _METRIC_FILE_OPTIONS,
         )
 
     def add_parameter(self, key: ParameterKey, value: Any) -> None:
@@ -782,7 +914,8 @@ class Experiment:
         ├── metadata/
         │   └── experiment.json    # Updated with completion time and status
         ├── metrics/
-        │   └── metrics.json       # Summary of all recorded metrics
+        │   ├── summary.json       # Latest value of all recorded metrics
+        │   └── series.bin         # Step, timestamp and value of every recorded point
         └── parameters/
             └── parameters.json    # All experiment parameters
         ```
@@ -811,6 +944,9 @@ class Experiment:
         -----
         - **Idempotent**: Safe to call multiple times
         - **Automatic persistence**: Saves metrics and parameters that haven't been saved yet
+        - **Metric history**: series.bin gets every point not stored yet; unless the
+          storage supports appending (see record_metric()), it is only written here and
+          a run that never completes keeps only the latest value of each metric
         - **Status update**: Changes experiment status from "running" to "completed"
         - **Timestamp recording**: Records exact completion time
         - Call this method in a finally block to ensure experiment is always completed
@@ -823,70 +959,129 @@ class Experiment:
         )
         self._save_metadata()
         self._save_metrics()
+        self._save_metric_series()
         self._save_parameters()
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Wait until every write queued on the experiment's background writer is stored.
+
+        When the storage supports appending, metric points recorded since the last
+        append are also appended to metrics/series.bin.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a queued write since the last flush.
+        """
+        if self._seekable_storage is not None and self._unstored_points:
+            self._append_metric_series(self._seekable_storage)
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _ingest_artifact(self, storage_key: StorageKey, source_file: Path) -> None:
+        self._record_artifact(self._ingest(source_file, storage_key, source_file.stat().st_size))
+
+    def _ingest(self, source_file: Path, storage_key: StorageKey, size_bytes: int) -> ArtifactMetadata:
+        mode = self._storage.ingest(storage_key, source_file)
+        return ArtifactMetadata(
+            artifact_key=storage_key,
+            storage_key=storage_key,
+            artifact_type="file",
+            size_bytes=size_bytes,
+            checksum=self._storage.checksum(storage_key),
+            metadata={"ingest_mode": str(mode)},
+        )
+
+    def _record_artifact(self, metadata: ArtifactMetadata) -> None:
+        self._artifacts[metadata.artifact_key] = metadata.storage_key
+        self._artifact_metadata[metadata.artifact_key] = metadata
 
     def _generate_storage_key(self, category: str, key: str) -> StorageKey:
         return f"{self._id}/{category}/{key}"
 
-    def _save_to_storage_via_tempfile(
+    def _save_to_storage(
         self,
         data: BaseModel | dict[str, Any] | float | str,
         category: Categories,
         filename: str,
-        suffix: FileExtensions = FileExtensions.JSON,
         json_options: JsonSerializationOptions | None = None,
         file_options: FileWriteOptions | None = None,
     ) -> None:
         json_opts = json_options or JsonSerializationOptions()
         file_opts = file_options or FileWriteOptions()
 
-        with tempfile.NamedTemporaryFile(
-            mode=file_opts.mode,
-            encoding=file_opts.encoding,
-            newline=file_opts.newline,
-            delete=False,
-            suffix=suffix,
-            **file_opts.extra_kwargs,
-        ) as tmp_file:
-            tmp_path = Path(tmp_file.name)
-
-            if isinstance(data, BaseModel):
-                tmp_file.write(data.model_dump_json(indent=json_opts.indent or 4))
-            else:
-                json.dump(
-                    data,
-                    tmp_file,
-                    indent=json_opts.indent,
-                    ensure_ascii=json_opts.ensure_ascii,
-                    **json_opts.extra_kwargs,
-                )
-
-        try:
-            storage_key = self._generate_storage_key(category, filename)
-            self._storage.save(storage_key, tmp_path)
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        if isinstance(data, BaseModel):
+            text = data.model_dump_json(indent=json_opts.indent or 4)
+        else:
+            text = json.dumps(
+                data,
+                indent=json_opts.indent,
+                ensure_ascii=json_opts.ensure_ascii,
+                **json_opts.extra_kwargs,
+            )
+
+        storage_key = self._generate_storage_key(category, filename)
+        self._write_text(storage_key, text, file_opts)
+
+    def _write_text(self, storage_key: StorageKey, text: str, file_options: FileWriteOptions) -> None:
+        if file_options is not _METRIC_FILE_OPTIONS:
+            _check_file_options(file_options)
+            if "x" in file_options.mode and self._storage.exists(storage_key):
+                raise FileExistsError(f"File already exists: {storage_key}")
+        # NOTE: Text is encoded by the caller's thread, so queued writes never see
+        # later mutations of the data they were made from.
+        data = _encode_text(text, file_options)
+        if self._writer is not None:
+            self._writer.submit(storage_key, functools.partial(self._storage.put_bytes, storage_key, data))
+            return
+        self._storage.put_bytes(storage_key, data)
 
     def _save_metadata(self) -> None:
-        self._save_to_storage_via_tempfile(
+        self._save_to_storage(
             data=self._metadata,
             category=Categories.METADATA,
             filename=FileNames.EXPERIMENT_METADATA,
-            suffix=FileExtensions.JSON,
         )
 
     def _save_parameters(self) -> None:
-        self._save_to_storage_via_tempfile(
+        self._save_to_storage(
             data=self._parameters,
             category=Categories.PARAMETERS,
             filename=FileNames.PARAMETERS,
-            suffix=FileExtensions.JSON,
         )
 
     def _save_metrics(self) -> None:
-        self._save_to_storage_via_tempfile(
+        self._save_to_storage(
             data=self._metrics,
             category=Categories.METRICS,
             filename=FileNames.METRICS_SUMMARY,
-            suffix=FileExtensions.JSON,
         )
+
+    def _save_metric_series(self) -> None:
+        # NOTE: Columns are streamed straight from the in-memory arrays; read the log
+        # back with MetricLogReader.from_file(storage.open_read(key)). Without a
+        # seekable storage the log is written whole, once: open_write() streams cannot
+        # append, and rewriting it periodically would cost the full history each time.
+        if self._seekable_storage is not None:
+            if self._unstored_points or not self._series_log_started:
+                self._append_metric_series(self._seekable_storage)
+            return
+        storage_key = self._generate_storage_key(Categories.METRICS, FileNames.METRICS_SERIES)
+        with MetricLogWriter(self._storage.open_write(storage_key)) as log:
+            for key in sorted(self._metric_series):
+                log.append_series(self._metric_series[key])
+
+    def _append_metric_series(self, storage: SeekableStorageBackend) -> None:
+        storage_key = self._generate_storage_key(Categories.METRICS, FileNames.METRICS_SERIES)
+        # NOTE: The first write starts a new log, atomically replacing one left by an
+        # earlier run with the same id; later ones only add the new points in place.
+        file = storage.open_append(storage_key) if self._series_log_started else self._storage.open_write(storage_key)
+        with MetricLogWriter(file) as log:
+            for key in sorted(self._metric_series):
+                series = self._metric_series[key]
+                log.append_series(series, start=self._stored_points.get(key, 0))
+                self._stored_points[key] = len(series)
+        self._series_log_started = True
+        self._unstored_points = 0
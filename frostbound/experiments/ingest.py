@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from collections.abc import Sequence
+from pathlib import Path
+
+from frostbound.experiments.constants import IngestMode
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGEST_MODES = (IngestMode.REFLINK, IngestMode.COPY_FILE_RANGE, IngestMode.COPY)
+
+# NOTE: _IOW(0x94, 9, int) from linux/fs.h; the same request number on every
+# architecture Linux runs on.
+_FICLONE = 0x40049409
+
+
+def ingest_file(source: Path, destination: Path, modes: Sequence[IngestMode] = DEFAULT_INGEST_MODES) -> IngestMode:
+    """
+    Give ``destination`` the content of ``source`` with the cheapest mode that works.
+
+    Modes are tried in order until one succeeds:
+
+    - **reflink**: Clone the file (``FICLONE``). Instant and copy-on-write, so the two
+      files share blocks until either is modified. Needs Btrfs, XFS, bcachefs or
+      another filesystem supporting clones, with both files on it
+    - **hardlink**: Make ``destination`` another name of ``source``. Instant, but not
+      copy-on-write: both names are the same file, so modifying ``source`` in place
+      also changes ``destination``. Writers that replace a file (write a new file,
+      then rename it over the old one), as most checkpoint savers do, leave it intact
+    - **copy_file_range**: Copy inside the kernel without passing the bytes through
+      user space; on NFS and some other filesystems the server copies server-side
+    - **copy**: ``shutil.copy2``
+
+    Parameters
+    ----------
+    source : Path
+        File to ingest.
+    destination : Path
+        File to create or overwrite, on any filesystem.
+    modes : Sequence[IngestMode], optional
+        Modes to try, by default reflink, then ``copy_file_range``, then copy
+
+    Returns
+    -------
+    IngestMode
+        The mode that succeeded.
+
+    Raises
+    ------
+    OSError
+        If copying fails, or if none of ``modes`` is supported for these files.
+    """
+    for mode in modes:
+        try:
+            if mode is IngestMode.REFLINK:
+                _reflink(source, destination)
+            elif mode is IngestMode.HARDLINK:
+                _hardlink(source, destination)
+            elif mode is IngestMode.COPY_FILE_RANGE:
+                _copy_file_range(source, destination)
+            else:
+                shutil.copy2(source, destination)
+        except _Unsupported as e:
+            logger.debug(f"Cannot ingest '{source}' by {mode}: {e}")
+            continue
+        return mode
+    raise OSError(f"None of the ingest modes {[str(mode) for mode in modes]} works for '{source}'")
+
+
+class _Unsupported(Exception):
+    """The platform or filesystem does not support an ingest mode for a file."""
+
+
+def _reflink(source: Path, destination: Path) -> None:
+    if fcntl is None:
+        raise _Unsupported("ioctl() is not available")
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+        except OSError as e:
+            raise _Unsupported(e) from e
+    shutil.copystat(source, destination)
+
+
+def _hardlink(source: Path, destination: Path) -> None:
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError as e:
+        raise _Unsupported(e) from e
+
+
+def _copy_file_range(source: Path, destination: Path) -> None:
+    if not hasattr(os, "copy_file_range"):
+        raise _Unsupported("copy_file_range() is not available")
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        source_fd, destination_fd = source_file.fileno(), destination_file.fileno()
+        remaining = os.fstat(source_fd).st_size
+        started = False
+        while remaining > 0:
+            try:
+                copied = os.copy_file_range(source_fd, destination_fd, min(remaining, 1 << 30))
+            except OSError as e:
+                # NOTE: Only a failing first call means the filesystems do not support
+                # it; a later error is a real I/O error.
+                if started:
+                    raise
+                raise _Unsupported(e) from e
+            if copied == 0:
+                # NOTE: Some filesystems return 0 instead of failing when they cannot
+                # copy; after some bytes, 0 means the source was truncated meanwhile.
+                if not started:
+                    raise _Unsupported("copy_file_range() copied nothing")
+                raise OSError(f"'{source}' was truncated while copying, {remaining} bytes missing")
+            started = True
+            remaining -= copied
+    shutil.copystat(source, destination)
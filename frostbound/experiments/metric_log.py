@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import types
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Self
+
+from frostbound.experiments.series import MetricSeries
+from frostbound.experiments.types import MetricKey
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAGIC = b"FBML"
+VERSION = 1
+
+# NOTE: Header: magic, version, padding to 16 bytes so that every column starts
+# 8-byte aligned. Trailer: index offset, index length, magic.
+_HEADER = struct.Struct("<4sI8x")
+_TRAILER = struct.Struct("<QQ4s4x")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+@dataclass(frozen=True, slots=True)
+class MetricBlock:
+    """
+    One contiguous run of points of a metric inside a metric log.
+
+    On little-endian hosts the columns are views into the mapped file, so reading
+    them copies nothing. They stay valid until the reader is closed.
+
+    Attributes
+    ----------
+    steps : Sequence[int]
+        Step of each point.
+    timestamps : Sequence[float]
+        Unix timestamp of each point.
+    values : Sequence[float]
+        Value of each point.
+    """
+
+    steps: Sequence[int]
+    timestamps: Sequence[float]
+    values: Sequence[float]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class MetricLogWriter:
+    """
+    Append-only writer of the columnar binary metric log.
+
+    The log starts with a 16 byte header, followed by blocks of points and ends with
+    a JSON index of the blocks of every metric and a fixed-size trailer pointing at it.
+    A block holds the points of one metric as three little-endian columns: ``int64``
+    steps, ``float64`` timestamps and ``float64`` values. Appending to an existing
+    log writes the new blocks after its index and trailer and a new index and trailer
+    on close, so no byte of the existing log is ever rewritten.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        File opened for writing (``"wb"``, or a storage's ``open_write()``) to start a
+        new log, or seekable and opened for reading and writing (``"r+b"``) to append
+        to an existing one.
+
+    Examples
+    --------
+    >>> with MetricLogWriter(storage.open_write("run_1/metrics/series.bin")) as log:
+    ...     log.append_series(experiment.metric_series("loss"))
+    >>> with open("series.bin", "r+b") as file, MetricLogWriter(file) as log:
+    ...     log.append("loss", steps=[100, 101], timestamps=[t0, t1], values=[0.31, 0.30])
+
+    Notes
+    -----
+    - **Closing**: The log is only readable once the writer is closed; closing the
+      writer also closes ``file``
+    - **Crash safety**: A log torn by a crash while appending reads as it was before
+      the append; only the points of the unfinished append are lost
+    - **Ordering**: Readers answer step range queries with a binary search, so steps
+      should be appended in increasing order
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._index: dict[MetricKey, list[list[int]]] = {}
+        self._closed = False
+        # NOTE: Write-only streams, such as those of ContentAddressedStorage, cannot
+        # seek; they always start a new log.
+        end = file.seek(0, os.SEEK_END) if file.seekable() else 0
+        if end == 0:
+            file.write(_HEADER.pack(MAGIC, VERSION))
+            self._offset = _HEADER.size
+            return
+
+        # NOTE: Only the trailer and index are read, however large the log is.
+        file.seek(0)
+        header = file.read(_HEADER.size)
+        file.seek(max(0, end - _TRAILER.size))
+        trailer = file.read(_TRAILER.size)
+        try:
+            index_offset, index_length = _check_log(header, trailer, end)
+        except ValueError:
+            # NOTE: An append torn by a crash left an incomplete tail after the last
+            # complete log; drop the tail and append after that log.
+            file.seek(0)
+            end, index_offset, index_length = _find_complete_log(file.read())
+            file.seek(end)
+            file.truncate()
+        file.seek(index_offset)
+        index = json.loads(file.read(index_length))
+        self._index = {key: [list(entry) for entry in entries] for key, entries in index["metrics"].items()}
+        # NOTE: The old index and trailer stay in place until the new ones are written,
+        # so a crash before close() loses only the new blocks.
+        file.seek(end)
+        self._offset = end
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def append(
+        self,
+        key: MetricKey,
+        steps: Sequence[int],
+        timestamps: Sequence[float],
+        values: Sequence[float],
+    ) -> None:
+        """
+        Append points of one metric as a new block.
+
+        Raises
+        ------
+        ValueError
+            If the columns have different lengths or the writer is closed.
+        """
+        if self._closed:
+            raise ValueError("MetricLogWriter is closed")
+        if not len(steps) == len(timestamps) == len(values):
+            raise ValueError(f"Columns of metric '{key}' have different lengths")
+        if not values:
+            return
+
+        for typecode, column in (("q", steps), ("d", timestamps), ("d", values)):
+            self._file.write(_to_little_endian(typecode, column))
+        self._index.setdefault(key, []).append([self._offset, len(values)])
+        self._offset += 24 * len(values)
+
+    def append_series(self, series: MetricSeries, start: int = 0) -> None:
+        """Append the points of ``series`` from index ``start`` on."""
+        if start:
+            self.append(series.key, series.steps[start:], series.timestamps[start:], series.values[start:])
+        else:
+            self.append(series.key, series.steps, series.timestamps, series.values)
+
+    def close(self) -> None:
+        """Write the index and trailer, then close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        index = json.dumps({"version": VERSION, "metrics": self._index}, separators=(",", ":")).encode()
+        self._file.write(index)
+        self._file.write(_TRAILER.pack(self._offset, len(index), MAGIC))
+        self._file.close()
+
+
+class MetricLogReader:
+    """
+    Reader of the columnar binary metric log written by :class:`MetricLogWriter`.
+
+    Parameters
+    ----------
+    buffer : bytes | bytearray | memoryview | mmap.mmap
+        Content of the log. Use :meth:`open` or :meth:`from_file` to map a file
+        instead of reading it.
+
+    Raises
+    ------
+    ValueError
+        If the buffer does not hold a complete metric log. A log torn by a crash while
+        appending is read as it was before the append.
+
+    Examples
+    --------
+    >>> with MetricLogReader.open("runs/run_1/metrics/series.bin") as log:
+    ...     log.keys()
+    ...     late = log.series("loss", start_step=90_000)
+    ...     log.to_numpy("loss")["values"].mean()
+    ['accuracy', 'loss']
+
+    Notes
+    -----
+    - **Zero-copy**: :meth:`blocks` and :meth:`to_numpy` read the columns in place,
+      :meth:`series` copies the selected points only
+    - **numpy**: :meth:`to_numpy` requires numpy, which frostbound does not depend on
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._buffer = memoryview(buffer)
+        size = len(self._buffer)
+        try:
+            index_offset, index_length = _check_log(
+                self._buffer[: _HEADER.size], self._buffer[max(0, size - _TRAILER.size) :], size
+            )
+        except ValueError:
+            size, index_offset, index_length = _find_complete_log(
+                buffer.tobytes() if isinstance(buffer, memoryview) else buffer
+            )
+            self._buffer = self._buffer[:size]
+        index = json.loads(bytes(self._buffer[index_offset : index_offset + index_length]))
+        self._index: dict[MetricKey, list[tuple[int, int]]] = {
+            key: [(offset, count) for offset, count in entries] for key, entries in index["metrics"].items()
+        }
+
+    @classmethod
+    def open(cls, path: Path | str) -> MetricLogReader:
+        """Map the metric log at ``path``."""
+        with open(path, "rb") as file:
+            return cls.from_file(file)
+
+    @classmethod
+    def from_file(cls, file: BinaryIO) -> MetricLogReader:
+        """
+        Map ``file`` if it is backed by a file descriptor, otherwise read it.
+
+        ``file`` can be closed afterwards, e.g. the result of ``storage.open_read()``.
+        """
+        try:
+            fileno = file.fileno()
+        except (OSError, io.UnsupportedOperation):
+            return cls(file.read())
+        return cls(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        """Unmap the log."""
+        self._buffer.release()
+        if self._mmap is not None:
+            # NOTE: If views handed out by blocks() or to_numpy() are still alive,
+            # the mapping is released with the last of them.
+            with contextlib.suppress(BufferError):
+                self._mmap.close()
+
+    def keys(self) -> list[MetricKey]:
+        """Return the metrics in the log, sorted."""
+        return sorted(self._index)
+
+    def count(self, key: MetricKey) -> int:
+        """Return the number of points of ``key``."""
+        return sum(count for _, count in self._entries(key))
+
+    def blocks(self, key: MetricKey) -> Iterator[MetricBlock]:
+        """Yield the blocks of ``key`` in the order they were appended."""
+        for offset, count in self._entries(key):
+            yield MetricBlock(
+                steps=self._column("q", offset, count),
+                timestamps=self._column("d", offset + 8 * count, count),
+                values=self._column("d", offset + 16 * count, count),
+            )
+
+    def series(self, key: MetricKey, start_step: int | None = None, stop_step: int | None = None) -> MetricSeries:
+        """
+        Copy the points of ``key`` with ``start_step <= step < stop_step`` into a series.
+
+        Parameters
+        ----------
+        key : MetricKey
+            Metric to read.
+        start_step : int | None, optional
+            First step included, by default the first point
+        stop_step : int | None, optional
+            First step excluded, by default past the last point
+
+        Returns
+        -------
+        MetricSeries
+            The selected points, in the order they were appended.
+        """
+        series = MetricSeries(key)
+        for block in self.blocks(key):
+            start, stop = self._step_range(block, start_step, stop_step)
+            if start < stop:
+                series.steps.extend(block.steps[start:stop])
+                series.timestamps.extend(block.timestamps[start:stop])
+                series.values.extend(block.values[start:stop])
+        return series
+
+    def to_numpy(
+        self, key: MetricKey, start_step: int | None = None, stop_step: int | None = None
+    ) -> dict[str, np.ndarray[Any, Any]]:
+        """
+        Return the columns of ``key`` as numpy arrays, for vectorized aggregation.
+
+        A metric written as a single block is returned as read-only views of the
+        mapped file; several blocks are concatenated into new arrays.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            ``"steps"`` (``int64``), ``"timestamps"`` and ``"values"`` (``float64``).
+        """
+        import numpy as np
+
+        dtypes = {"steps": "<i8", "timestamps": "<f8", "values": "<f8"}
+        columns: dict[str, list[np.ndarray[Any, Any]]] = {name: [] for name in dtypes}
+        for offset, count in self._entries(key):
+            steps = np.frombuffer(self._buffer, dtype="<i8", count=count, offset=offset)
+            start = 0 if start_step is None else int(np.searchsorted(steps, start_step, side="left"))
+            stop = count if stop_step is None else int(np.searchsorted(steps, stop_step, side="left"))
+            columns["steps"].append(steps[start:stop])
+            for name, position in (("timestamps", 1), ("values", 2)):
+                column = np.frombuffer(self._buffer, dtype="<f8", count=count, offset=offset + 8 * count * position)
+                columns[name].append(column[start:stop])
+        return {
+            name: parts[0] if len(parts) == 1 else np.concatenate(parts or [np.empty(0, dtype=dtypes[name])])
+            for name, parts in columns.items()
+        }
+
+    def _entries(self, key: MetricKey) -> list[tuple[int, int]]:
+        if key not in self._index:
+            raise KeyError(f"Metric not found: {key}")
+        return self._index[key]
+
+    def _column(self, typecode: str, offset: int, count: int) -> Sequence[Any]:
+        view = self._buffer[offset : offset + 8 * count]
+        if _LITTLE_ENDIAN:
+            return view.cast("q") if typecode == "q" else view.cast("d")
+        column = array(typecode, view.tobytes())
+        column.byteswap()
+        return column
+
+    @staticmethod
+    def _step_range(block: MetricBlock, start_step: int | None, stop_step: int | None) -> tuple[int, int]:
+        start = 0 if start_step is None else bisect.bisect_left(block.steps, start_step)
+        stop = len(block) if stop_step is None else bisect.bisect_left(block.steps, stop_step)
+        return start, stop
+
+
+def _check_log(header: bytes | memoryview, trailer: bytes | memoryview, size: int) -> tuple[int, int]:
+    """Validate the header and trailer of a log of ``size`` bytes and return the index offset and length."""
+    if size < _HEADER.size + _TRAILER.size:
+        raise ValueError("Buffer is too small to be a metric log")
+    magic, version = _HEADER.unpack(header)
+    index_offset, index_length, trailer_magic = _TRAILER.unpack(trailer)
+    if magic != MAGIC or trailer_magic != MAGIC:
+        raise ValueError("Buffer is not a complete metric log")
+    if version > VERSION:
+        raise ValueError(f"Unsupported metric log version {version}")
+    if index_offset + index_length + _TRAILER.size != size:
+        raise ValueError("Metric log index is corrupted")
+    return index_offset, index_length
+
+
+def _find_complete_log(buffer: bytes | bytearray | mmap.mmap) -> tuple[int, int, int]:
+    """
+    Find the last complete log at the start of ``buffer``, whose end was torn off.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Size of that log, and its index offset and length.
+
+    Raises
+    ------
+    ValueError
+        If no complete log is found.
+    """
+    header = bytes(buffer[: _HEADER.size])
+    # NOTE: Every append ends with a trailer, so the trailers of earlier appends
+    # are found by searching backwards for the trailer magic.
+    position = buffer.rfind(MAGIC)
+    while position >= _HEADER.size:
+        # NOTE: The trailer ends with the magic and 4 bytes of padding.
+        end = position + len(MAGIC) + 4
+        trailer = bytes(buffer[end - _TRAILER.size : end])
+        try:
+            index_offset, index_length = _check_log(header, trailer, end)
+            json.loads(bytes(buffer[index_offset : index_offset + index_length]))
+        except ValueError:
+            position = buffer.rfind(MAGIC, 0, position)
+            continue
+        return end, index_offset, index_length
+    raise ValueError("Buffer is not a complete metric log")
+
+
+def _to_little_endian(typecode: str, column: Sequence[Any]) -> array[Any]:
+    """Return ``column`` as a typed array in little-endian byte order, without copying if possible."""
+    if isinstance(column, array) and column.typecode == typecode and _LITTLE_ENDIAN:
+        return column
+    converted = array(typecode, column)
+    if not _LITTLE_ENDIAN:
+        converted.byteswap()
+    return converted
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import BinaryIO, Protocol, runtime_checkable
 
+from frostbound.experiments.constants import IngestMode
 from frostbound.experiments.types import (
     ArtifactKey,
     ArtifactPath,
@@ -23,6 +24,37 @@ class StorageBackend(Protocol):
     def list(self, prefix: StorageKey) -> list[StorageKey]: ...
 
 
+@runtime_checkable
+class ExtendedStorageBackend(StorageBackend, Protocol):
+    """
+    Storage backend that can also store bytes and streams, ingest files and checksum them.
+
+    Backends implementing only :class:`StorageBackend` still work with
+    :class:`~frostbound.experiments.experiment.Experiment`, which wraps them in a
+    :class:`~frostbound.experiments.storage.LegacyStorageAdapter`.
+    """
+
+    def ingest(self, key: StorageKey, path: Path) -> IngestMode: ...
+    def put_bytes(self, key: StorageKey, data: bytes) -> None: ...
+    def get_bytes(self, key: StorageKey) -> bytes: ...
+    def open_write(self, key: StorageKey) -> BinaryIO: ...
+    def open_read(self, key: StorageKey) -> BinaryIO: ...
+    def checksum(self, key: StorageKey) -> str | None: ...
+
+
+@runtime_checkable
+class SeekableStorageBackend(Protocol):
+    """
+    Storage backend that can open a stored file for reading and writing in place.
+
+    :class:`~frostbound.experiments.experiment.Experiment` uses it to append new
+    points to metrics/series.bin as they are recorded, instead of writing the whole
+    log once on completion.
+    """
+
+    def open_append(self, key: StorageKey) -> BinaryIO: ...
+
+
 @runtime_checkable
 class ExperimentProtocol(Protocol):
     @property
@@ -38,7 +70,9 @@ class ExperimentProtocol(Protocol):
 
     def save_artifact(self, path: FilePath, artifact_path: ArtifactPath | None = None) -> ArtifactKey: ...
     def load_artifact(self, key: ArtifactKey, path: FilePath) -> None: ...
-    def record_metric(self, key: MetricKey, value: float) -> None: ...
+    def record_metric(
+        self, key: MetricKey, value: float, step: int | None = None, timestamp: float | None = None
+    ) -> None: ...
     def add_parameter(self, key: ParameterKey, value: object) -> None: ...
     def complete(self) -> None: ...
 
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from frostbound.experiments.types import MetricKey
+
+
+class MetricSeries:
+    """Step- and timestamp-indexed values of one metric.
+
+    Points are stored in three typed columns (``array('q')`` for steps,
+    ``array('d')`` for timestamps and values), so a point costs 24 bytes
+    instead of three Python objects, and appending is amortized O(1).
+
+    Parameters
+    ----------
+    key : MetricKey
+        Name of the metric.
+
+    Examples
+    --------
+    >>> series = MetricSeries("loss")
+    >>> series.append(0.9, step=0, timestamp=1717857261.0)
+    >>> series.append(0.7, step=1, timestamp=1717857262.0)
+    >>> list(series.values)
+    [0.9, 0.7]
+    """
+
+    __slots__ = ("key", "steps", "timestamps", "values")
+
+    def __init__(self, key: MetricKey) -> None:
+        self.key = key
+        self.steps = array("q")
+        self.timestamps = array("d")
+        self.values = array("d")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"MetricSeries(key={self.key!r}, points={len(self)})"
+
+    @property
+    def last_step(self) -> int | None:
+        """Step of the most recent point, None if empty."""
+        return self.steps[-1] if self.steps else None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns' points."""
+        return sum(column.itemsize * len(column) for column in (self.steps, self.timestamps, self.values))
+
+    def append(self, value: float, step: int, timestamp: float) -> None:
+        """Append one point."""
+        self.steps.append(step)
+        self.timestamps.append(timestamp)
+        self.values.append(value)
+
+    def copy(self) -> MetricSeries:
+        """Return an independent copy of the series."""
+        series = MetricSeries(self.key)
+        series.steps = array("q", self.steps)
+        series.timestamps = array("d", self.timestamps)
+        series.values = array("d", self.values)
+        return series
+
+    def to_dict(self) -> dict[str, list[Any]]:
+        """Return the columns as lists, e.g. for JSON or a plotting library."""
+        return {"steps": self.steps.tolist(), "timestamps": self.timestamps.tolist(), "values": self.values.tolist()}
+
+    @classmethod
+    def from_dict(cls, key: MetricKey, data: dict[str, list[Any]]) -> MetricSeries:
+        """Rebuild a series from :meth:`to_dict` output."""
+        if not len(data["steps"]) == len(data["timestamps"]) == len(data["values"]):
+            raise ValueError(f"Columns of metric series '{key}' have different lengths")
+        series = cls(key)
+        series.steps = array("q", data["steps"])
+        series.timestamps = array("d", data["timestamps"])
+        series.values = array("d", data["values"])
+        return series
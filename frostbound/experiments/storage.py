@@ -1,37 +1,188 @@
 from __future__ import annotations
 
+import io
+import logging
+import os
 import shutil
+import tempfile
+from collections.abc import Sequence
 from pathlib import Path
-
-from frostbound.experiments.protocols import StorageBackend
+from typing import BinaryIO, Callable, cast
+
+from frostbound.experiments.constants import Durability, IngestMode
+from frostbound.experiments.durability import (
+    DEFAULT_COMMIT_INTERVAL_SECONDS,
+    AtomicFile,
+    GroupCommitter,
+    InPlaceFile,
+    create_temp,
+    fsync_directory,
+    fsync_path,
+    is_temp_path,
+)
+from frostbound.experiments.ingest import DEFAULT_INGEST_MODES, ingest_file
+from frostbound.experiments.protocols import ExtendedStorageBackend, StorageBackend
 from frostbound.experiments.types import StorageKey
 
-
-class LocalFileStorage(StorageBackend):
-    def __init__(self, base_dir: Path | str) -> None:
+logger = logging.getLogger(__name__)
+
+
+class LocalFileStorage(ExtendedStorageBackend):
+    """
+    Storage backend keeping every key as a file under a base directory.
+
+    Writes never modify a file in place: they go to a temp file in the target's
+    directory, which is then renamed onto the target, so a crash leaves either the
+    previous or the new content and never a torn file.
+
+    Parameters
+    ----------
+    base_dir : Path | str
+        Directory holding the stored files, created if missing.
+    durability : Durability | str, optional
+        When written files are flushed to disk, by default ``Durability.NONE``:
+
+        - ``"none"``: Leave flushing to the operating system; a crash may lose recent
+          writes, but never tears a file
+        - ``"fsync"``: Flush every file and its directory before the write returns
+        - ``"group_commit"``: Rename written files in batches every
+          ``commit_interval_seconds`` after a single flush of the whole batch; a crash
+          loses at most the last interval of writes
+    commit_interval_seconds : float, optional
+        Batch interval of group commit, by default 0.1
+    ingest_modes : Sequence[IngestMode | str], optional
+        How :meth:`ingest` and :meth:`save` bring a file into storage, tried in order,
+        by default ``("reflink", "copy_file_range", "copy")``. Adding ``"hardlink"``
+        avoids any copy on filesystems without reflinks, but the stored file then
+        changes whenever the source is modified in place; see
+        :func:`~frostbound.experiments.ingest.ingest_file`.
+
+    Examples
+    --------
+    >>> storage = LocalFileStorage("runs", durability="group_commit")
+    >>> experiment = Experiment("llama_0250609_122016", storage)
+    >>> experiment.complete()
+    >>> storage.sync()  # wait until everything written is on disk
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        durability: Durability | str = Durability.NONE,
+        commit_interval_seconds: float = DEFAULT_COMMIT_INTERVAL_SECONDS,
+        ingest_modes: Sequence[IngestMode | str] = DEFAULT_INGEST_MODES,
+    ) -> None:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.durability = Durability(durability)
+        self._committer = (
+            GroupCommitter(commit_interval_seconds) if self.durability is Durability.GROUP_COMMIT else None
+        )
+        self.ingest_modes = tuple(IngestMode(mode) for mode in ingest_modes)
 
     def save(self, key: StorageKey, path: Path) -> None:
+        self.ingest(key, path)
+
+    def ingest(self, key: StorageKey, path: Path) -> IngestMode:
+        """
+        Store the file at ``path`` under ``key`` with the cheapest ingest mode that works.
+
+        Returns
+        -------
+        IngestMode
+            How the file was brought into storage.
+        """
         target_path = self._resolve_path(key)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(path, target_path)
+        temp_path, fd = create_temp(target_path)
+        os.close(fd)
+        try:
+            mode = ingest_file(Path(path), temp_path, self.ingest_modes)
+            if self.durability is Durability.FSYNC:
+                fsync_path(temp_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        self._publish(temp_path, target_path)
+        logger.debug(f"Ingested '{path}' as '{key}' by {mode}")
+        return mode
 
     def load(self, key: StorageKey, path: Path) -> None:
-        source_path = self._resolve_path(key)
-        if not source_path.exists():
-            raise FileNotFoundError(f"Key not found: {key}")
+        target_path = self._resolve_path(key)
+        source_path = self._committer.resolve(target_path) if self._committer else target_path
         path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source_path, path)
+        try:
+            shutil.copy2(source_path, path)
+        except FileNotFoundError:
+            if source_path == target_path:
+                raise FileNotFoundError(f"Key not found: {key}") from None
+            # NOTE: The pending write was committed while copying.
+            shutil.copy2(target_path, path)
 
     def exists(self, key: StorageKey) -> bool:
-        return self._resolve_path(key).exists()
+        target_path = self._resolve_path(key)
+        return target_path.exists() or (self._committer is not None and self._committer.is_pending(target_path))
+
+    def put_bytes(self, key: StorageKey, data: bytes) -> None:
+        with self.open_write(key) as file:
+            file.write(data)
+
+    def get_bytes(self, key: StorageKey) -> bytes:
+        with self.open_read(key) as file:
+            return file.read()
+
+    def open_write(self, key: StorageKey) -> BinaryIO:
+        return AtomicFile(self._resolve_path(key), self._publish, fsync=self.durability is Durability.FSYNC)
+
+    def open_append(self, key: StorageKey) -> BinaryIO:
+        """
+        Open the file of ``key`` for reading and writing in place, creating it if missing.
+
+        Writes are not atomic, unlike with :meth:`open_write`: a crash can leave a
+        partial write, so only use it for formats that tolerate a torn append. A write
+        of the key still waiting for its group commit is committed first.
+        """
+        target_path = self._resolve_path(key)
+        if self._committer is not None and self._committer.is_pending(target_path):
+            self._committer.sync()
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        return InPlaceFile(target_path, fsync=self.durability is Durability.FSYNC)
+
+    def open_read(self, key: StorageKey) -> BinaryIO:
+        target_path = self._resolve_path(key)
+        try:
+            return self._committer.open(target_path) if self._committer else open(target_path, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Key not found: {key}") from None
+
+    def checksum(self, _key: StorageKey) -> str | None:
+        return None
 
     def delete(self, key: StorageKey) -> None:
         file_path = self._resolve_path(key)
+        if self._committer is not None:
+            self._committer.discard(file_path)
         if file_path.exists():
             file_path.unlink()
 
+    def sync(self) -> None:
+        """
+        Wait until every completed write is on disk.
+
+        Only group commit defers flushing; with the other modes this returns at once.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a group commit since the last sync.
+        """
+        if self._committer is not None:
+            self._committer.sync()
+
+    def close(self) -> None:
+        """Commit pending writes and stop the group commit thread, if any."""
+        if self._committer is not None:
+            self._committer.close()
+
     def list(self, prefix: StorageKey) -> list[StorageKey]:
         """List all storage keys matching the given prefix.
 
@@ -91,20 +242,35 @@ class LocalFileStorage(StorageBackend):
         Empty directories will not appear in the results.
         """
         prefix_path: Path = self._resolve_path(prefix)
-        if not prefix_path.exists():
-            return []
+        keys: set[StorageKey] = set()
+        if self._committer is not None:
+            for target_path in self._committer.pending_targets():
+                if target_path == prefix_path or prefix_path in target_path.parents:
+                    keys.add(str(target_path.relative_to(self.base_dir)))
 
         if prefix_path.is_file():
-            return [prefix]
-
-        keys: list[StorageKey] = []
-        for path in prefix_path.rglob("*"):
-            if path.is_file():
-                relative_path = path.relative_to(self.base_dir)
-                keys.append(str(relative_path))
+            keys.add(prefix)
+        elif prefix_path.exists():
+            for path in prefix_path.rglob("*"):
+                if path.is_file() and not is_temp_path(path):
+                    relative_path = path.relative_to(self.base_dir)
+                    keys.add(str(relative_path))
 
         return sorted(keys)
 
+    def _publish(self, temp_path: Path, target_path: Path) -> None:
+        """Move a fully written temp file onto its target, as durably as configured."""
+        if self._committer is not None:
+            self._committer.submit(temp_path, target_path)
+            return
+        try:
+            os.replace(temp_path, target_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        if self.durability is Durability.FSYNC:
+            fsync_directory(target_path.parent)
+
     def _resolve_path(self, key: StorageKey) -> Path:
         """Resolve a storage key to an absolute filesystem path.
 
@@ -136,13 +302,30 @@ class LocalFileStorage(StorageBackend):
         return self.base_dir / key
 
 
-class InMemoryStorage(StorageBackend):
+class _MemoryWriter(io.BytesIO):
+    """Buffer handing its content to ``commit`` when closed."""
+
+    def __init__(self, commit: Callable[[bytes], None]) -> None:
+        super().__init__()
+        self._commit = commit
+
+    def close(self) -> None:
+        if not self.closed:
+            self._commit(self.getvalue())
+        super().close()
+
+
+class InMemoryStorage(ExtendedStorageBackend):
     def __init__(self) -> None:
         self._data: dict[StorageKey, bytes] = {}
 
     def save(self, key: StorageKey, path: Path) -> None:
         self._data[key] = path.read_bytes()
 
+    def ingest(self, key: StorageKey, path: Path) -> IngestMode:
+        self.save(key, path)
+        return IngestMode.COPY
+
     def load(self, key: StorageKey, path: Path) -> None:
         if key not in self._data:
             raise FileNotFoundError(f"Key not found: {key}")
@@ -152,6 +335,23 @@ class InMemoryStorage(StorageBackend):
     def exists(self, key: StorageKey) -> bool:
         return key in self._data
 
+    def put_bytes(self, key: StorageKey, data: bytes) -> None:
+        self._data[key] = bytes(data)
+
+    def get_bytes(self, key: StorageKey) -> bytes:
+        if key not in self._data:
+            raise FileNotFoundError(f"Key not found: {key}")
+        return self._data[key]
+
+    def open_write(self, key: StorageKey) -> BinaryIO:
+        return _MemoryWriter(lambda data: self.put_bytes(key, data))
+
+    def open_read(self, key: StorageKey) -> BinaryIO:
+        return io.BytesIO(self.get_bytes(key))
+
+    def checksum(self, _key: StorageKey) -> str | None:
+        return None
+
     def delete(self, key: StorageKey) -> None:
         self._data.pop(key, None)
 
@@ -163,3 +363,108 @@ class InMemoryStorage(StorageBackend):
 
     def size(self) -> int:
         return len(self._data)
+
+
+class LegacyStorageAdapter(ExtendedStorageBackend):
+    """
+    Give a backend implementing only :class:`StorageBackend` the extended methods.
+
+    Methods the backend has are called as they are. Missing ones fall back to its
+    core methods through a temp file: :meth:`put_bytes` and :meth:`open_write` save
+    one, :meth:`get_bytes` and :meth:`open_read` load one. :meth:`ingest` falls back
+    to ``save()`` and reports ``IngestMode.COPY``; :meth:`checksum` to None.
+
+    Parameters
+    ----------
+    backend : StorageBackend
+        Backend to extend.
+    """
+
+    def __init__(self, backend: StorageBackend) -> None:
+        self.backend = backend
+
+    def save(self, key: StorageKey, path: Path) -> None:
+        self.backend.save(key, path)
+
+    def ingest(self, key: StorageKey, path: Path) -> IngestMode:
+        ingest = getattr(self.backend, "ingest", None)
+        if ingest is not None:
+            return IngestMode(ingest(key, path))
+        self.backend.save(key, path)
+        return IngestMode.COPY
+
+    def load(self, key: StorageKey, path: Path) -> None:
+        self.backend.load(key, path)
+
+    def exists(self, key: StorageKey) -> bool:
+        return self.backend.exists(key)
+
+    def delete(self, key: StorageKey) -> None:
+        self.backend.delete(key)
+
+    def list(self, prefix: StorageKey) -> list[StorageKey]:
+        return self.backend.list(prefix)
+
+    def put_bytes(self, key: StorageKey, data: bytes) -> None:
+        put_bytes = getattr(self.backend, "put_bytes", None)
+        if put_bytes is not None:
+            put_bytes(key, data)
+            return
+        fd, name = tempfile.mkstemp(prefix="frostbound-")
+        temp_path = Path(name)
+        try:
+            with open(fd, "wb") as file:
+                file.write(data)
+            self.backend.save(key, temp_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def get_bytes(self, key: StorageKey) -> bytes:
+        get_bytes = getattr(self.backend, "get_bytes", None)
+        if get_bytes is not None:
+            return bytes(get_bytes(key))
+        fd, name = tempfile.mkstemp(prefix="frostbound-")
+        os.close(fd)
+        temp_path = Path(name)
+        try:
+            self.backend.load(key, temp_path)
+            return temp_path.read_bytes()
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def open_write(self, key: StorageKey) -> BinaryIO:
+        open_write = getattr(self.backend, "open_write", None)
+        if open_write is not None:
+            return cast(BinaryIO, open_write(key))
+
+        def publish(temp_path: Path, _target: Path) -> None:
+            try:
+                self.backend.save(key, temp_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+        return AtomicFile(Path(tempfile.gettempdir()) / "frostbound", publish)
+
+    def open_read(self, key: StorageKey) -> BinaryIO:
+        open_read = getattr(self.backend, "open_read", None)
+        if open_read is not None:
+            return cast(BinaryIO, open_read(key))
+        return io.BytesIO(self.get_bytes(key))
+
+    def checksum(self, key: StorageKey) -> str | None:
+        checksum = getattr(self.backend, "checksum", None)
+        return checksum(key) if checksum is not None else None
+
+
+def extend_storage(storage: StorageBackend) -> ExtendedStorageBackend:
+    """
+    Return ``storage`` if it implements :class:`ExtendedStorageBackend`, else wrap it.
+
+    Returns
+    -------
+    ExtendedStorageBackend
+        ``storage`` itself, or a :class:`LegacyStorageAdapter` around it.
+    """
+    if isinstance(storage, ExtendedStorageBackend):
+        return storage
+    return LegacyStorageAdapter(storage)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from frostbound.experiments.types import ArtifactKey, StorageKey
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# NOTE: Files queued beyond the running saves, per worker. Bounds memory on huge
+# trees while keeping every worker busy.
+_QUEUED_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ArtifactProgress:
+    """
+    Progress of a directory upload, reported after each file.
+
+    Attributes
+    ----------
+    source_file : Path
+        File just finished.
+    storage_key : StorageKey
+        Key it was saved under.
+    error : BaseException | None
+        Why saving it failed, None if it succeeded.
+    completed : int
+        Files finished so far, failed ones included.
+    failed : int
+        Files that failed so far.
+    total : int | None
+        Files to upload, None while the directory is still being scanned.
+    bytes_completed : int
+        Size of the files saved so far.
+    """
+
+    source_file: Path
+    storage_key: StorageKey
+    error: BaseException | None
+    completed: int
+    failed: int
+    total: int | None
+    bytes_completed: int
+
+
+class ArtifactUploadError(Exception):
+    """
+    Error raised when some files of a directory could not be saved.
+
+    Every other file is saved and recorded before this is raised.
+
+    Parameters
+    ----------
+    errors : dict[Path, BaseException]
+        Error of each file or directory that failed, by path.
+    saved : list[ArtifactKey]
+        Keys of the files that were saved, sorted.
+    """
+
+    def __init__(self, errors: dict[Path, BaseException], saved: list[ArtifactKey]) -> None:
+        self.errors = dict(sorted(errors.items()))
+        self.saved = saved
+        first_path, first_error = next(iter(self.errors.items()))
+        super().__init__(
+            f"Failed to save {len(errors)} of {len(errors) + len(saved)} files, "
+            f"first '{first_path}': {type(first_error).__name__}: {first_error}"
+        )
+
+
+def scan_files(directory: Path, errors: dict[Path, BaseException]) -> Iterator[tuple[Path, int]]:
+    """
+    Yield every file under ``directory`` with its size, as the tree is scanned.
+
+    Like ``os.walk``, symbolic links to files are included and symbolic links to
+    directories are not followed. Directories that cannot be read are recorded in
+    ``errors`` and skipped.
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                pending.append(Path(entry.path))
+                            continue
+                        size = entry.stat().st_size
+                    except OSError as e:
+                        errors[Path(entry.path)] = e
+                        continue
+                    yield Path(entry.path), size
+        except OSError as e:
+            errors[current] = e
+
+
+def save_in_parallel(
+    files: Iterable[tuple[Path, StorageKey, int]],
+    save: Callable[[Path, StorageKey, int], R],
+    max_workers: int | None = None,
+    on_progress: Callable[[ArtifactProgress], None] | None = None,
+) -> tuple[dict[StorageKey, R], dict[Path, BaseException]]:
+    """
+    Call ``save`` on every file from a thread pool while ``files`` is still being produced.
+
+    Parameters
+    ----------
+    files : Iterable[tuple[Path, StorageKey, int]]
+        Source file, storage key and size of each file, e.g. from :func:`scan_files`.
+    save : Callable[[Path, StorageKey, int], R]
+        Saves one file.
+    max_workers : int | None, optional
+        Files saved at once, by default ``min(32, os.cpu_count() + 4)``
+    on_progress : Callable[[ArtifactProgress], None] | None, optional
+        Called after each file, from the worker that saved it, one call at a time.
+
+    Returns
+    -------
+    tuple[dict[StorageKey, R], dict[Path, BaseException]]
+        Result of ``save`` by storage key for the files saved, and the error by
+        source file for the others.
+
+    Raises
+    ------
+    BaseException
+        The first ``KeyboardInterrupt``, ``SystemExit`` or other error that is not an
+        ``Exception`` raised by ``save`` or ``on_progress``, once every other file is
+        finished.
+    """
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    results: dict[StorageKey, R] = {}
+    errors: dict[Path, BaseException] = {}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(workers * (1 + _QUEUED_PER_WORKER))
+    completed = bytes_completed = 0
+    total: int | None = None
+    fatal: list[BaseException] = []
+
+    def run(source_file: Path, storage_key: StorageKey, size_bytes: int) -> None:
+        nonlocal completed, bytes_completed
+        error: BaseException | None = None
+        try:
+            result = save(source_file, storage_key, size_bytes)
+        except BaseException as e:
+            # NOTE: The executor keeps whatever escapes in a future nobody reads, so
+            # every error is recorded here and the fatal ones re-raised at the end.
+            error = e
+        finally:
+            slots.release()
+        with lock:
+            completed += 1
+            if error is None:
+                results[storage_key] = result
+                bytes_completed += size_bytes
+            else:
+                logger.warning(f"Error saving '{source_file}': {error}")
+                errors[source_file] = error
+            if on_progress is None:
+                return
+            try:
+                on_progress(
+                    ArtifactProgress(
+                        source_file=source_file,
+                        storage_key=storage_key,
+                        error=error,
+                        completed=completed,
+                        failed=len(errors),
+                        total=total,
+                        bytes_completed=bytes_completed,
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Error in progress callback: {e}")
+            except BaseException as e:
+                fatal.append(e)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-upload") as pool:
+        submitted = 0
+        for source_file, storage_key, size_bytes in files:
+            slots.acquire()
+            pool.submit(run, source_file, storage_key, size_bytes)
+            submitted += 1
+        with lock:
+            total = submitted
+    fatal.extend(error for error in errors.values() if not isinstance(error, Exception))
+    if fatal:
+        raise fatal[0]
+    return results, errors
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import types
+import weakref
+from typing import Callable, Self
+
+from frostbound.experiments.types import StorageKey
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 1024
+DEFAULT_MAX_BATCH = 64
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class BackgroundWriter:
+    """
+    Write-behind queue running storage writes on a dedicated thread.
+
+    Writes are submitted per storage key as zero-argument callables. A write submitted
+    for a key that is still queued replaces the queued one, so a metric recorded at
+    every training step is only written as often as the queue is drained. The writer
+    thread drains the queue in batches, as soon as ``max_batch`` keys are queued or
+    ``flush_interval_seconds`` after the first queued write, whichever comes first.
+
+    Parameters
+    ----------
+    max_pending : int, optional
+        Distinct keys that can be queued before submit() blocks until the writer
+        catches up (backpressure), by default 1024
+    max_batch : int, optional
+        Queued keys that trigger an immediate drain, by default 64
+    flush_interval_seconds : float, optional
+        Longest time a write stays queued, by default 1.0
+
+    Examples
+    --------
+    >>> writer = BackgroundWriter(flush_interval_seconds=5.0)
+    >>> experiment = Experiment("llama_0250609_122016", storage, writer=writer)
+    >>> for step in range(10_000):
+    ...     experiment.record_metric("loss", train_step())  # never waits on disk
+    >>> experiment.complete()  # flushes the queue
+
+    Notes
+    -----
+    - **Errors**: A failing write is logged and does not stop the writer; the first
+      error since the last flush is raised by flush(). Should the writer thread
+      still stop, submit() and flush() raise instead of waiting for it
+    - **Exit**: Queued writes are flushed when the interpreter exits normally, or
+      when the writer is garbage collected without being closed
+    """
+
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self._queue = _WriteQueue(max_pending, max_batch, flush_interval_seconds)
+        # NOTE: finalize also runs at interpreter exit, and holds no reference
+        # to the writer, unlike atexit.register(self.close).
+        self._finalizer = weakref.finalize(self, self._queue.close)
+
+    @property
+    def max_pending(self) -> int:
+        """Distinct keys that can be queued before submit() blocks."""
+        return self._queue.max_pending
+
+    @property
+    def max_batch(self) -> int:
+        """Queued keys that trigger an immediate drain."""
+        return self._queue.max_batch
+
+    @property
+    def flush_interval_seconds(self) -> float:
+        """Longest time a write stays queued."""
+        return self._queue.flush_interval_seconds
+
+    @property
+    def pending(self) -> int:
+        """Number of writes queued or being written."""
+        return self._queue.pending
+
+    def submit(self, key: StorageKey, write: Callable[[], None]) -> None:
+        """
+        Queue a write, replacing any queued write for the same key.
+
+        Blocks while ``max_pending`` other keys are queued.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is closed or its thread has stopped.
+        """
+        self._queue.submit(key, write)
+
+    def flush(self) -> None:
+        """
+        Wait until every queued write has been written.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a write since the last flush.
+        RuntimeError
+            If the writer thread stopped before writing everything.
+        """
+        self._queue.flush()
+
+    def close(self) -> None:
+        """Write everything queued and stop the writer thread."""
+        self._finalizer()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class _WriteQueue:
+    """
+    Queue and thread of a BackgroundWriter.
+
+    The thread only references the queue, so a writer that is no longer used
+    can be garbage collected; its finalizer then closes the queue.
+    """
+
+    def __init__(self, max_pending: int, max_batch: int, flush_interval_seconds: float) -> None:
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self._pending: dict[StorageKey, Callable[[], None]] = {}
+        self._in_flight = 0
+        self._draining = False
+        self._closed = False
+        self._stopped = False
+        self._error: BaseException | None = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="experiment-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def submit(self, key: StorageKey, write: Callable[[], None]) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter is closed")
+            while key not in self._pending and len(self._pending) >= self.max_pending and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                raise RuntimeError("BackgroundWriter thread has stopped")
+            self._pending[key] = write
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        with self._condition:
+            self._draining = True
+            self._condition.notify_all()
+            while (self._pending or self._in_flight) and not self._stopped:
+                self._condition.wait()
+            unwritten = len(self._pending) + self._in_flight
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+        if unwritten:
+            raise RuntimeError(f"BackgroundWriter thread has stopped with {unwritten} writes not written")
+
+    def close(self) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        # NOTE: The last reference to the writer may be dropped by a write,
+        # in which case the finalizer runs on the writer thread itself.
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        with self._condition:
+            error, self._error = self._error, None
+        if error is not None:
+            logger.warning(f"Error in background write: {error}")
+
+    def _next_batch(self) -> dict[StorageKey, Callable[[], None]] | None:
+        """Wait for a batch to be due and take it, or return None once closed and drained."""
+        with self._condition:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._draining = False
+                self._condition.wait()
+
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(self._pending) < self.max_batch and not self._draining and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch, self._pending = self._pending, {}
+            self._in_flight = len(batch)
+            # NOTE: Wake submitters blocked on a full queue.
+            self._condition.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        try:
+            while (batch := self._next_batch()) is not None:
+                for key, write in batch.items():
+                    try:
+                        write()
+                    # NOTE: Even SystemExit from a write must not end the thread,
+                    # or everyone waiting on the queue would wait forever.
+                    except BaseException as e:
+                        logger.warning(f"Error writing '{key}' in the background: {e!r}")
+                        with self._condition:
+                            if self._error is None:
+                                self._error = e
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
@@ -0,0 +1,495 @@
+"""Statistical micro-benchmarks.
+
+:class:`BenchmarkRunner` measures a function the way ``timeit`` does, timing
+a calibrated number of back-to-back calls per sample with the same clock as
+:class:`~frostbound.instrumentation.timer.Timer`, and adds the statistics
+needed to tell real regressions from noise:
+
+- the number of calls per sample is calibrated so each sample lasts long
+  enough to dwarf the clock resolution;
+- warmup samples are discarded, and the garbage collector is disabled while
+  sampling (a full collection runs before each sample instead);
+- outliers are rejected with Tukey's fences;
+- results report the median and interquartile range with a distribution-free
+  confidence interval for the median;
+- two results can be compared with a Mann-Whitney U test;
+- async benchmarks run on a dedicated event loop.
+
+Results serialize to JSON so they can be stored and compared across commits.
+
+Examples
+--------
+>>> runner = BenchmarkRunner()
+>>> baseline = runner.run(plain_function, name="plain")
+>>> candidate = runner.run(timed(plain_function), name="timed")
+>>> comparison = compare(baseline, candidate)
+>>> comparison.ratio, comparison.significant
+(1.42, True)
+>>> runner.write_json("bench.json")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import itertools
+import json
+import math
+import platform
+import statistics
+import sys
+import threading
+import time
+import timeit
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+DEFAULT_REPEATS = 25
+DEFAULT_WARMUP = 3
+DEFAULT_TARGET_SAMPLE_SECONDS = 0.02
+DEFAULT_CONFIDENCE = 0.95
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Timing statistics of one benchmark, in seconds per call.
+
+    Attributes
+    ----------
+    name : str
+        Benchmark name.
+    loops : int
+        Calls timed back to back in each sample.
+    samples : list[float]
+        Seconds per call of each kept sample, in measurement order.
+    outliers : int
+        Number of samples rejected as outliers.
+    median, q1, q3, iqr : float
+        Median, quartiles and interquartile range of the samples.
+    mean, stdev, min : float
+        Mean, standard deviation and minimum of the samples.
+    ci_low, ci_high : float
+        Confidence interval of the median.
+    confidence : float
+        Confidence level of the interval.
+    """
+
+    name: str
+    loops: int
+    samples: list[float]
+    outliers: int
+    median: float
+    q1: float
+    q3: float
+    iqr: float
+    mean: float
+    stdev: float
+    min: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+
+    @classmethod
+    def from_samples(
+        cls,
+        name: str,
+        loops: int,
+        samples: Sequence[float],
+        reject_outliers: bool = True,
+        confidence: float = DEFAULT_CONFIDENCE,
+    ) -> BenchmarkResult:
+        """Compute statistics from per-call sample times.
+
+        Parameters
+        ----------
+        name : str
+            Benchmark name.
+        loops : int
+            Calls per sample.
+        samples : Sequence[float]
+            Seconds per call of each sample; at least one is required.
+        reject_outliers : bool, optional
+            Drop samples outside Tukey's fences (1.5 IQR beyond the quartiles).
+            Defaults to True.
+        confidence : float, optional
+            Confidence level of the median interval. Defaults to 0.95.
+        """
+        if not samples:
+            raise ValueError("At least one sample is required")
+
+        kept = list(samples)
+        if reject_outliers and len(kept) >= 4:
+            q1, _, q3 = _quartiles(kept)
+            low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            kept = [sample for sample in kept if low <= sample <= high]
+
+        q1, median, q3 = _quartiles(kept)
+        ci_low, ci_high = _median_confidence_interval(kept, confidence)
+        return cls(
+            name=name,
+            loops=loops,
+            samples=kept,
+            outliers=len(samples) - len(kept),
+            median=median,
+            q1=q1,
+            q3=q3,
+            iqr=q3 - q1,
+            mean=statistics.fmean(kept),
+            stdev=statistics.stdev(kept) if len(kept) > 1 else 0.0,
+            min=min(kept),
+            ci_low=ci_low,
+            ci_high=ci_high,
+            confidence=confidence,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BenchmarkResult:
+        """Rebuild a result from :meth:`to_dict` output, ignoring unknown keys."""
+        return cls(**{f.name: data[f.name] for f in fields(cls)})
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Outcome of comparing a candidate benchmark against a baseline.
+
+    Attributes
+    ----------
+    baseline, candidate : str
+        Names of the compared benchmarks.
+    ratio : float
+        Candidate median divided by baseline median; above 1 is slower.
+    p_value : float
+        Two-sided p-value of the Mann-Whitney U test on the samples.
+    significant : bool
+        Whether ``p_value`` is below ``alpha``.
+    alpha : float
+        Significance level used.
+    """
+
+    baseline: str
+    candidate: str
+    ratio: float
+    p_value: float
+    significant: bool
+    alpha: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the comparison as a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+def compare(baseline: BenchmarkResult, candidate: BenchmarkResult, alpha: float = 0.05) -> Comparison:
+    """Test whether two benchmarks differ significantly.
+
+    Uses the Mann-Whitney U test, which makes no normality assumption and is
+    robust to the skewed, heavy-tailed distributions typical of timings.
+
+    Parameters
+    ----------
+    baseline : BenchmarkResult
+        Reference result.
+    candidate : BenchmarkResult
+        Result to compare against the reference.
+    alpha : float, optional
+        Significance level. Defaults to 0.05.
+
+    Returns
+    -------
+    Comparison
+        Median ratio and test outcome.
+    """
+    p_value = _mann_whitney_p_value(baseline.samples, candidate.samples)
+    return Comparison(
+        baseline=baseline.name,
+        candidate=candidate.name,
+        ratio=candidate.median / baseline.median if baseline.median else math.inf,
+        p_value=p_value,
+        significant=p_value < alpha,
+        alpha=alpha,
+    )
+
+
+@dataclass
+class BenchmarkRunner:
+    """Run benchmarks and collect their results.
+
+    Attributes
+    ----------
+    repeats : int
+        Number of samples kept per benchmark, before outlier rejection.
+    warmup : int
+        Number of samples run and discarded first.
+    target_sample_seconds : float
+        Minimum duration of one sample; the calls per sample are calibrated
+        to reach it.
+    disable_gc : bool
+        Disable the garbage collector while sampling, running a full
+        collection before each sample. Defaults to True.
+    reject_outliers : bool
+        Drop outlier samples before computing statistics.
+    confidence : float
+        Confidence level of the median interval.
+    results : list[BenchmarkResult]
+        Results of every benchmark run so far.
+    comparisons : list[Comparison]
+        Comparisons made with :meth:`compare`.
+    """
+
+    repeats: int = DEFAULT_REPEATS
+    warmup: int = DEFAULT_WARMUP
+    target_sample_seconds: float = DEFAULT_TARGET_SAMPLE_SECONDS
+    disable_gc: bool = True
+    reject_outliers: bool = True
+    confidence: float = DEFAULT_CONFIDENCE
+    results: list[BenchmarkResult] = field(default_factory=list)
+    comparisons: list[Comparison] = field(default_factory=list)
+
+    def run(self, func: Callable[[], object], name: str | None = None, loops: int | None = None) -> BenchmarkResult:
+        """Benchmark a synchronous callable taking no arguments.
+
+        Parameters
+        ----------
+        func : Callable[[], object]
+            Code to measure; use ``functools.partial`` or a lambda to bind arguments.
+        name : str | None, optional
+            Benchmark name. Defaults to the function name.
+        loops : int | None, optional
+            Calls per sample. Calibrated automatically when not given.
+
+        Returns
+        -------
+        BenchmarkResult
+            Statistics of the benchmark, also appended to :attr:`results`.
+        """
+
+        def sample(count: int) -> float:
+            clock = timeit.default_timer
+            start = clock()
+            for _ in itertools.repeat(None, count):
+                func()
+            return clock() - start
+
+        return self._measure(sample, name or str(getattr(func, "__name__", "benchmark")), loops)
+
+    def run_async(
+        self, func: Callable[[], Awaitable[object]], name: str | None = None, loops: int | None = None
+    ) -> BenchmarkResult:
+        """Benchmark a coroutine function taking no arguments.
+
+        Every sample awaits ``func()`` back to back inside a single task on a
+        dedicated event loop, so the loop overhead per call is the one of an
+        ``await`` and not the one of scheduling a new task. The loop runs in a
+        helper thread when this method is called from a running loop.
+
+        Parameters
+        ----------
+        func : Callable[[], Awaitable[object]]
+            Coroutine function to measure.
+        name : str | None, optional
+            Benchmark name. Defaults to the function name.
+        loops : int | None, optional
+            Calls per sample. Calibrated automatically when not given.
+        """
+
+        async def timed_calls(count: int) -> float:
+            clock = timeit.default_timer
+            start = clock()
+            for _ in itertools.repeat(None, count):
+                await func()
+            return clock() - start
+
+        def measure() -> BenchmarkResult:
+            loop = asyncio.new_event_loop()
+            try:
+                return self._measure(
+                    lambda count: loop.run_until_complete(timed_calls(count)),
+                    name or str(getattr(func, "__name__", "benchmark")),
+                    loops,
+                )
+            finally:
+                loop.close()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return measure()
+
+        results: list[BenchmarkResult] = []
+        errors: list[BaseException] = []
+
+        def target() -> None:
+            try:
+                results.append(measure())
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=target, name="benchmark-loop")
+        thread.start()
+        thread.join()
+        if errors:
+            raise errors[0]
+        return results[0]
+
+    def compare(self, baseline: BenchmarkResult, candidate: BenchmarkResult, alpha: float = 0.05) -> Comparison:
+        """Compare two results with :func:`compare` and keep the outcome."""
+        comparison = compare(baseline, candidate, alpha)
+        self.comparisons.append(comparison)
+        return comparison
+
+    def calibrate(self, sample: Callable[[int], float]) -> int:
+        """Find the number of calls for a sample to last ``target_sample_seconds``.
+
+        Parameters
+        ----------
+        sample : Callable[[int], float]
+            Runs the given number of calls and returns the elapsed seconds.
+
+        Returns
+        -------
+        int
+            Calls per sample.
+        """
+        loops = 1
+        while True:
+            elapsed = sample(loops)
+            if elapsed >= self.target_sample_seconds:
+                return loops
+            if elapsed <= 0:
+                loops *= 10
+                continue
+            # NOTE: Overshoot by 20% so the estimate, taken on a cold function, does
+            # not leave samples just under the target.
+            loops = max(loops * 2, math.ceil(loops * self.target_sample_seconds / elapsed * 1.2))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return results, comparisons and environment as a dictionary."""
+        return {
+            "environment": environment(),
+            "settings": {
+                "repeats": self.repeats,
+                "warmup": self.warmup,
+                "target_sample_seconds": self.target_sample_seconds,
+                "disable_gc": self.disable_gc,
+                "reject_outliers": self.reject_outliers,
+                "confidence": self.confidence,
+            },
+            "results": [result.to_dict() for result in self.results],
+            "comparisons": [comparison.to_dict() for comparison in self.comparisons],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Return :meth:`to_dict` serialized as JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def write_json(self, path: Path | str) -> None:
+        """Write :meth:`to_json` to a file."""
+        Path(path).write_text(self.to_json() + "\n", encoding="utf-8")
+
+    def _measure(self, sample: Callable[[int], float], name: str, loops: int | None) -> BenchmarkResult:
+        gc_was_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.disable()
+        try:
+            if loops is None:
+                loops = self.calibrate(sample)
+            samples: list[float] = []
+            for index in range(self.warmup + self.repeats):
+                if self.disable_gc:
+                    gc.collect()
+                elapsed = sample(loops)
+                if index >= self.warmup:
+                    samples.append(elapsed / loops)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        result = BenchmarkResult.from_samples(name, loops, samples, self.reject_outliers, self.confidence)
+        self.results.append(result)
+        return result
+
+
+def load_results(path: Path | str) -> dict[str, BenchmarkResult]:
+    """Load the results of a JSON file written by :meth:`BenchmarkRunner.write_json`.
+
+    Returns
+    -------
+    dict[str, BenchmarkResult]
+        Results keyed by benchmark name.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    results = (BenchmarkResult.from_dict(result) for result in data.get("results", []))
+    return {result.name: result for result in results}
+
+
+def environment() -> dict[str, Any]:
+    """Describe the interpreter and machine the benchmarks ran on."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "timestamp": time.time(),
+    }
+
+
+def _quantile(ordered: Sequence[float], q: float) -> float:
+    """Linearly interpolated quantile of sorted values."""
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _quartiles(values: Sequence[float]) -> tuple[float, float, float]:
+    ordered = sorted(values)
+    return _quantile(ordered, 0.25), _quantile(ordered, 0.5), _quantile(ordered, 0.75)
+
+
+def _median_confidence_interval(values: Sequence[float], confidence: float) -> tuple[float, float]:
+    """Distribution-free confidence interval of the median from order statistics."""
+    ordered = sorted(values)
+    n = len(ordered)
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    # NOTE: The rank of the sample median is Binomial(n, 1/2); use its normal
+    # approximation to pick the order statistics bounding the interval.
+    half_width = z * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return ordered[low], ordered[max(low, high)]
+
+
+def _mann_whitney_p_value(first: Sequence[float], second: Sequence[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, normal approximation with tie correction."""
+    n1, n2 = len(first), len(second)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    pooled = sorted(itertools.chain(((value, 0) for value in first), ((value, 1) for value in second)))
+    rank_sum_first = 0.0
+    tie_term = 0.0
+    index = 0
+    while index < len(pooled):
+        end = index
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[index][0]:
+            end += 1
+        ties = end - index + 1
+        average_rank = (index + end) / 2 + 1
+        rank_sum_first += average_rank * sum(1 for _, group in pooled[index : end + 1] if group == 0)
+        tie_term += ties**3 - ties
+        index = end + 1
+
+    u = rank_sum_first - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # NOTE: Continuity correction towards the mean.
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, 2 * (1 - statistics.NormalDist().cdf(max(0.0, z))))
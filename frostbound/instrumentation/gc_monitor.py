@@ -0,0 +1,273 @@
+"""Measure garbage-collection pauses and blame them on the blocks they hit.
+
+:class:`GCMonitor` registers a :data:`gc.callbacks` hook that times every
+collection and records, per generation, into a
+:class:`~frostbound.instrumentation.histogram.HistogramRegistry`:
+
+- ``<name>.gen<N>``: pause duration (ns);
+- ``<name>.gen<N>.collected`` / ``<name>.gen<N>.uncollectable``: objects
+  freed and found uncollectable per collection;
+- ``<name>.gen<N>.interval``: time between two collections of the generation
+  (ns). Short intervals mean high allocation pressure.
+
+A collection stops every thread, so it pauses whatever block is running at
+that moment. While a monitor runs, every
+:class:`~frostbound.instrumentation.tracing.Span` started (by a
+:class:`~frostbound.instrumentation.timer.Timer`, ``timed`` or a
+:class:`~frostbound.instrumentation.tracing.Tracer`) is tagged with the GC
+time and the collections that overlapped it: they appear in
+:attr:`Span.metrics`, summed per call-tree node, and as arguments of exported
+trace events. Spans only exist while a tracer is installed; to tag the
+measurements of timers without one, pass :meth:`GCMonitor.collector` to them.
+:meth:`GCMonitor.overlapping` returns the pauses within any
+``perf_counter_ns`` interval.
+
+Examples
+--------
+>>> tracer = Tracer().install()
+>>> monitor = GCMonitor().start()
+>>> with Timer(name="handler"):
+...     handle()
+>>> tracer.call_tree()[0].metrics
+{'gc_pause_ns': 48211, 'gc_collections': 1, 'gc_gen2_collections': 0}
+>>> with Timer(name="handler", collectors=[monitor.collector()]) as t:
+...     handle()
+>>> t.metrics["gc_pause_ns"], t.metrics["gc_gen2_collections"]
+(48211, 0)
+>>> histogram_registry.snapshot()["gc.gen2"].p99
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import threading
+import time
+import types
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Self
+
+from frostbound.instrumentation.histogram import HistogramRegistry, histogram_registry
+from frostbound.instrumentation.tracing import add_span_collector, remove_span_collector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAUSES = 1024
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class GCPause:
+    """One garbage collection.
+
+    Attributes
+    ----------
+    generation : int
+        Oldest generation collected.
+    start_ns : int
+        ``time.perf_counter_ns()`` when the collection started.
+    duration_ns : int
+        Length of the pause.
+    collected : int
+        Objects freed.
+    uncollectable : int
+        Objects found uncollectable and moved to ``gc.garbage``.
+    interval_ns : int | None
+        Time since the previous collection of the same generation ended, or
+        None for the first one seen.
+    """
+
+    generation: int
+    start_ns: int
+    duration_ns: int
+    collected: int
+    uncollectable: int
+    interval_ns: int | None = None
+
+    @property
+    def end_ns(self) -> int:
+        """``time.perf_counter_ns()`` when the collection ended."""
+        return self.start_ns + self.duration_ns
+
+
+class GCCollector:
+    """Collector reporting the GC pauses that overlapped a block.
+
+    Reports ``gc_pause_ns``, ``gc_collections`` and ``gc_gen2_collections``.
+    Created by :meth:`GCMonitor.collector`.
+    """
+
+    def __init__(self, monitor: GCMonitor) -> None:
+        self.monitor = monitor
+
+    def start(self) -> tuple[int, int, int]:
+        monitor = self.monitor
+        return monitor.pause_ns, monitor.total_collections, monitor.collections[2]
+
+    def stop(self, state: tuple[int, int, int]) -> dict[str, int]:
+        pause_ns, collections, gen2 = state
+        monitor = self.monitor
+        return {
+            "gc_pause_ns": monitor.pause_ns - pause_ns,
+            "gc_collections": monitor.total_collections - collections,
+            "gc_gen2_collections": monitor.collections[2] - gen2,
+        }
+
+
+class GCMonitor:
+    """Time garbage collections and record them per generation.
+
+    Parameters
+    ----------
+    registry : HistogramRegistry | None, optional
+        Registry receiving the histograms. Defaults to the module-level
+        ``histogram_registry``.
+    name : str, optional
+        Prefix of the histogram names. Defaults to ``"gc"``.
+    max_pauses : int, optional
+        Number of most recent pauses kept for :meth:`overlapping`. Defaults to
+        1024.
+    on_pause : Callable[[GCPause], None] | None, optional
+        Called with every pause, from the background thread that records them.
+
+    Notes
+    -----
+    The callback runs inside the collector, where taking a lock could
+    deadlock with the very thread that triggered the collection. It therefore
+    only updates counters and queues the pause; a background thread records
+    queued pauses into the histograms about once per second, and so do
+    :meth:`flush` and :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        registry: HistogramRegistry | None = None,
+        name: str = "gc",
+        max_pauses: int = DEFAULT_MAX_PAUSES,
+        on_pause: Callable[[GCPause], None] | None = None,
+    ) -> None:
+        self.registry = registry or histogram_registry
+        self.name = name
+        self.on_pause = on_pause
+        self.pause_ns = 0
+        self.collections = [0, 0, 0]
+        self.total_collections = 0
+        self._pauses: deque[GCPause] = deque(maxlen=max_pauses)
+        self._pending: deque[GCPause] = deque()
+        self._last_end_ns: list[int | None] = [None, None, None]
+        self._started_ns = 0
+        self._flush_lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._stop_flushing = threading.Event()
+        self._span_collector = GCCollector(self)
+
+    @property
+    def running(self) -> bool:
+        """Whether collections are being timed."""
+        return self._on_gc in gc.callbacks
+
+    def start(self) -> Self:
+        """Register the GC callback, start recording pauses and tagging new spans."""
+        if self.running:
+            return self
+        self._stop_flushing.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="gc-monitor", daemon=True)
+        self._flusher.start()
+        gc.callbacks.append(self._on_gc)
+        add_span_collector(self._span_collector)
+        return self
+
+    def stop(self) -> None:
+        """Unregister the GC callback, stop tagging spans and record all queued pauses."""
+        remove_span_collector(self._span_collector)
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        self._stop_flushing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def collector(self) -> GCCollector:
+        """Return a collector tagging timer measurements with overlapping GC pauses."""
+        return GCCollector(self)
+
+    def pauses(self) -> list[GCPause]:
+        """Return the most recent pauses, oldest first."""
+        while True:
+            try:
+                return list(self._pauses)
+            except RuntimeError:
+                # NOTE: A collection triggered while copying appended to the deque.
+                continue
+
+    def overlapping(self, start_ns: int, end_ns: int) -> list[GCPause]:
+        """Return the kept pauses overlapping ``[start_ns, end_ns]`` (``perf_counter_ns``)."""
+        return [pause for pause in self.pauses() if pause.start_ns < end_ns and pause.end_ns > start_ns]
+
+    def flush(self) -> None:
+        """Record the queued pauses into the histograms and call ``on_pause``."""
+        with self._flush_lock:
+            pending = self._pending
+            registry, name = self.registry, self.name
+            while pending:
+                pause = pending.popleft()
+                prefix = f"{name}.gen{pause.generation}"
+                registry.histogram(prefix).record(pause.duration_ns)
+                registry.histogram(f"{prefix}.collected").record(pause.collected)
+                registry.histogram(f"{prefix}.uncollectable").record(pause.uncollectable)
+                if pause.interval_ns is not None:
+                    registry.histogram(f"{prefix}.interval").record(pause.interval_ns)
+                if self.on_pause is not None:
+                    try:
+                        self.on_pause(pause)
+                    except Exception as e:
+                        logger.warning(f"Error in GC pause callback: {e}")
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter_ns()
+        if phase == "start":
+            self._started_ns = now
+            return
+        if not self._started_ns:
+            return
+
+        generation = min(info["generation"], 2)
+        duration = now - self._started_ns
+        self._started_ns = 0
+        self.pause_ns += duration
+        self.collections[generation] += 1
+        self.total_collections += 1
+
+        last_end = self._last_end_ns[generation]
+        self._last_end_ns[generation] = now
+        pause = GCPause(
+            generation=generation,
+            start_ns=now - duration,
+            duration_ns=duration,
+            collected=info.get("collected", 0),
+            uncollectable=info.get("uncollectable", 0),
+            interval_ns=now - duration - last_end if last_end is not None else None,
+        )
+        # NOTE: deque.append is atomic and takes no lock, so it is safe here.
+        self._pauses.append(pause)
+        self._pending.append(pause)
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flushing.wait(_FLUSH_INTERVAL_SECONDS):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Error recording GC pauses: {e}")
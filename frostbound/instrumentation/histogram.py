@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Callable
+
+from frostbound.instrumentation.sampling import Sampler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUB_BUCKET_BITS = 7
+"""128 linear sub-buckets per power of two, i.e. a relative error below 0.8%."""
+
+SNAPSHOT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Summary statistics of a histogram at a point in time.
+
+    Values are in the unit that was recorded; timers record nanoseconds.
+
+    Attributes
+    ----------
+    count : int
+        Number of recorded values.
+    sum : int
+        Sum of recorded values.
+    min : int
+        Smallest recorded value, 0 if empty.
+    max : int
+        Largest recorded value, 0 if empty.
+    p50, p90, p99, p999 : int
+        Estimated percentiles, accurate to the histogram's bucket resolution.
+    """
+
+    count: int
+    sum: int
+    min: int
+    max: int
+    p50: int
+    p90: int
+    p99: int
+    p999: int
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of recorded values, 0.0 if empty."""
+        return self.sum / self.count if self.count else 0.0
+
+
+class LogHistogram:
+    """HDR-style log-linear histogram of non-negative integer values.
+
+    Each power of two is split into ``2 ** sub_bucket_bits`` linear
+    sub-buckets, so every value is stored with a bounded relative error while
+    the number of buckets only grows with the logarithm of the largest value.
+    Values below ``2 ** (sub_bucket_bits + 1)`` are stored exactly.
+
+    Recording is O(1) and thread-safe.
+
+    Parameters
+    ----------
+    sub_bucket_bits : int, optional
+        Number of bits of precision kept per value. Defaults to 7.
+
+    Examples
+    --------
+    >>> histogram = LogHistogram()
+    >>> for value in range(1, 1001):
+    ...     histogram.record(value)
+    >>> histogram.snapshot().p99
+    989
+    """
+
+    def __init__(self, sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self._counts: list[int] = []
+        self._count: int = 0
+        self._sum: int = 0
+        self._min: int = 0
+        self._max: int = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_buckets(
+        cls,
+        counts: Iterable[int],
+        total: int,
+        minimum: int,
+        maximum: int,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+    ) -> LogHistogram:
+        """Rebuild a histogram from its bucket counts.
+
+        Parameters
+        ----------
+        counts : Iterable[int]
+            Count of each bucket, indexed like :meth:`bucket_index`.
+        total : int
+            Sum of the recorded values.
+        minimum, maximum : int
+            Smallest and largest recorded values.
+        sub_bucket_bits : int, optional
+            Precision the counts were recorded with. Defaults to 7.
+        """
+        histogram = cls(sub_bucket_bits)
+        histogram._counts = list(counts)
+        histogram._count = sum(histogram._counts)
+        if histogram._count:
+            histogram._sum, histogram._min, histogram._max = total, minimum, maximum
+        return histogram
+
+    @property
+    def count(self) -> int:
+        """Number of recorded values."""
+        return self._count
+
+    def bucket_index(self, value: int) -> int:
+        """Return the index of the bucket holding ``value``."""
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+        return (shift << self.sub_bucket_bits) + (value >> shift)
+
+    def bucket_bounds(self, index: int) -> tuple[int, int]:
+        """Return the inclusive ``(lowest, highest)`` values of a bucket."""
+        shift = (index >> self.sub_bucket_bits) - 1
+        if shift <= 0:
+            return index, index
+        mantissa = index - (shift << self.sub_bucket_bits)
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value.
+
+        Parameters
+        ----------
+        value : int
+            Value to record. Negative values are clamped to 0.
+        count : int, optional
+            Number of occurrences the value stands for, e.g. the sampling
+            interval when only every Nth call is measured. Defaults to 1.
+        """
+        if value < 0:
+            value = 0
+        index = self.bucket_index(value)
+
+        with self._lock:
+            counts = self._counts
+            if index >= len(counts):
+                counts.extend([0] * (index + 1 - len(counts)))
+            counts[index] += count
+
+            if self._count == 0 or value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+            self._count += count
+            self._sum += value * count
+
+    def record_many(self, values: Iterable[int], count: int = 1) -> None:
+        """Record several values at once, taking the lock only once.
+
+        Parameters
+        ----------
+        values : Iterable[int]
+            Values to record. Negative values are clamped to 0.
+        count : int, optional
+            Number of occurrences each value stands for. Defaults to 1.
+        """
+        clamped = [max(0, value) for value in values]
+        if not clamped:
+            return
+        indexes = [self.bucket_index(value) for value in clamped]
+        smallest, largest, total = min(clamped), max(clamped), sum(clamped)
+
+        with self._lock:
+            counts = self._counts
+            highest = max(indexes)
+            if highest >= len(counts):
+                counts.extend([0] * (highest + 1 - len(counts)))
+            for index in indexes:
+                counts[index] += count
+
+            if self._count == 0 or smallest < self._min:
+                self._min = smallest
+            self._max = max(self._max, largest)
+            self._count += len(clamped) * count
+            self._sum += total * count
+
+    def merge(self, other: LogHistogram) -> None:
+        """Add all values recorded in ``other`` to this histogram.
+
+        Parameters
+        ----------
+        other : LogHistogram
+            Histogram with the same ``sub_bucket_bits``.
+        """
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different sub_bucket_bits")
+
+        with other._lock:
+            other_counts = list(other._counts)
+            other_count, other_sum, other_min, other_max = other._count, other._sum, other._min, other._max
+
+        if other_count == 0:
+            return
+
+        with self._lock:
+            counts = self._counts
+            if len(other_counts) > len(counts):
+                counts.extend([0] * (len(other_counts) - len(counts)))
+            for index, bucket_count in enumerate(other_counts):
+                if bucket_count:
+                    counts[index] += bucket_count
+
+            if self._count == 0 or other_min < self._min:
+                self._min = other_min
+            self._max = max(self._max, other_max)
+            self._count += other_count
+            self._sum += other_sum
+
+    def percentile(self, quantile: float) -> int:
+        """Estimate the value at ``quantile`` (between 0 and 1)."""
+        with self._lock:
+            return self._percentiles((quantile,))[0]
+
+    def snapshot(self, reset: bool = False) -> HistogramSnapshot:
+        """Summarize the recorded values.
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Clear the histogram atomically after taking the snapshot, so no
+            value is counted twice or lost between periodic snapshots.
+
+        Returns
+        -------
+        HistogramSnapshot
+            Count, sum, min, max and p50/p90/p99/p999.
+        """
+        with self._lock:
+            p50, p90, p99, p999 = self._percentiles(SNAPSHOT_QUANTILES)
+            snapshot = HistogramSnapshot(
+                count=self._count,
+                sum=self._sum,
+                min=self._min,
+                max=self._max,
+                p50=p50,
+                p90=p90,
+                p99=p99,
+                p999=p999,
+            )
+            if reset:
+                self._reset()
+        return snapshot
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._counts = []
+        self._count = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    def _percentiles(self, quantiles: tuple[float, ...]) -> list[int]:
+        # NOTE: Caller holds the lock. Quantiles must be in ascending order so a
+        # single cumulative pass over the buckets answers all of them.
+        if self._count == 0:
+            return [0] * len(quantiles)
+
+        results: list[int] = []
+        targets = [max(1, min(self._count, math.ceil(q * self._count))) for q in quantiles]
+        cumulative = 0
+        position = 0
+        for index, bucket_count in enumerate(self._counts):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while position < len(targets) and cumulative >= targets[position]:
+                lowest, highest = self.bucket_bounds(index)
+                midpoint = (lowest + highest) // 2
+                results.append(min(max(midpoint, self._min), self._max))
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+
+class HistogramRegistry:
+    """In-process registry of named :class:`LogHistogram` instances.
+
+    Histograms are created on first use. The registry can periodically hand a
+    snapshot of every histogram to a callback (for example an exporter or a
+    log line) from a background thread, resetting them so each report covers
+    one interval.
+
+    The registry also owns the :class:`~frostbound.instrumentation.sampling.Sampler`
+    of each sampled timer, so sampling rates can be changed by name at runtime
+    with :meth:`configure_sampling`.
+
+    Parameters
+    ----------
+    sub_bucket_bits : int, optional
+        Precision of histograms created by this registry. Defaults to 7.
+
+    Examples
+    --------
+    >>> registry = HistogramRegistry()
+    >>> registry.histogram("db.query").record(1_250_000)
+    >>> registry.snapshot()["db.query"].count
+    1
+    >>> registry.start_reporting(60.0, lambda snapshots: print(snapshots))
+    >>> registry.configure_sampling("db.query", every=1)  # measure every call for now
+    """
+
+    def __init__(self, sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self._histograms: dict[str, LogHistogram] = {}
+        self._samplers: dict[str, Sampler] = {}
+        self._lock = threading.Lock()
+        self._reporter: threading.Thread | None = None
+        self._stop_reporting = threading.Event()
+
+    def histogram(self, name: str) -> LogHistogram:
+        """Return the histogram called ``name``, creating it if needed."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LogHistogram(self.sub_bucket_bits))
+        return histogram
+
+    def sampler(self, name: str, every: int = 1, probability: float | None = None) -> Sampler:
+        """Return the sampler called ``name``, creating it if needed.
+
+        ``every`` and ``probability`` only apply when the sampler is created;
+        use :meth:`configure_sampling` to change an existing sampler.
+        """
+        sampler = self._samplers.get(name)
+        if sampler is None:
+            with self._lock:
+                sampler = self._samplers.get(name)
+                if sampler is None:
+                    sampler = self._samplers[name] = Sampler(every=every, probability=probability)
+        return sampler
+
+    def configure_sampling(self, name: str, every: int | None = None, probability: float | None = None) -> None:
+        """Change the sampling rate of the timer recording into ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Histogram (timer) name.
+        every : int | None, optional
+            Measure one call out of ``every``.
+        probability : float | None, optional
+            Measure each call with this probability.
+        """
+        self.sampler(name).configure(every=every, probability=probability)
+
+    def names(self) -> list[str]:
+        """Return the sorted names of all registered histograms."""
+        with self._lock:
+            return sorted(self._histograms)
+
+    def snapshot(self, reset: bool = False) -> dict[str, HistogramSnapshot]:
+        """Snapshot every registered histogram.
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Clear each histogram after it is snapshotted. Defaults to False.
+
+        Returns
+        -------
+        dict[str, HistogramSnapshot]
+            Snapshots keyed by histogram name.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        return {name: histogram.snapshot(reset=reset) for name, histogram in histograms}
+
+    def reset(self) -> None:
+        """Clear every registered histogram, keeping the names registered."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+    def clear(self) -> None:
+        """Remove every registered histogram.
+
+        Functions already decorated with ``timed`` keep recording into their
+        removed histograms, which are no longer reported; use :meth:`reset` to
+        zero histograms in place instead. Samplers are kept: timers and timed
+        functions hold on to theirs, so dropping them would stop
+        :meth:`configure_sampling` from reaching those.
+        """
+        with self._lock:
+            self._histograms.clear()
+
+    def start_reporting(
+        self,
+        interval_seconds: float,
+        callback: Callable[[dict[str, HistogramSnapshot]], None],
+        reset: bool = True,
+    ) -> None:
+        """Call ``callback`` with a snapshot every ``interval_seconds``.
+
+        Parameters
+        ----------
+        interval_seconds : float
+            Time between two reports.
+        callback : Callable[[dict[str, HistogramSnapshot]], None]
+            Receives the snapshots. Exceptions are logged and do not stop reporting.
+        reset : bool, optional
+            Reset histograms after each report. Defaults to True.
+        """
+        self.stop_reporting()
+        self._stop_reporting.clear()
+
+        def report() -> None:
+            while not self._stop_reporting.wait(interval_seconds):
+                try:
+                    callback(self.snapshot(reset=reset))
+                except Exception as e:
+                    logger.warning(f"Error in histogram report callback: {e}")
+
+        self._reporter = threading.Thread(target=report, name="histogram-reporter", daemon=True)
+        self._reporter.start()
+
+    def stop_reporting(self) -> None:
+        """Stop periodic reporting started with :meth:`start_reporting`."""
+        self._stop_reporting.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+
+
+histogram_registry = HistogramRegistry()
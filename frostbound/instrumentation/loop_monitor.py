@@ -0,0 +1,198 @@
+"""Detect synchronous code blocking an asyncio event loop.
+
+:class:`LoopMonitor` runs a heartbeat task on the loop that sleeps for a fixed
+interval and records how late it wakes up. That lag is the time callbacks on
+the loop had to wait, and is recorded into a
+:class:`~frostbound.instrumentation.histogram.HistogramRegistry` next to the
+timer histograms, so latency spikes can be put side by side with loop lag.
+
+A watchdog thread notices when the heartbeat is overdue while the loop is
+still blocked, and samples the stack of the loop thread at that moment. When
+the loop resumes, the blocking episode is reported as a :class:`BlockingEvent`
+with its duration and the sampled stack, which points at the offending code.
+
+Examples
+--------
+>>> async def main() -> None:
+...     async with LoopMonitor(slow_threshold_seconds=0.05) as monitor:
+...         await serve()
+...     for event in monitor.blocking_events():
+...         print(event.duration_seconds, event.stack)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+import types
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Self
+
+from frostbound.instrumentation.histogram import HistogramRegistry, histogram_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BlockingEvent:
+    """One episode of the event loop being blocked.
+
+    Attributes
+    ----------
+    started_at : float
+        ``time.time()`` when the heartbeat was due.
+    duration_seconds : float
+        How long past its due time the heartbeat ran.
+    stack : str | None
+        Formatted stack of the loop thread sampled while it was blocked, or
+        None if the loop resumed before the watchdog looked.
+    """
+
+    started_at: float
+    duration_seconds: float
+    stack: str | None
+
+
+class LoopMonitor:
+    """Measure event-loop lag and report what blocked the loop.
+
+    Parameters
+    ----------
+    registry : HistogramRegistry | None, optional
+        Registry receiving the lag histogram, in nanoseconds. Defaults to the
+        module-level ``histogram_registry``.
+    name : str, optional
+        Histogram name for the lag. Blocking durations are also recorded into
+        ``<name>.blocked``. Defaults to ``"asyncio.loop_lag"``.
+    interval_seconds : float, optional
+        Heartbeat period. Defaults to 0.1.
+    slow_threshold_seconds : float, optional
+        Lag from which the loop counts as blocked. Defaults to 0.1.
+    max_events : int, optional
+        Number of most recent blocking events kept. Defaults to 100.
+    on_blocking : Callable[[BlockingEvent], None] | None, optional
+        Called on the loop for every blocking event. When not given, events
+        are logged as warnings with their stack.
+
+    Notes
+    -----
+    The heartbeat itself adds one timer callback per interval to the loop; the
+    watchdog thread only reads a timestamp until the loop is overdue.
+    """
+
+    def __init__(
+        self,
+        registry: HistogramRegistry | None = None,
+        name: str = "asyncio.loop_lag",
+        interval_seconds: float = 0.1,
+        slow_threshold_seconds: float = 0.1,
+        max_events: int = 100,
+        on_blocking: Callable[[BlockingEvent], None] | None = None,
+    ) -> None:
+        self.registry = registry or histogram_registry
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.slow_threshold_seconds = slow_threshold_seconds
+        self.on_blocking = on_blocking
+        self._events: deque[BlockingEvent] = deque(maxlen=max_events)
+        self._heartbeat: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_watchdog = threading.Event()
+        self._loop_thread_id: int | None = None
+        self._next_beat: float = 0.0
+        self._sampled_stack: str | None = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop.
+
+        Raises
+        ------
+        RuntimeError
+            If called outside of a running event loop.
+        """
+        if self._heartbeat is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._next_beat = time.monotonic() + self.interval_seconds
+        self._sampled_stack = None
+        self._heartbeat = loop.create_task(self._beat(), name="loop-monitor-heartbeat")
+
+        self._stop_watchdog.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stop_watchdog.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat
+            self._heartbeat = None
+
+    async def __aenter__(self) -> Self:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    def blocking_events(self) -> list[BlockingEvent]:
+        """Return the most recent blocking events, oldest first."""
+        return list(self._events)
+
+    async def _beat(self) -> None:
+        lag_histogram = self.registry.histogram(self.name)
+        blocked_histogram = self.registry.histogram(f"{self.name}.blocked")
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            lag = max(0.0, now - self._next_beat)
+            self._next_beat = now + self.interval_seconds
+            lag_histogram.record(int(lag * 1e9))
+
+            if lag >= self.slow_threshold_seconds:
+                stack, self._sampled_stack = self._sampled_stack, None
+                event = BlockingEvent(started_at=time.time() - lag, duration_seconds=lag, stack=stack)
+                blocked_histogram.record(int(lag * 1e9))
+                self._events.append(event)
+                self._report(event)
+            else:
+                self._sampled_stack = None
+
+    def _watch(self) -> None:
+        poll_seconds = self.slow_threshold_seconds / 2
+        while not self._stop_watchdog.wait(poll_seconds):
+            next_beat = self._next_beat
+            if self._sampled_stack is not None or time.monotonic() - next_beat < self.slow_threshold_seconds:
+                continue
+            # NOTE: The heartbeat is overdue, so the loop thread is stuck in a
+            # callback right now; its current frame shows which one.
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is not None and self._next_beat == next_beat:
+                self._sampled_stack = "".join(traceback.format_stack(frame))
+
+    def _report(self, event: BlockingEvent) -> None:
+        if self.on_blocking is not None:
+            try:
+                self.on_blocking(event)
+            except Exception as e:
+                logger.warning(f"Error in loop blocking callback: {e}")
+            return
+        stack = f", sampled stack:\n{event.stack}" if event.stack else ""
+        logger.warning(f"Event loop blocked for {event.duration_seconds:.3f} seconds{stack}")
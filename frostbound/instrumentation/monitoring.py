@@ -0,0 +1,301 @@
+"""Count and time calls of selected functions with ``sys.monitoring`` (PEP 669).
+
+:class:`CallMonitor` measures functions without wrapping them: it enables
+``PY_START`` and ``PY_RETURN`` events on the code objects of the chosen
+functions only, so every other function of the process runs at full speed,
+and the selected ones keep their identity, signature and call overhead.
+
+Call durations are buffered per thread, so recording never contends on a
+lock, and are recorded into a
+:class:`~frostbound.instrumentation.histogram.HistogramRegistry` under the
+same ``module.qualname`` names that :func:`~frostbound.instrumentation.timer.timed`
+uses, whenever a thread's buffer fills up, on :meth:`CallMonitor.flush` and
+when monitoring is disabled.
+
+Examples
+--------
+>>> import json
+>>> monitor = CallMonitor().add_module(json.decoder).add_function(json.loads)
+>>> monitor.enable()
+>>> json.loads('{"a": 1}')
+{'a': 1}
+>>> monitor.disable()
+>>> monitor.call_counts()["json.loads"]
+1
+>>> histogram_registry.snapshot()["json.loads"].count
+1
+"""
+
+from __future__ import annotations
+
+import inspect
+import sys
+import threading
+import time
+import types
+import weakref
+from collections.abc import Callable
+from typing import Any, Self
+
+from frostbound.instrumentation.histogram import HistogramRegistry, histogram_registry
+
+DEFAULT_BUFFER_SIZE = 1024
+
+_UNTIMED_FLAGS = (
+    inspect.CO_GENERATOR | inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+)
+
+
+class _ThreadBuffer:
+    """Calls recorded by one thread since its last flush."""
+
+    __slots__ = ("counts", "durations", "pending", "stack", "thread")
+
+    def __init__(self) -> None:
+        self.stack: list[tuple[types.CodeType, int]] = []
+        self.counts: dict[types.CodeType, int] = {}
+        self.durations: dict[types.CodeType, list[int]] = {}
+        self.pending: int = 0
+        self.thread = weakref.ref(threading.current_thread())
+
+    def is_alive(self) -> bool:
+        """Whether the thread owning the buffer can still record calls."""
+        thread = self.thread()
+        return thread is not None and thread.is_alive()
+
+
+class CallMonitor:
+    """Count calls and record call durations of selected functions.
+
+    Parameters
+    ----------
+    registry : HistogramRegistry | None, optional
+        Registry receiving the durations, in nanoseconds. Defaults to the
+        module-level ``histogram_registry``.
+    tool_id : int | None, optional
+        ``sys.monitoring`` tool id to claim. Defaults to
+        ``sys.monitoring.PROFILER_ID``.
+    buffer_size : int, optional
+        Durations a thread buffers before recording them. Defaults to 1024.
+
+    Notes
+    -----
+    Generator, coroutine and async generator functions are only counted: their
+    frames are suspended and resumed, so the time between start and return is
+    not the time spent running them. Exceptions propagating out of a function
+    end its measurement like a return does.
+
+    :meth:`flush` called from another thread than the recording ones swaps
+    their buffers without locking, so a call finishing at that exact moment
+    can be lost; :meth:`disable` always records everything.
+
+    The buffers of threads that have ended are recorded and dropped on the
+    next :meth:`flush` or when another thread makes its first call, so
+    monitoring across thread pools does not accumulate them.
+    """
+
+    def __init__(
+        self,
+        registry: HistogramRegistry | None = None,
+        tool_id: int | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        if not hasattr(sys, "monitoring"):
+            raise RuntimeError("CallMonitor requires sys.monitoring (Python 3.12 or newer)")
+        self.registry = registry or histogram_registry
+        self.tool_id: int = tool_id if tool_id is not None else sys.monitoring.PROFILER_ID
+        self.buffer_size = buffer_size
+        self._names: dict[types.CodeType, str] = {}
+        self._timed: set[types.CodeType] = set()
+        self._counts: dict[str, int] = {}
+        self._buffers: list[_ThreadBuffer] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether calls are currently being monitored."""
+        return self._enabled
+
+    def add_function(self, func: Callable[..., Any], name: str | None = None) -> Self:
+        """Monitor a function.
+
+        Parameters
+        ----------
+        func : Callable[..., Any]
+            Python function or method; decorated functions are unwrapped.
+        name : str | None, optional
+            Histogram name. Defaults to the function's ``module.qualname``.
+
+        Raises
+        ------
+        TypeError
+            If ``func`` has no Python code object, e.g. a builtin.
+        """
+        target = inspect.unwrap(getattr(func, "__func__", func))
+        code = getattr(target, "__code__", None)
+        if not isinstance(code, types.CodeType):
+            raise TypeError(f"Cannot monitor {func!r}: it has no Python code object")
+
+        self._names[code] = name or f"{target.__module__}.{target.__qualname__}"
+        if not code.co_flags & _UNTIMED_FLAGS:
+            self._timed.add(code)
+        if self._enabled:
+            sys.monitoring.set_local_events(self.tool_id, code, self._local_events(code))
+        return self
+
+    def add_module(self, module: types.ModuleType) -> Self:
+        """Monitor every function and method defined in ``module``."""
+        for value in vars(module).values():
+            if getattr(value, "__module__", None) != module.__name__:
+                continue
+            if inspect.isfunction(value):
+                self.add_function(value)
+            elif inspect.isclass(value):
+                for attribute in vars(value).values():
+                    if isinstance(attribute, (staticmethod, classmethod)):
+                        attribute = attribute.__func__
+                    elif isinstance(attribute, property):
+                        attribute = attribute.fget
+                    if inspect.isfunction(attribute):
+                        self.add_function(attribute)
+        return self
+
+    def enable(self) -> None:
+        """Start monitoring the added functions.
+
+        Raises
+        ------
+        ValueError
+            If the tool id is already used by another tool, e.g. a profiler.
+        """
+        if self._enabled:
+            return
+        monitoring = sys.monitoring
+        events = monitoring.events
+        monitoring.use_tool_id(self.tool_id, "frostbound")
+        monitoring.register_callback(self.tool_id, events.PY_START, self._on_start)
+        monitoring.register_callback(self.tool_id, events.PY_RETURN, self._on_return)
+        monitoring.register_callback(self.tool_id, events.PY_UNWIND, self._on_unwind)
+        # NOTE: PY_UNWIND cannot be enabled per code object; it only fires when an
+        # exception leaves a frame, so enabling it globally is cheap.
+        monitoring.set_events(self.tool_id, events.PY_UNWIND)
+        for code in self._names:
+            monitoring.set_local_events(self.tool_id, code, self._local_events(code))
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Stop monitoring and record all buffered calls."""
+        if not self._enabled:
+            return
+        monitoring = sys.monitoring
+        for code in self._names:
+            monitoring.set_local_events(self.tool_id, code, 0)
+        monitoring.set_events(self.tool_id, 0)
+        for event in (monitoring.events.PY_START, monitoring.events.PY_RETURN, monitoring.events.PY_UNWIND):
+            monitoring.register_callback(self.tool_id, event, None)
+        monitoring.free_tool_id(self.tool_id)
+        self._enabled = False
+        self.flush()
+
+    def __enter__(self) -> Self:
+        self.enable()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.disable()
+
+    def flush(self) -> None:
+        """Record the buffered calls of every thread."""
+        with self._lock:
+            buffers = list(self._buffers)
+        # NOTE: Checked before flushing, so the buffers of ended threads are
+        # complete once flushed and can be dropped.
+        ended = [buffer for buffer in buffers if not buffer.is_alive()]
+        for buffer in buffers:
+            self._flush_buffer(buffer)
+        if ended:
+            with self._lock:
+                self._buffers = [buffer for buffer in self._buffers if buffer not in ended]
+
+    def call_counts(self) -> dict[str, int]:
+        """Return the number of calls per function recorded so far.
+
+        Calls still sitting in thread buffers are only included after a flush.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def _local_events(self, code: types.CodeType) -> int:
+        events = sys.monitoring.events
+        return events.PY_START | events.PY_RETURN if code in self._timed else events.PY_START
+
+    def _buffer(self) -> _ThreadBuffer:
+        """Create the calling thread's buffer, recording and dropping those of ended threads."""
+        buffer = self._local.buffer = _ThreadBuffer()
+        with self._lock:
+            ended = [other for other in self._buffers if not other.is_alive()]
+            if ended:
+                self._buffers = [other for other in self._buffers if other not in ended]
+            self._buffers.append(buffer)
+        for other in ended:
+            self._flush_buffer(other)
+        return buffer
+
+    def _on_start(self, code: types.CodeType, _offset: int) -> None:
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._buffer()
+        if code in self._timed:
+            buffer.stack.append((code, time.perf_counter_ns()))
+        else:
+            # NOTE: Timed calls are counted from their durations when flushed.
+            counts = buffer.counts
+            counts[code] = counts.get(code, 0) + 1
+
+    def _on_return(self, code: types.CodeType, _offset: int, _retval: object) -> None:
+        self._end(code)
+
+    def _on_unwind(self, code: types.CodeType, _offset: int, _exception: BaseException) -> None:
+        if code in self._timed:
+            self._end(code)
+
+    def _end(self, code: types.CodeType) -> None:
+        end = time.perf_counter_ns()
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._buffer()
+        stack = buffer.stack
+        if not stack or stack[-1][0] is not code:
+            # NOTE: The call started before monitoring was enabled.
+            return
+        _, start = stack.pop()
+        durations = buffer.durations.get(code)
+        if durations is None:
+            durations = buffer.durations[code] = []
+        durations.append(end - start)
+        buffer.pending += 1
+        if buffer.pending >= self.buffer_size:
+            self._flush_buffer(buffer)
+
+    def _flush_buffer(self, buffer: _ThreadBuffer) -> None:
+        counts, buffer.counts = buffer.counts, {}
+        durations, buffer.durations = buffer.durations, {}
+        buffer.pending = 0
+
+        for code, values in durations.items():
+            self.registry.histogram(self._names[code]).record_many(values)
+            counts[code] = counts.get(code, 0) + len(values)
+        if counts:
+            with self._lock:
+                for code, count in counts.items():
+                    name = self._names[code]
+                    self._counts[name] = self._counts.get(name, 0) + count
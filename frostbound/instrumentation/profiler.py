@@ -0,0 +1,275 @@
+"""Opt-in statistical profiling of slow timer blocks.
+
+A :class:`SamplingProfiler` passed to :class:`~frostbound.instrumentation.timer.Timer`
+watches every measured block, but only starts sampling stacks once the block
+has been running for longer than ``threshold_seconds``. Blocks that finish
+faster cost one dictionary insert and removal, so the profiler can stay
+enabled in production and still explain the slow outliers.
+
+Two sampling methods are available:
+
+- ``"thread"`` (default): a shared background thread wakes up at the
+  earliest deadline, then reads ``sys._current_frames()`` every
+  ``interval_seconds`` while any block is over its threshold. Works for blocks
+  on any thread and can sample every thread of the process. A CPU-bound
+  block holding the GIL delays each sample by up to
+  ``sys.getswitchinterval()``, so the effective rate can be lower.
+- ``"signal"``: ``signal.setitimer(ITIMER_REAL)`` delivers ``SIGALRM`` to the
+  main thread, whose handler records the interrupted frame. Has no helper
+  thread, but only works for blocks on the main thread, takes over
+  ``SIGALRM`` while sampling, and falls back to ``"thread"`` elsewhere.
+
+Samples are aggregated into collapsed stacks, ready for ``flamegraph.pl`` or
+speedscope, and attached to the timer as :attr:`Timer.profile`.
+
+Examples
+--------
+>>> profiler = SamplingProfiler(threshold_seconds=0.5)
+>>> with Timer(name="train_step", profiler=profiler) as t:
+...     step()
+>>> if t.profile is not None:
+...     print(t.profile.collapsed_stacks())
+"""
+
+from __future__ import annotations
+
+import logging
+import signal
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Literal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+DEFAULT_MAX_DEPTH = 128
+_IDLE_WAIT_SECONDS = 1.0
+
+
+@dataclass
+class ProfileResult:
+    """Aggregated stack samples of one profiled block.
+
+    Attributes
+    ----------
+    name : str
+        Name of the profiled block.
+    samples : int
+        Number of sampling ticks taken while the block ran.
+    interval_seconds : float
+        Time between two samples.
+    stacks : Counter[str]
+        Number of samples per collapsed stack (``root;...;leaf``). When all
+        threads are sampled, each stack starts with ``thread:<name>``.
+    """
+
+    name: str
+    samples: int = 0
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    def collapsed_stacks(self) -> str:
+        """Return the stacks in collapsed-stack format, most frequent first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def write_collapsed_stacks(self, path: Path | str) -> None:
+        """Write :meth:`collapsed_stacks` to a file."""
+        Path(path).write_text(self.collapsed_stacks() + "\n", encoding="utf-8")
+
+
+@dataclass(slots=True, eq=False)
+class ProfileSession:
+    """A block being watched by a :class:`SamplingProfiler`.
+
+    The result is only created once the first sample is taken.
+    """
+
+    name: str
+    thread_id: int
+    deadline: float
+    uses_signal: bool = False
+    result: ProfileResult | None = None
+
+    def sampled(self, interval_seconds: float) -> ProfileResult:
+        """Return the result, creating it on the first sample, and count one sample."""
+        result = self.result
+        if result is None:
+            result = self.result = ProfileResult(name=self.name, interval_seconds=interval_seconds)
+        result.samples += 1
+        return result
+
+
+class SamplingProfiler:
+    """Sample the stacks of timer blocks that exceed a latency threshold.
+
+    Parameters
+    ----------
+    interval_seconds : float, optional
+        Time between two samples. Defaults to 0.005.
+    threshold_seconds : float, optional
+        Only sample a block once it has run for this long; 0 samples every
+        block. Defaults to 0.0.
+    method : {"thread", "signal"}, optional
+        Sampling mechanism, see the module documentation. Defaults to "thread".
+    all_threads : bool, optional
+        Sample every thread of the process instead of only the thread running
+        the block ("thread" method only). Defaults to False.
+    max_depth : int, optional
+        Innermost frames kept per stack. Defaults to 128.
+    on_profile : Callable[[ProfileResult], None] | None, optional
+        Called with every non-empty result when its block ends.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        threshold_seconds: float = 0.0,
+        method: Literal["thread", "signal"] = "thread",
+        all_threads: bool = False,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        on_profile: Callable[[ProfileResult], None] | None = None,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.threshold_seconds = threshold_seconds
+        self.method = method
+        self.all_threads = all_threads
+        self.max_depth = max_depth
+        self.on_profile = on_profile
+        self._sessions: dict[int, ProfileSession] = {}
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._sampler: threading.Thread | None = None
+        self._wake_at: float = 0.0
+        self._signal_session: ProfileSession | None = None
+        self._previous_handler: signal._HANDLER = None
+
+    def begin(self, name: str) -> ProfileSession:
+        """Start watching a block running on the calling thread.
+
+        Parameters
+        ----------
+        name : str
+            Name of the block, copied into the result.
+
+        Returns
+        -------
+        ProfileSession
+            Handle to pass to :meth:`end`.
+        """
+        session = ProfileSession(
+            name=name,
+            thread_id=threading.get_ident(),
+            deadline=time.monotonic() + self.threshold_seconds,
+        )
+        if (
+            self.method == "signal"
+            and self._signal_session is None
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self._begin_signal(session)
+            return session
+
+        with self._lock:
+            self._sessions[id(session)] = session
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+                self._sampler.start()
+            # NOTE: Only wake the sampler when this block is due before the time
+            # it already sleeps until; most blocks then never cause a wakeup.
+            if session.deadline < self._wake_at:
+                self._condition.notify()
+        return session
+
+    def end(self, session: ProfileSession) -> ProfileResult | None:
+        """Stop watching a block.
+
+        Returns
+        -------
+        ProfileResult | None
+            The samples, or None if the block ended before its threshold.
+        """
+        if session.uses_signal:
+            self._end_signal()
+        else:
+            with self._lock:
+                self._sessions.pop(id(session), None)
+
+        result = session.result
+        if result is None:
+            return None
+        if self.on_profile is not None:
+            try:
+                self.on_profile(result)
+            except Exception as e:
+                logger.warning(f"Error in profile callback: {e}")
+        return result
+
+    def _collapse(self, frame: types.FrameType | None) -> str:
+        names: list[str] = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}")
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                due = [session for session in self._sessions.values() if session.deadline <= now]
+                if not due:
+                    # NOTE: Nothing to sample: sleep until the earliest deadline. While
+                    # idle, still wake up once per threshold, so that blocks beginning
+                    # meanwhile do not need to notify the sampler.
+                    deadlines = [session.deadline for session in self._sessions.values()]
+                    self._wake_at = min(deadlines, default=now + max(self.threshold_seconds, _IDLE_WAIT_SECONDS))
+                    self._condition.wait(self._wake_at - now)
+                    continue
+
+                self._wake_at = now
+
+                # NOTE: Sample while holding the lock so that a result is never
+                # updated after end() has returned it.
+                self._sample(due, own_id)
+            time.sleep(self.interval_seconds)
+
+    def _sample(self, sessions: list[ProfileSession], own_id: int) -> None:
+        frames = sys._current_frames()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()} if self.all_threads else {}
+        for session in sessions:
+            result = session.sampled(self.interval_seconds)
+            if self.all_threads:
+                for thread_id, thread_frame in frames.items():
+                    if thread_id != own_id:
+                        thread_name = thread_names.get(thread_id, str(thread_id))
+                        result.stacks[f"thread:{thread_name};{self._collapse(thread_frame)}"] += 1
+            else:
+                frame = frames.get(session.thread_id)
+                if frame is not None:
+                    result.stacks[self._collapse(frame)] += 1
+
+    def _begin_signal(self, session: ProfileSession) -> None:
+        session.uses_signal = True
+        self._signal_session = session
+
+        def handle(_signum: int, frame: types.FrameType | None) -> None:
+            result = session.sampled(self.interval_seconds)
+            result.stacks[self._collapse(frame)] += 1
+
+        self._previous_handler = signal.signal(signal.SIGALRM, handle)
+        # NOTE: setitimer's initial delay implements the threshold, so nothing
+        # runs at all for blocks that end before it.
+        signal.setitimer(signal.ITIMER_REAL, max(self.threshold_seconds, 1e-6), self.interval_seconds)
+
+    def _end_signal(self) -> None:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous_handler)
+        self._previous_handler = None
+        self._signal_session = None
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+import random
+
+
+class Sampler:
+    """Choose which calls of a hot function get measured.
+
+    A sampler keeps a countdown of calls until the next measurement. Unsampled
+    calls only decrement the countdown; when it reaches zero the call is
+    measured and its value should be recorded with a weight equal to the number
+    of calls it stands for, so that histogram counts and sums extrapolate to the
+    full call volume.
+
+    Two modes are supported:
+
+    - every Nth call (``every=N``), deterministic;
+    - probabilistic (``probability=p``), where the gap to the next sample is
+      drawn from a geometric distribution. This is statistically equivalent to
+      flipping a coin on every call but only draws a random number once per
+      sample instead of once per call.
+
+    The rate can be changed at any time with :meth:`configure`, e.g. to measure
+    every call during an incident. The countdown is not locked: under heavy
+    thread contention a decrement may occasionally be lost, which only shifts
+    when the next sample is taken.
+
+    Parameters
+    ----------
+    every : int, optional
+        Measure one call out of ``every``. Defaults to 1 (every call).
+    probability : float | None, optional
+        Measure each call with this probability instead. Takes precedence over
+        ``every`` when given.
+    seed : int | None, optional
+        Seed for the probabilistic mode.
+
+    Examples
+    --------
+    >>> sampler = Sampler(every=100)
+    >>> weights = [sampler.tick() for _ in range(300)]
+    >>> sum(1 for weight in weights if weight), sum(weights)
+    (3, 300)
+    """
+
+    def __init__(self, every: int = 1, probability: float | None = None, seed: int | None = None) -> None:
+        self._random = random.Random(seed)
+        self.every: int = 1
+        self.probability: float | None = None
+        self.interval: int = 1
+        self.countdown: int = 1
+        self.configure(every=every, probability=probability)
+
+    def configure(self, every: int | None = None, probability: float | None = None) -> None:
+        """Change the sampling rate, taking effect from the next call.
+
+        Parameters
+        ----------
+        every : int | None, optional
+            Switch to measuring one call out of ``every``.
+        probability : float | None, optional
+            Switch to probabilistic sampling with this probability.
+
+        Raises
+        ------
+        ValueError
+            If ``every`` is smaller than 1 or ``probability`` is not in (0, 1].
+        """
+        if probability is not None:
+            if not 0.0 < probability <= 1.0:
+                raise ValueError(f"Sampling probability must be in (0, 1], got {probability}")
+            self.probability = probability
+        elif every is not None:
+            if every < 1:
+                raise ValueError(f"Sampling interval must be at least 1, got {every}")
+            self.every = every
+            self.probability = None
+
+        self.interval = self._next_interval()
+        self.countdown = self.interval
+
+    @property
+    def rate(self) -> float:
+        """Expected fraction of calls that are measured."""
+        return self.probability if self.probability is not None else 1.0 / self.every
+
+    def tick(self) -> int:
+        """Account for one call.
+
+        Returns
+        -------
+        int
+            0 if the call should not be measured, otherwise the number of calls
+            the measurement stands for.
+        """
+        self.countdown -= 1
+        if self.countdown > 0:
+            return 0
+        return self.fire()
+
+    def fire(self) -> int:
+        """Start the next sampling interval after the countdown reached zero.
+
+        Timing wrappers inline the countdown decrement of :meth:`tick` and only
+        call this method on sampled calls.
+
+        Returns
+        -------
+        int
+            The number of calls the current measurement stands for.
+        """
+        weight = self.interval
+        self.interval = self._next_interval()
+        self.countdown = self.interval
+        return weight
+
+    def _next_interval(self) -> int:
+        probability = self.probability
+        if probability is None:
+            return self.every
+        if probability >= 1.0:
+            return 1
+        # NOTE: Inverse-CDF draw of a geometric distribution on {1, 2, ...}.
+        return int(math.log(1.0 - self._random.random()) / math.log(1.0 - probability)) + 1
@@ -0,0 +1,580 @@
+"""Histograms and counters aggregated across processes through a shared file.
+
+Timers, retries and circuit breakers record into process-local memory, so a
+deployment with many workers (gunicorn, ``multiprocessing`` pools, ...) only
+ever sees per-process percentiles. :class:`SharedHistogramRegistry` is a
+drop-in :class:`~frostbound.instrumentation.histogram.HistogramRegistry` whose
+histograms live in a memory-mapped file instead: every process owns one
+*slot* of the file and writes its bucket counts and counters there, and any
+process can merge all the slots into host-level histograms with
+:meth:`SharedHistogramRegistry.collect`.
+
+Recording is a handful of integer updates in the process's own slot: there is
+no IPC, no file lock and no cross-process synchronization on the hot path. A
+slot is claimed under ``flock`` the first time a process records, which also
+happens again in children after a ``fork``. Each metric is guarded by a
+sequence counter (a seqlock): writers make it odd while updating, and the
+collector retries a read until it sees the same even value before and after
+copying, so it never blocks writers and never reads a half-written metric.
+
+Layout of the file, in native 64-bit integers::
+
+    header  magic, version, slots, max_metrics, buckets, sub_bucket_bits
+    slot    pid, claimed_at_ns, metrics, then ``max_metrics`` of:
+    metric  seq, kind, count, sum, min, max, name (64 bytes), buckets
+
+The file is created sparse, so only the pages of metrics that are actually
+recorded take memory. Put it on a ``tmpfs`` such as ``/dev/shm`` to keep it
+off the disk entirely.
+
+Examples
+--------
+>>> registry = SharedHistogramRegistry("/dev/shm/myapp.metrics")
+>>> @timed(name="handler", registry=registry)
+... def handler(request: Request) -> Response: ...
+>>> registry.counter("requests.rejected").add()
+>>> # In any process, e.g. the one serving /metrics:
+>>> registry.collect_snapshot()["handler"].p99
+"""
+
+from __future__ import annotations
+
+import fcntl
+import logging
+import mmap
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from frostbound.instrumentation.histogram import (
+    DEFAULT_SUB_BUCKET_BITS,
+    HistogramRegistry,
+    HistogramSnapshot,
+    LogHistogram,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOTS = 64
+DEFAULT_MAX_METRICS = 64
+DEFAULT_MAX_VALUE_BITS = 40
+"""Values up to 2 ** 40 (about 18 minutes in nanoseconds) get their own bucket."""
+
+NAME_BYTES = 64
+
+_MAGIC = int.from_bytes(b"FBMETRIC", "little", signed=True)
+_VERSION = 1
+_HEADER_WORDS = 8
+_SLOT_HEADER_WORDS = 8
+_PID, _CLAIMED_AT, _METRICS = 0, 1, 2
+_SEQ, _KIND, _COUNT, _SUM, _MIN, _MAX = 0, 1, 2, 3, 4, 5
+_NAME = 6
+_BUCKETS = _NAME + NAME_BYTES // 8
+_HISTOGRAM, _COUNTER = 1, 2
+_READ_RETRIES = 100
+
+_registries: weakref.WeakSet[SharedHistogramRegistry] = weakref.WeakSet()
+
+
+class _Region:
+    """A metric's words, in the shared file or in private memory as a fallback."""
+
+    __slots__ = ("base", "words")
+
+    def __init__(self, words: memoryview, base: int) -> None:
+        self.words = words
+        self.base = base
+
+    @classmethod
+    def private(cls, size: int) -> _Region:
+        return cls(memoryview(bytearray(size * 8)).cast("q"), 0)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_consistent(words: memoryview, base: int, size: int) -> list[int]:
+    """Copy ``size`` words at ``base``, retrying while a writer is updating them."""
+    values = words[base : base + size].tolist()
+    for _ in range(_READ_RETRIES):
+        sequence = words[base + _SEQ]
+        if sequence & 1:
+            time.sleep(0)
+            continue
+        values = words[base : base + size].tolist()
+        if values[_SEQ] == sequence and words[base + _SEQ] == sequence:
+            return values
+    # NOTE: A writer that died in the middle of an update leaves the sequence
+    # odd forever; its last values are still the best information available.
+    return values
+
+
+class SharedHistogram(LogHistogram):
+    """:class:`LogHistogram` stored in this process's slot of a shared file.
+
+    Created by :meth:`SharedHistogramRegistry.histogram`. Values above
+    ``2 ** max_value_bits`` are counted in the highest bucket; their exact
+    maximum is still kept.
+    """
+
+    def __init__(self, registry: SharedHistogramRegistry, name: str) -> None:
+        super().__init__(registry.sub_bucket_bits)
+        self.name = name
+        self._registry = registry
+        self._top = registry.buckets - 1
+        self._region: _Region | None = None
+        self._sequence = 0
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value, see :meth:`LogHistogram.record`."""
+        if value < 0:
+            value = 0
+        index = min(self.bucket_index(value), self._top)
+        region = self._region or self._attach()
+        words, base = region.words, region.base
+
+        # NOTE: This process is the only writer of its slot, so the statistics are
+        # kept in the inherited attributes as well and only ever stored, which
+        # saves reading the shared words back.
+        with self._lock:
+            sequence = self._sequence + 1
+            words[base] = sequence
+            words[base + _BUCKETS + index] += count
+            if self._count == 0 or value < self._min:
+                self._min = words[base + _MIN] = value
+            if value > self._max:
+                self._max = words[base + _MAX] = value
+            self._count = words[base + _COUNT] = self._count + count
+            self._sum = words[base + _SUM] = self._sum + value * count
+            self._sequence = words[base] = sequence + 1
+
+    def record_many(self, values: Iterable[int], count: int = 1) -> None:
+        """Record several values at once, see :meth:`LogHistogram.record_many`."""
+        clamped = [max(0, value) for value in values]
+        if not clamped:
+            return
+        top = self._top
+        indexes = [min(self.bucket_index(value), top) for value in clamped]
+        self._add(indexes, [count] * len(indexes), min(clamped), max(clamped), sum(clamped) * count)
+
+    def merge(self, other: LogHistogram) -> None:
+        """Add all values recorded in ``other`` to this process's histogram."""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different sub_bucket_bits")
+        local = other._load() if isinstance(other, SharedHistogram) else other
+        with local._lock:
+            other_counts = list(local._counts)
+            other_sum, other_min, other_max = local._sum, local._min, local._max
+
+        top = self._top
+        indexes = [min(index, top) for index, bucket_count in enumerate(other_counts) if bucket_count]
+        if indexes:
+            self._add(
+                indexes,
+                [bucket_count for bucket_count in other_counts if bucket_count],
+                other_min,
+                other_max,
+                other_sum,
+            )
+
+    def percentile(self, quantile: float) -> int:
+        """Estimate the value at ``quantile`` among this process's values."""
+        return self._load().percentile(quantile)
+
+    def snapshot(self, reset: bool = False) -> HistogramSnapshot:
+        """Summarize the values recorded by this process.
+
+        Resetting also removes them from what :meth:`SharedHistogramRegistry.collect`
+        reports.
+        """
+        with self._lock:
+            snapshot = self._load().snapshot()
+            if reset:
+                self._reset()
+        return snapshot
+
+    def _add(self, indexes: list[int], counts: list[int], smallest: int, largest: int, total: int) -> None:
+        region = self._region or self._attach()
+        words, base = region.words, region.base
+        buckets = base + _BUCKETS
+        with self._lock:
+            sequence = self._sequence + 1
+            words[base] = sequence
+            for index, bucket_count in zip(indexes, counts, strict=True):
+                words[buckets + index] += bucket_count
+            if self._count == 0 or smallest < self._min:
+                self._min = words[base + _MIN] = smallest
+            if largest > self._max:
+                self._max = words[base + _MAX] = largest
+            self._count = words[base + _COUNT] = self._count + sum(counts)
+            self._sum = words[base + _SUM] = self._sum + total
+            self._sequence = words[base] = sequence + 1
+
+    def _attach(self) -> _Region:
+        region = self._region = self._registry._allocate(self.name, _HISTOGRAM)
+        return region
+
+    def _detach(self) -> None:
+        """Forget the metric's words; the next value is recorded into new ones."""
+        self._region = None
+        self._sequence = self._count = self._sum = self._min = self._max = 0
+
+    def _load(self) -> LogHistogram:
+        region = self._region
+        if region is None:
+            return LogHistogram(self.sub_bucket_bits)
+        values = self._registry._read(region.words, region.base)
+        return LogHistogram.from_buckets(
+            values[_BUCKETS:], values[_SUM], values[_MIN], values[_MAX], sub_bucket_bits=self.sub_bucket_bits
+        )
+
+    def _reset(self) -> None:
+        # NOTE: Caller holds the lock.
+        region = self._region
+        if region is None:
+            return
+        words, base = region.words, region.base
+        words[base] = self._sequence + 1
+        for offset in (_COUNT, _SUM, _MIN, _MAX):
+            words[base + offset] = 0
+        buckets = base + _BUCKETS
+        words[buckets : buckets + self._top + 1] = memoryview(bytes((self._top + 1) * 8)).cast("q")
+        self._count = self._sum = self._min = self._max = 0
+        self._sequence = words[base] = self._sequence + 2
+
+
+class SharedCounter:
+    """Monotonic counter stored in this process's slot of a shared file.
+
+    Created by :meth:`SharedHistogramRegistry.counter`.
+    """
+
+    def __init__(self, registry: SharedHistogramRegistry, name: str) -> None:
+        self.name = name
+        self._registry = registry
+        self._region: _Region | None = None
+        self._lock = threading.Lock()
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        """Total added by this process."""
+        return self._value
+
+    def add(self, amount: int = 1) -> None:
+        """Add ``amount`` to the counter."""
+        region = self._region or self._attach()
+        with self._lock:
+            # NOTE: A single aligned store, so it needs no sequence counter.
+            self._value = region.words[region.base + _COUNT] = self._value + amount
+
+    def _attach(self) -> _Region:
+        region = self._region = self._registry._allocate(self.name, _COUNTER)
+        return region
+
+    def _detach(self) -> None:
+        self._region = None
+        self._value = 0
+
+
+class SharedHistogramRegistry(HistogramRegistry):
+    """:class:`HistogramRegistry` whose histograms are shared across processes.
+
+    Every process using the same ``path`` records into its own slot of the
+    file; :meth:`collect` merges all slots. The histograms it returns can be
+    passed anywhere a registry histogram is used, e.g.
+    :class:`~frostbound.instrumentation.timer.Timer` or
+    :func:`~frostbound.instrumentation.timer.timed`, and the inherited
+    :meth:`snapshot` keeps reporting this process's values only.
+
+    Parameters
+    ----------
+    path : Path | str
+        Shared file, created if missing. When it exists, its geometry wins
+        over the arguments below.
+    slots : int, optional
+        Maximum number of processes recording at once. Defaults to 64.
+    max_metrics : int, optional
+        Maximum number of histograms and counters per process. Defaults to 64.
+    sub_bucket_bits : int, optional
+        Precision of the histograms. Defaults to 7.
+    max_value_bits : int, optional
+        Values up to ``2 ** max_value_bits`` get their own bucket. Defaults to
+        40.
+
+    Notes
+    -----
+    Slots are owned by process id. A slot whose process has exited keeps its
+    values, so they still count in :meth:`collect`, until a new process needs
+    a slot and none is free. Liveness is checked with ``kill(pid, 0)``, so all
+    processes should share a PID namespace.
+
+    When no slot or no metric is left, or a name is longer than 64 bytes, the
+    metric falls back to private memory and a warning is logged: recording
+    keeps working, but that metric is missing from :meth:`collect`.
+
+    With the ``spawn`` and ``forkserver`` start methods, each child must
+    create its own registry; after a ``fork``, the child claims a new slot
+    the first time it records.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        slots: int = DEFAULT_SLOTS,
+        max_metrics: int = DEFAULT_MAX_METRICS,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+        max_value_bits: int = DEFAULT_MAX_VALUE_BITS,
+    ) -> None:
+        super().__init__(sub_bucket_bits)
+        self.path = Path(path)
+        buckets = LogHistogram(sub_bucket_bits).bucket_index(2**max_value_bits - 1) + 1
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._mmap = self._map(slots, max_metrics, buckets, sub_bucket_bits)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._words = memoryview(self._mmap).cast("q")
+        _, _, self.slots, self.max_metrics, self.buckets, self.sub_bucket_bits = self._words[:6].tolist()
+        self._metric_words = _BUCKETS + self.buckets
+        self._slot_words = _SLOT_HEADER_WORDS + self.max_metrics * self._metric_words
+        self._indexer = LogHistogram(self.sub_bucket_bits)
+        self._slot: int | None = None
+        self._closed = False
+        self._counters: dict[str, SharedCounter] = {}
+        self._warned = False
+        _registries.add(self)
+
+    def histogram(self, name: str) -> LogHistogram:
+        """Return the shared histogram called ``name``, creating it if needed."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = SharedHistogram(self, name)
+        return histogram
+
+    def counter(self, name: str) -> SharedCounter:
+        """Return the shared counter called ``name``, creating it if needed."""
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, SharedCounter(self, name))
+        return counter
+
+    def clear(self) -> None:
+        """Forget every histogram, counter and sampler of this process.
+
+        Their values stay in the file; histograms created afterwards with the
+        same names record into new metrics.
+        """
+        with self._lock:
+            self._counters.clear()
+        super().clear()
+
+    def collect(self) -> dict[str, LogHistogram]:
+        """Merge the histograms of every process.
+
+        Returns
+        -------
+        dict[str, LogHistogram]
+            Host-level histograms keyed by name.
+        """
+        merged: dict[str, tuple[list[int], list[int]]] = {}
+        for name, values in self._read_metrics(_HISTOGRAM):
+            count, total, minimum, maximum = values[_COUNT : _MAX + 1]
+            if not count:
+                continue
+            buckets = values[_BUCKETS:]
+            entry = merged.get(name)
+            if entry is None:
+                merged[name] = (buckets, [total, minimum, maximum])
+                continue
+            counts, stats = entry
+            if len(buckets) > len(counts):
+                counts.extend([0] * (len(buckets) - len(counts)))
+            for index, bucket_count in enumerate(buckets):
+                if bucket_count:
+                    counts[index] += bucket_count
+            stats[0] += total
+            stats[1] = min(stats[1], minimum)
+            stats[2] = max(stats[2], maximum)
+        return {
+            name: LogHistogram.from_buckets(counts, stats[0], stats[1], stats[2], self.sub_bucket_bits)
+            for name, (counts, stats) in sorted(merged.items())
+        }
+
+    def collect_snapshot(self) -> dict[str, HistogramSnapshot]:
+        """Snapshot the host-level histograms returned by :meth:`collect`."""
+        return {name: histogram.snapshot() for name, histogram in self.collect().items()}
+
+    def collect_counters(self) -> dict[str, int]:
+        """Sum the counters of every process."""
+        totals: dict[str, int] = {}
+        for name, values in self._read_metrics(_COUNTER):
+            totals[name] = totals.get(name, 0) + values[_COUNT]
+        return dict(sorted(totals.items()))
+
+    def close(self) -> None:
+        """Unmap the file. Values recorded by this process stay in it."""
+        _registries.discard(self)
+        with self._lock:
+            self._closed = True
+            metrics = self._metrics()
+        for metric in metrics:
+            with metric._lock:
+                metric._detach()
+        self._words.release()
+        self._mmap.close()
+        os.close(self._fd)
+
+    def _map(self, slots: int, max_metrics: int, buckets: int, sub_bucket_bits: int) -> mmap.mmap:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                slot_words = _SLOT_HEADER_WORDS + max_metrics * (_BUCKETS + buckets)
+                os.ftruncate(self._fd, (_HEADER_WORDS + slots * slot_words) * 8)
+                shared = mmap.mmap(self._fd, 0)
+                with memoryview(shared).cast("q") as words:
+                    words[1], words[2], words[3], words[4], words[5] = (
+                        _VERSION,
+                        slots,
+                        max_metrics,
+                        buckets,
+                        sub_bucket_bits,
+                    )
+                    # NOTE: The magic goes last, so a file left half-initialized
+                    # by a crash is rejected rather than misread.
+                    words[0] = _MAGIC
+                return shared
+
+            shared = mmap.mmap(self._fd, 0)
+            with memoryview(shared).cast("q") as words:
+                magic, version = words[0], words[1]
+            if magic != _MAGIC or version != _VERSION:
+                shared.close()
+                raise ValueError(f"{self.path} is not a shared metrics file (version {_VERSION})")
+            return shared
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _metrics(self) -> list[SharedHistogram | SharedCounter]:
+        metrics: list[SharedHistogram | SharedCounter] = [
+            histogram for histogram in self._histograms.values() if isinstance(histogram, SharedHistogram)
+        ]
+        metrics.extend(self._counters.values())
+        return metrics
+
+    def _slot_base(self, slot: int) -> int:
+        return _HEADER_WORDS + slot * self._slot_words
+
+    def _claim_slot(self) -> int:
+        """Claim a free slot, or the slot of an exited process, for this process."""
+        words = self._words
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            owners = [words[self._slot_base(slot) + _PID] for slot in range(self.slots)]
+            free = [slot for slot, pid in enumerate(owners) if pid == 0]
+            if not free:
+                free = [slot for slot, pid in enumerate(owners) if not _process_alive(pid)]
+            if not free:
+                return -1
+
+            slot = free[0]
+            base = self._slot_base(slot)
+            used = words[base + _METRICS]
+            words[base + _METRICS] = 0
+            if used:
+                # NOTE: Metrics past the used ones were never written, so only the
+                # used ones need zeroing; the rest of the file stays sparse.
+                start = (base + _SLOT_HEADER_WORDS) * 8
+                self._mmap[start : start + used * self._metric_words * 8] = bytes(used * self._metric_words * 8)
+            words[base + _CLAIMED_AT] = time.time_ns()
+            words[base + _PID] = os.getpid()
+            return slot
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _allocate(self, name: str, kind: int) -> _Region:
+        """Reserve the words of a new metric in this process's slot."""
+        encoded = name.encode()
+        with self._lock:
+            if self._closed:
+                return _Region.private(self._metric_words)
+            if self._slot is None:
+                self._slot = self._claim_slot()
+            slot_base = self._slot_base(self._slot)
+            used = self._words[slot_base + _METRICS] if self._slot >= 0 else 0
+
+            if self._slot < 0 or used >= self.max_metrics or len(encoded) > NAME_BYTES:
+                if not self._warned:
+                    self._warned = True
+                    reason = "no free slot" if self._slot < 0 else "too many metrics or name too long"
+                    logger.warning(f"Metric '{name}' is not shared through {self.path}: {reason}")
+                return _Region.private(self._metric_words)
+
+            base = slot_base + _SLOT_HEADER_WORDS + used * self._metric_words
+            start = (base + _NAME) * 8
+            self._mmap[start : start + NAME_BYTES] = encoded.ljust(NAME_BYTES, b"\0")
+            self._words[base + _KIND] = kind
+            # NOTE: Publishing the metric count last makes the metric visible to
+            # collectors only once its name and kind are written.
+            self._words[slot_base + _METRICS] = used + 1
+            return _Region(self._words, base)
+
+    def _read_metrics(self, kind: int) -> Iterator[tuple[str, list[int]]]:
+        """Yield the name and words of every metric of ``kind`` in every slot."""
+        words, shared = self._words, self._mmap
+        for slot in range(self.slots):
+            slot_base = self._slot_base(slot)
+            if not words[slot_base + _PID]:
+                continue
+            for metric in range(min(words[slot_base + _METRICS], self.max_metrics)):
+                base = slot_base + _SLOT_HEADER_WORDS + metric * self._metric_words
+                if words[base + _KIND] != kind:
+                    continue
+                start = (base + _NAME) * 8
+                name = shared[start : start + NAME_BYTES].rstrip(b"\0").decode(errors="replace")
+                yield name, self._read(words, base) if kind == _HISTOGRAM else _read_consistent(words, base, _BUCKETS)
+
+    def _read(self, words: memoryview, base: int) -> list[int]:
+        """Read a histogram metric, copying only the buckets that can be non-empty."""
+        largest = words[base + _MAX]
+        size = _BUCKETS + min(self._indexer.bucket_index(largest), self.buckets - 1) + 1
+        values = _read_consistent(words, base, size)
+        if values[_MAX] > largest:
+            # NOTE: A larger value was recorded meanwhile; its bucket may be past the copy.
+            values = _read_consistent(words, base, self._metric_words)
+        return values
+
+    def _after_fork(self) -> None:
+        """Make the child claim its own slot instead of writing into the parent's."""
+        # NOTE: flock locks belong to the open file description, which the child
+        # shares with its parent; reopening gives the child a lock of its own.
+        os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._lock = threading.Lock()
+        self._slot = None
+        for metric in self._metrics():
+            metric._lock = threading.Lock()
+            metric._detach()
+
+
+def _after_fork_in_child() -> None:
+    for registry in list(_registries):
+        registry._after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,247 @@
+"""Latency SLOs evaluated in-process over sliding windows.
+
+A :class:`SloTracker` checks latency objectives such as "p99 of ``handler``
+stays below 250 ms over the last 5 minutes" against the
+:class:`~frostbound.instrumentation.windows.WindowedHistogram` instances of
+a :class:`~frostbound.instrumentation.windows.WindowedHistogramRegistry`,
+and calls back when an objective starts or stops being breached. No
+external time-series database is involved.
+
+Each check reports the burn rate of the objective: the fraction of values
+above the threshold divided by the error budget ``1 - quantile``. A burn
+rate of 1 consumes the budget exactly over the window; alerting on short
+windows with a high ``max_burn_rate`` and long windows with a low one
+catches both sudden and slow regressions.
+
+Examples
+--------
+>>> registry = WindowedHistogramRegistry()
+>>> tracker = SloTracker(registry, on_breach=lambda status: page(status))
+>>> tracker.add(SloObjective("handler", threshold_ns=250_000_000, quantile=0.99))
+>>> tracker.add(SloObjective("handler", threshold_ns=250_000_000, window_seconds=60.0, max_burn_rate=14.4))
+>>> tracker.start(interval_seconds=10.0)
+>>> with Timer(name="handler", registry=registry):
+...     handle()
+>>> fetch = Retry(policy=RetryPolicy(after_hooks=[tracker.retry_hook("fetch")]))(fetch)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Literal
+
+from frostbound.instrumentation.windows import WindowedHistogramRegistry
+
+if TYPE_CHECKING:
+    from frostbound.resilience.retry import RetryState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SloObjective:
+    """A latency objective over a sliding window.
+
+    Attributes
+    ----------
+    name : str
+        Histogram receiving the latencies, in nanoseconds.
+    threshold_ns : int
+        Latency that ``quantile`` of the values must stay below.
+    quantile : float
+        Share of values that must be below the threshold. Defaults to 0.99.
+    window_seconds : float
+        Window the objective is evaluated over. Defaults to 300.0.
+    max_burn_rate : float
+        Burn rate above which the objective is breached. Defaults to 1.0,
+        i.e. the ``quantile`` percentile is above the threshold.
+    min_count : int
+        Values needed in the window before the objective can be breached.
+        Defaults to 1.
+    """
+
+    name: str
+    threshold_ns: int
+    quantile: float = 0.99
+    window_seconds: float = 300.0
+    max_burn_rate: float = 1.0
+    min_count: int = 1
+
+    @property
+    def error_budget(self) -> float:
+        """Share of values allowed above the threshold."""
+        return 1.0 - self.quantile
+
+
+@dataclass(frozen=True)
+class SloStatus:
+    """Result of checking one :class:`SloObjective`.
+
+    Attributes
+    ----------
+    objective : SloObjective
+        The objective checked.
+    count : int
+        Number of values in the window.
+    percentile : int
+        Value at the objective's quantile over the window (ns).
+    burn_rate : float
+        Fraction of values above the threshold divided by the error budget.
+    breached : bool
+        Whether the burn rate exceeds ``max_burn_rate``.
+    timestamp : float
+        Wall-clock time of the check.
+    """
+
+    objective: SloObjective
+    count: int
+    percentile: int
+    burn_rate: float
+    breached: bool
+    timestamp: float
+
+
+class _RetryLatencyHook:
+    """Retry after-hook recording the duration of every attempt, failed ones included."""
+
+    def __init__(self, registry: WindowedHistogramRegistry, name: str) -> None:
+        self.histogram = registry.histogram(name)
+
+    def __call__(
+        self,
+        state: RetryState[object, Exception],
+        outcome: Literal["success", "failure"],  # noqa: ARG002
+        result: object | None = None,  # noqa: ARG002
+        exception: Exception | None = None,  # noqa: ARG002
+    ) -> None:
+        # NOTE: Failed attempts count too: the slowest ones are often timeouts,
+        # and leaving them out would bias the burn rate low.
+        if state.statistics.execution_times:
+            self.histogram.record(int(state.statistics.execution_times[-1] * 1e9))
+
+
+class SloTracker:
+    """Check latency objectives and call back when their state changes.
+
+    Parameters
+    ----------
+    registry : WindowedHistogramRegistry | None, optional
+        Registry holding the latencies. Defaults to a new registry with 30
+        intervals of 10 seconds.
+    on_breach : Callable[[SloStatus], None] | None, optional
+        Called when an objective becomes breached.
+    on_recover : Callable[[SloStatus], None] | None, optional
+        Called when a breached objective is met again.
+    """
+
+    def __init__(
+        self,
+        registry: WindowedHistogramRegistry | None = None,
+        on_breach: Callable[[SloStatus], None] | None = None,
+        on_recover: Callable[[SloStatus], None] | None = None,
+    ) -> None:
+        self.registry = registry or WindowedHistogramRegistry()
+        self.on_breach = on_breach
+        self.on_recover = on_recover
+        self._objectives: list[SloObjective] = []
+        self._breached: set[SloObjective] = set()
+        self._lock = threading.Lock()
+        self._checker: threading.Thread | None = None
+        self._stop_checking = threading.Event()
+
+    @property
+    def objectives(self) -> list[SloObjective]:
+        """Objectives being tracked."""
+        with self._lock:
+            return list(self._objectives)
+
+    def add(self, objective: SloObjective) -> None:
+        """Track an objective."""
+        window = self.registry.interval_seconds * self.registry.intervals
+        if objective.window_seconds > window:
+            logger.warning(
+                f"SLO window of {objective.window_seconds}s for '{objective.name}' exceeds the "
+                f"{window}s kept by the registry; it is evaluated over {window}s"
+            )
+        with self._lock:
+            self._objectives.append(objective)
+
+    def check(self) -> list[SloStatus]:
+        """Evaluate every objective, calling back for those whose state changed.
+
+        Returns
+        -------
+        list[SloStatus]
+            The status of every objective, in the order they were added.
+        """
+        statuses = [self._evaluate(objective) for objective in self.objectives]
+        for status in statuses:
+            with self._lock:
+                was_breached = status.objective in self._breached
+                if status.breached:
+                    self._breached.add(status.objective)
+                else:
+                    self._breached.discard(status.objective)
+            if status.breached != was_breached:
+                self._notify(status)
+        return statuses
+
+    def retry_hook(self, name: str) -> _RetryLatencyHook:
+        """Return a ``RetryPolicy`` after-hook recording attempt latencies into ``name``."""
+        return _RetryLatencyHook(self.registry, name)
+
+    def start(self, interval_seconds: float = 10.0) -> None:
+        """Call :meth:`check` every ``interval_seconds`` from a background thread."""
+        self.stop()
+        self._stop_checking.clear()
+
+        def run() -> None:
+            while not self._stop_checking.wait(interval_seconds):
+                try:
+                    self.check()
+                except Exception as e:
+                    logger.warning(f"Error checking SLOs: {e}")
+
+        self._checker = threading.Thread(target=run, name="slo-tracker", daemon=True)
+        self._checker.start()
+
+    def stop(self) -> None:
+        """Stop periodic checks started with :meth:`start`."""
+        self._stop_checking.set()
+        if self._checker is not None:
+            self._checker.join()
+            self._checker = None
+
+    def _evaluate(self, objective: SloObjective) -> SloStatus:
+        histogram = self.registry.histogram(objective.name)
+        window = histogram.window(objective.window_seconds)
+        above = histogram.fraction_above(objective.threshold_ns, objective.window_seconds)
+        budget = objective.error_budget
+        burn_rate = above / budget if budget > 0 else (math.inf if above > 0 else 0.0)
+        return SloStatus(
+            objective=objective,
+            count=window.count,
+            percentile=window.percentile(objective.quantile),
+            burn_rate=burn_rate,
+            breached=window.count >= objective.min_count and burn_rate > objective.max_burn_rate,
+            timestamp=time.time(),
+        )
+
+    def _notify(self, status: SloStatus) -> None:
+        callback = self.on_breach if status.breached else self.on_recover
+        if status.breached:
+            logger.warning(
+                f"SLO breached: p{status.objective.quantile * 100:g} of '{status.objective.name}' is "
+                f"{status.percentile / 1e6:.2f}ms (threshold {status.objective.threshold_ns / 1e6:.2f}ms, "
+                f"burn rate {status.burn_rate:.1f})"
+            )
+        if callback is None:
+            return
+        try:
+            callback(status)
+        except Exception as e:
+            logger.warning(f"Error in SLO callback: {e}")
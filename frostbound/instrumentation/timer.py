@@ -3,8 +3,11 @@ from __future__ import annotations
 import functools
 import inspect
 import logging
+import math
+import time
 import timeit
 import types
+from collections.abc import AsyncIterator, Iterator, Sequence
 from typing import (
     Any,
     Callable,
@@ -17,8 +20,16 @@ from typing import (
     overload,
 )
 
+from frostbound.instrumentation.collectors import Collector, start_collectors, stop_collectors
+from frostbound.instrumentation.histogram import HistogramRegistry, histogram_registry
+from frostbound.instrumentation.profiler import ProfileResult, ProfileSession, SamplingProfiler
+from frostbound.instrumentation.sampling import Sampler
+from frostbound.instrumentation.streams import StreamHistograms, time_async_generator, time_generator
+from frostbound.instrumentation.tracing import Span, start_span
+
 P = ParamSpec("P")
 R = TypeVar("R", covariant=True)
+T = TypeVar("T")
 SyncFunc = TypeVar("SyncFunc", bound=Callable[..., Any])
 AsyncFunc = TypeVar("AsyncFunc", bound=Callable[..., Coroutine[Any, Any, Any]])
 
@@ -57,24 +68,115 @@ class Timer(Generic[R]):  # NOTE: Timer should be generic over R only
     ...     async with Timer(name="async_function") as t:
     ...         await asyncio.sleep(1)
     ...     print(f"Execution time: {t.execution_time:.4f} seconds")
+    >>>
+    >>> # Recording into a histogram registry instead of logging
+    >>> from frostbound.instrumentation.histogram import histogram_registry
+    >>> with Timer(name="load_batch", registry=histogram_registry):
+    ...     time.sleep(0.01)
+    >>> histogram_registry.snapshot()["load_batch"].count
+    1
+    >>>
+    >>> # Measuring only one call in 1000 of a hot function
+    >>> hot_timer = Timer(name="parse_row", registry=histogram_registry, sample_every=1000)
+    >>> parse_row = hot_timer(lambda row: row.split(","))
+    >>> histogram_registry.configure_sampling("parse_row", every=1)  # during an incident
+    >>>
+    >>> # Accounting for CPU time, page faults and memory of a coarse block
+    >>> from frostbound.instrumentation.collectors import default_collectors
+    >>> with Timer(name="epoch", collectors=default_collectors()) as t:
+    ...     train_one_epoch()
+    >>> t.metrics["cpu_thread_ns"]
+    >>>
+    >>> # Explaining slow blocks with stack samples
+    >>> from frostbound.instrumentation.profiler import SamplingProfiler
+    >>> with Timer(name="epoch", profiler=SamplingProfiler(threshold_seconds=30.0)) as t:
+    ...     train_one_epoch()
+    >>> if t.profile is not None:
+    ...     print(t.profile.collapsed_stacks())
     """
 
-    def __init__(self, name: str | None = None) -> None:
+    def __init__(
+        self,
+        name: str | None = None,
+        registry: HistogramRegistry | None = None,
+        sample_every: int | None = None,
+        sample_probability: float | None = None,
+        collectors: Sequence[Collector] | None = None,
+        profiler: SamplingProfiler | None = None,
+    ) -> None:
         """Initialize the timer.
 
         Parameters
         ----------
         name : str | None, optional
             A name for the timed block or function. Defaults to None.
+        registry : HistogramRegistry | None, optional
+            If given, each measurement is recorded in nanoseconds into the
+            histogram named after the timer instead of being logged.
+            Defaults to None.
+        sample_every : int | None, optional
+            Only measure one call (or block) out of ``sample_every``. Recorded
+            measurements are weighted so histogram counts extrapolate to all
+            calls. Defaults to None (measure everything).
+        sample_probability : float | None, optional
+            Measure each call with this probability instead. Defaults to None.
+        collectors : Sequence[Collector] | None, optional
+            Resource collectors (CPU time, page faults, memory, ...) run around
+            every measured block or call; see
+            :mod:`frostbound.instrumentation.collectors`. Their metrics are
+            stored in :attr:`metrics` and logged with the execution time, or
+            recorded into ``<name>.<metric>`` histograms when a registry is
+            given. Defaults to None.
+        profiler : SamplingProfiler | None, optional
+            Sample the stacks of measured blocks or calls that run longer than
+            the profiler's threshold. The collapsed stacks of the last such
+            block are stored in :attr:`profile`. Defaults to None.
+
+        Notes
+        -----
+        Unsampled calls only decrement a counter and report an execution time
+        of ``nan``. The sampler of a named timer is registered under its name in
+        ``registry``, or in the module-level ``histogram_registry`` without one,
+        so its rate can be changed at runtime through
+        :meth:`HistogramRegistry.configure_sampling`.
+
+        While a :class:`~frostbound.instrumentation.tracing.Tracer` is installed,
+        every measured block or call also opens a span, so nested timers form a
+        call tree.
         """
         self.start_time: float = 0
         self.end_time: float = 0
         self.execution_time: float = 0
+        self.registry = registry
+        self.collectors: Sequence[Collector] = collectors or ()
+        self.metrics: dict[str, int] = {}
+        self.profiler = profiler
+        self.profile: ProfileResult | None = None
+        self.sampler: Sampler | None = None
         # NOTE: The specific function being timed is stored when __call__ is used
         # or passed during initialization for context manager usage.
         self._timed_func_name: str | None = name
+        self._sample_every = sample_every
+        self._sample_probability = sample_probability
+        self._weight: int = 1
+        self._span: Span | None = None
+        self._collector_states: list[Any] = []
+        self._profile_session: ProfileSession | None = None
+        self._resolve_sampler()
 
     def __enter__(self) -> Self:
+        sampler = self.sampler
+        if sampler is not None:
+            sampler.countdown -= 1
+            if sampler.countdown > 0:
+                self._weight = 0
+                return self
+            self._weight = sampler.fire()
+        self._span = start_span(self._timed_func_name or "Code block")
+        if self.collectors:
+            self._collector_states = start_collectors(self.collectors)
+        if self.profiler is not None:
+            self._profile_session = self.profiler.begin(self._timed_func_name or "Code block")
         self.start_time = timeit.default_timer()
         return self
 
@@ -84,10 +186,24 @@ class Timer(Generic[R]):  # NOTE: Timer should be generic over R only
         exc_val: BaseException | None,
         exc_tb: types.TracebackType | None,
     ) -> None:
+        if not self._weight:
+            self.execution_time = math.nan
+            return
         self.end_time = timeit.default_timer()
         self.execution_time = self.end_time - self.start_time
+        if self._profile_session is not None and self.profiler is not None:
+            self._end_profile(self.profiler, self._profile_session)
+            self._profile_session = None
+        if self.collectors:
+            self.metrics = stop_collectors(self.collectors, self._collector_states)
+        if self._span is not None:
+            self._span.end()
+            self._span = None
         func_name = self._timed_func_name or "Code block"
-        logger.info(f"{func_name} took {self.execution_time:.4f} seconds to execute.")
+        if self.registry is not None:
+            self._record(func_name, self.execution_time, self._weight, self.metrics)
+            return
+        logger.info(f"{func_name} took {self.execution_time:.4f} seconds to execute.{_format_metrics(self.metrics)}")
 
     async def __aenter__(self) -> Self:
         return self.__enter__()
@@ -100,6 +216,13 @@ class Timer(Generic[R]):  # NOTE: Timer should be generic over R only
     ) -> None:
         self.__exit__(exc_type, exc_val, exc_tb)
 
+    # NOTE: Generator functions first: they return their stream, not a tuple.
+    @overload
+    def __call__(self, func: Callable[P, AsyncIterator[T]]) -> Callable[P, AsyncIterator[T]]: ...  # type: ignore[overload-overlap]
+
+    @overload
+    def __call__(self, func: Callable[P, Iterator[T]]) -> Callable[P, Iterator[T]]: ...  # type: ignore[overload-overlap]
+
     @overload
     def __call__(self, func: Callable[P, R]) -> Callable[P, tuple[R, float]]: ...
 
@@ -108,9 +231,7 @@ class Timer(Generic[R]):  # NOTE: Timer should be generic over R only
         self, func: Callable[P, Coroutine[Any, Any, R]]
     ) -> Callable[P, Coroutine[Any, Any, tuple[R, float]]]: ...
 
-    def __call__(
-        self, func: Callable[P, R] | Callable[P, Coroutine[Any, Any, R]]
-    ) -> Callable[P, tuple[R, float]] | Callable[P, Coroutine[Any, Any, tuple[R, float]]]:
+    def __call__(self, func: Callable[P, Any]) -> Callable[P, Any]:
         """Wrap a function to measure its execution time when the Timer *instance* is called.
 
         Parameters
@@ -123,56 +244,193 @@ class Timer(Generic[R]):  # NOTE: Timer should be generic over R only
         Callable: The wrapped function that returns the original result and execution time.
             For sync functions: tuple[R, float]
             For async functions: Coroutine[Any, Any, tuple[R, float]]
+            For generator and async generator functions: the stream itself, timed
+            item by item like with :func:`timed` and recorded into ``registry``,
+            or the module-level ``histogram_registry`` without one. Collectors
+            and the profiler are not run around streams.
         """
         if self._timed_func_name is None:
             self._timed_func_name = func.__name__
+            self._resolve_sampler()
+
+        if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            # NOTE: Calling a generator function only creates the generator, so
+            # timing the call would measure nothing; the stream is timed instead.
+            histograms = StreamHistograms.from_registry(self.registry or histogram_registry, self._timed_func_name)
+            return _streamed(func, histograms, self.sampler)
 
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[R, float]:
-            start_time = timeit.default_timer()
             sync_func = cast(Callable[P, R], func)
-            result = sync_func(*args, **kwargs)
-            end_time = timeit.default_timer()
+            weight = 1
+            sampler = self.sampler
+            if sampler is not None:
+                sampler.countdown -= 1
+                if sampler.countdown > 0:
+                    return sync_func(*args, **kwargs), math.nan
+                weight = sampler.fire()
+            span = start_span(self._timed_func_name or func.__name__)
+            collectors = self.collectors
+            states = start_collectors(collectors) if collectors else None
+            profiler = self.profiler
+            session = profiler.begin(self._timed_func_name or func.__name__) if profiler is not None else None
+            start_time = timeit.default_timer()
+            try:
+                result = sync_func(*args, **kwargs)
+            finally:
+                end_time = timeit.default_timer()
+                # NOTE: Collectors are stopped even if the call raises, so that
+                # process-wide ones such as tracemalloc are switched back off.
+                metrics = stop_collectors(collectors, states) if states is not None else None
+                if span is not None:
+                    span.end()
+                if session is not None and profiler is not None:
+                    self._end_profile(profiler, session)
             execution_time = end_time - start_time
-            logger.info(f"Function '{self._timed_func_name}' took {execution_time:.4f} seconds to execute.")
+            self._report(execution_time, weight, metrics)
             return result, execution_time
 
         @functools.wraps(func)
         async def awrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[R, float]:
-            start_time = timeit.default_timer()
             awaited_func = cast(Callable[P, Coroutine[Any, Any, R]], func)
-            result = await awaited_func(*args, **kwargs)
-            end_time = timeit.default_timer()
+            weight = 1
+            sampler = self.sampler
+            if sampler is not None:
+                sampler.countdown -= 1
+                if sampler.countdown > 0:
+                    return await awaited_func(*args, **kwargs), math.nan
+                weight = sampler.fire()
+            span = start_span(self._timed_func_name or func.__name__)
+            collectors = self.collectors
+            states = start_collectors(collectors) if collectors else None
+            profiler = self.profiler
+            session = profiler.begin(self._timed_func_name or func.__name__) if profiler is not None else None
+            start_time = timeit.default_timer()
+            try:
+                result = await awaited_func(*args, **kwargs)
+            finally:
+                end_time = timeit.default_timer()
+                # NOTE: Collectors are stopped even if the call raises, so that
+                # process-wide ones such as tracemalloc are switched back off.
+                metrics = stop_collectors(collectors, states) if states is not None else None
+                if span is not None:
+                    span.end()
+                if session is not None and profiler is not None:
+                    self._end_profile(profiler, session)
             execution_time = end_time - start_time
-            logger.info(f"Function '{self._timed_func_name}' took {execution_time:.4f} seconds to execute.")
+            self._report(execution_time, weight, metrics)
             return result, execution_time
 
         if is_coroutine_function(func):
-            return cast(Callable[P, Coroutine[Any, Any, tuple[R, float]]], awrapper)
-        return cast(Callable[P, tuple[R, float]], wrapper)
+            return awrapper
+        return wrapper
+
+    def _report(self, execution_time: float, weight: int = 1, metrics: dict[str, int] | None = None) -> None:
+        """Record a function measurement into the registry, or log it if there is none."""
+        if metrics is not None:
+            self.metrics = metrics
+        if self.registry is not None:
+            self._record(self._timed_func_name or "Code block", execution_time, weight, metrics)
+            return
+        logger.info(
+            f"Function '{self._timed_func_name}' took {execution_time:.4f} seconds to execute.{_format_metrics(metrics)}"
+        )
+
+    def _end_profile(self, profiler: SamplingProfiler, session: ProfileSession) -> None:
+        """Stop profiling a block, keeping the previous profile if this one was not sampled."""
+        profile = profiler.end(session)
+        if profile is not None:
+            self.profile = profile
+
+    def _record(self, name: str, execution_time: float, weight: int, metrics: dict[str, int] | None) -> None:
+        """Record the duration and each collector metric into the registry."""
+        assert self.registry is not None
+        self.registry.histogram(name).record(int(execution_time * 1e9), weight)
+        if metrics:
+            for metric, value in metrics.items():
+                self.registry.histogram(f"{name}.{metric}").record(value, weight)
+
+    def _resolve_sampler(self) -> None:
+        """Create the sampler, sharing the registry's one for this timer name if possible."""
+        if self._sample_every is None and self._sample_probability is None:
+            return
+        every = self._sample_every or 1
+        if self._timed_func_name is not None:
+            registry = self.registry or histogram_registry
+            self.sampler = registry.sampler(self._timed_func_name, every=every, probability=self._sample_probability)
+        else:
+            self.sampler = Sampler(every=every, probability=self._sample_probability)
+
+
+def _format_metrics(metrics: dict[str, int] | None) -> str:
+    """Format collector metrics as a suffix for timer log lines."""
+    if not metrics:
+        return ""
+    return " (" + ", ".join(f"{metric}={value}" for metric, value in metrics.items()) + ")"
+
+
+@overload
+def timer(  # type: ignore[overload-overlap]
+    func: Callable[P, AsyncIterator[T]],
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
+) -> Callable[P, AsyncIterator[T]]: ...
 
 
 @overload
-def timer(func: Callable[P, R]) -> Callable[P, tuple[R, float]]: ...
+def timer(  # type: ignore[overload-overlap]
+    func: Callable[P, Iterator[T]],
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
+) -> Callable[P, Iterator[T]]: ...
+
+
+@overload
+def timer(
+    func: Callable[P, R],
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
+) -> Callable[P, tuple[R, float]]: ...
 
 
 @overload
 def timer(
     func: Callable[P, Coroutine[Any, Any, R]],
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
 ) -> Callable[P, Coroutine[Any, Any, tuple[R, float]]]: ...
 
 
 @overload
-def timer() -> Callable[[Callable[P, R]], Callable[P, tuple[R, float]]]: ...
+def timer(
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
+) -> Callable[[Callable[P, R]], Callable[P, tuple[R, float]]]: ...
 
 
 def timer(
-    func: Callable[P, R] | Callable[P, Coroutine[Any, Any, R]] | None = None,
-) -> (
-    Callable[P, tuple[R, float]]
-    | Callable[P, Coroutine[Any, Any, tuple[R, float]]]
-    | Callable[[Callable[P, R]], Callable[P, tuple[R, float]]]
-):
+    func: Callable[P, Any] | None = None,
+    *,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+    collectors: Sequence[Collector] | None = None,
+) -> Callable[P, Any] | Callable[[Callable[P, R]], Callable[P, Any]]:
     """A decorator that times the execution of a function and returns a tuple
     of the original result and the elapsed time.
 
@@ -182,6 +440,14 @@ def timer(
     ----------
     func : Callable, optional
         The function to time.
+    registry : HistogramRegistry | None, optional
+        Record measurements into this registry instead of logging them.
+    sample_every : int | None, optional
+        Only measure one call out of ``sample_every``; see :class:`Timer`.
+    sample_probability : float | None, optional
+        Measure each call with this probability instead; see :class:`Timer`.
+    collectors : Sequence[Collector] | None, optional
+        Resource collectors run around each measured call; see :class:`Timer`.
 
     Returns
     -------
@@ -189,6 +455,9 @@ def timer(
         The wrapped function that includes timing functionality.
         For sync functions, returns tuple[R, float].
         For async functions, returns Coroutine[Any, Any, tuple[R, float]].
+        The elapsed time is ``nan`` for calls that were not sampled.
+        Generator and async generator functions return their stream, timed
+        item by item as described in :meth:`Timer.__call__`.
 
     Examples
     --------
@@ -200,17 +469,213 @@ def timer(
     >>> result, execution_time = my_function()
     >>> print(result)  # 42
     >>> print(f"{execution_time:.2f} seconds")  # ~1.00 seconds
+    >>>
+    >>> @timer(registry=histogram_registry, sample_probability=0.01)
+    ... def hot_function() -> int:
+    ...     return 42
     """
     # If no function is provided, return a partial function
     if func is None:
         # This handles @timer()
         # The lambda ensures we return a callable that has the right signature
         # but just forwards to timer with the given function
-        return lambda f: timer(f)
+        return lambda f: timer(
+            f,
+            registry=registry,
+            sample_every=sample_every,
+            sample_probability=sample_probability,
+            collectors=collectors,
+        )
+
+    timer_instance = Timer[Any](
+        name=func.__name__,
+        registry=registry,
+        sample_every=sample_every,
+        sample_probability=sample_probability,
+        collectors=collectors,
+    )
+
+    return timer_instance(func)
+
+
+@overload
+def timed(func: Callable[P, Coroutine[Any, Any, T]], /) -> Callable[P, Coroutine[Any, Any, T]]: ...
+
+
+@overload
+def timed(func: Callable[P, T], /) -> Callable[P, T]: ...
+
+
+@overload
+def timed(
+    *,
+    name: str | None = None,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
+
+
+def timed(
+    func: Callable[P, Any] | None = None,
+    /,
+    *,
+    name: str | None = None,
+    registry: HistogramRegistry | None = None,
+    sample_every: int | None = None,
+    sample_probability: float | None = None,
+) -> Callable[P, Any] | Callable[[Callable[P, T]], Callable[P, T]]:
+    """A transparent timing decorator that records into a histogram registry.
+
+    Unlike :func:`timer`, the wrapped function keeps its signature and returns
+    its original result, and nothing is logged per call: the duration is
+    recorded in nanoseconds into a :class:`~frostbound.instrumentation.histogram.LogHistogram`.
+    This makes it suitable for production hot paths.
+
+    Generator and async generator functions are timed item by item instead:
+    time to first item, per-item latency, consumer stall, item count and
+    throughput are recorded under ``<name>.*``; see
+    :mod:`frostbound.instrumentation.streams`. Sampling then selects whole streams.
+
+    Can be used as `@timed` or `@timed(name=..., registry=...)`.
+
+    Parameters
+    ----------
+    func : Callable, optional
+        The function to time.
+    name : str | None, optional
+        Histogram name. Defaults to the function's ``module.qualname``.
+    registry : HistogramRegistry | None, optional
+        Registry to record into. Defaults to the module-level ``histogram_registry``.
+    sample_every : int | None, optional
+        Only measure one call out of ``sample_every``. The sampler is registered
+        under the histogram name, so the rate can later be changed with
+        :meth:`HistogramRegistry.configure_sampling`. Defaults to None.
+    sample_probability : float | None, optional
+        Measure each call with this probability instead. Defaults to None.
 
-    timer_instance = Timer[R](name=func.__name__)
+    Returns
+    -------
+    Callable
+        The wrapped function, with the same signature and return value.
 
-    if is_coroutine_function(func):
-        return cast(Callable[P, Coroutine[Any, Any, tuple[R, float]]], timer_instance(func))
+    Examples
+    --------
+    >>> @timed
+    ... def handle(request: dict[str, str]) -> int:
+    ...     return 200
+    ...
+    >>> handle({})
+    200
+    >>> histogram_registry.snapshot()[f"{__name__}.handle"].count
+    1
+    """
+
+    def decorate(fn: Callable[P, Any]) -> Callable[P, Any]:
+        target_registry = registry or histogram_registry
+        histogram_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        record = target_registry.histogram(histogram_name).record
+        perf_counter_ns = time.perf_counter_ns
+
+        sampler: Sampler | None = None
+        if sample_every is not None or sample_probability is not None:
+            sampler = target_registry.sampler(histogram_name, every=sample_every or 1, probability=sample_probability)
+
+        if inspect.isgeneratorfunction(fn) or inspect.isasyncgenfunction(fn):
+            return _streamed(fn, StreamHistograms.from_registry(target_registry, histogram_name), sampler)
+
+        if sampler is not None:
+            return _sampled(fn, histogram_name, sampler, record)
+
+        if is_coroutine_function(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                span = start_span(histogram_name)
+                start = perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(perf_counter_ns() - start)
+                    if span is not None:
+                        span.end()
+
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            span = start_span(histogram_name)
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+                if span is not None:
+                    span.end()
+
+        return wrapper
 
-    return cast(Callable[P, tuple[R, float]], timer_instance(func))
+    if func is None:
+        return decorate
+    return decorate(func)
+
+
+def _streamed(fn: Callable[P, Any], histograms: StreamHistograms, sampler: Sampler | None) -> Callable[P, Any]:
+    """Wrap a generator function so the streams it returns are timed item by item."""
+    time_stream: Callable[[Any, StreamHistograms, int], Any] = (
+        time_async_generator if inspect.isasyncgenfunction(fn) else time_generator
+    )
+
+    @functools.wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+        stream = fn(*args, **kwargs)
+        weight = 1
+        if sampler is not None:
+            sampler.countdown -= 1
+            if sampler.countdown > 0:
+                return stream
+            weight = sampler.fire()
+        return time_stream(stream, histograms, weight)
+
+    return wrapper
+
+
+def _sampled(fn: Callable[P, Any], name: str, sampler: Sampler, record: Callable[[int, int], None]) -> Callable[P, Any]:
+    """Wrap ``fn`` so only calls chosen by ``sampler`` are timed and recorded."""
+    perf_counter_ns = time.perf_counter_ns
+
+    if is_coroutine_function(fn):
+
+        @functools.wraps(fn)
+        async def awrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            sampler.countdown -= 1
+            if sampler.countdown > 0:
+                return await fn(*args, **kwargs)
+            weight = sampler.fire()
+            span = start_span(name)
+            start = perf_counter_ns()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start, weight)
+                if span is not None:
+                    span.end()
+
+        return awrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+        sampler.countdown -= 1
+        if sampler.countdown > 0:
+            return fn(*args, **kwargs)
+        weight = sampler.fire()
+        span = start_span(name)
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(perf_counter_ns() - start, weight)
+            if span is not None:
+                span.end()
+
+    return wrapper
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import weakref
+from array import array
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from frostbound.instrumentation.tracing import Span, Tracer
+
+DEFAULT_CAPACITY = 1 << 16
+
+_BEGIN = ord("B")
+_END = ord("E")
+
+# NOTE: Tracks are numbered from one counter rather than by thread ident or task
+# id, both of which the interpreter reuses once a thread ends or a task is freed.
+# The numbers live in a thread-local and in the task's own context, so they go
+# away with their thread or task.
+_track_ids = itertools.count(1)
+_thread_tracks = threading.local()
+_task_track: ContextVar[tuple[weakref.ref[asyncio.Task[Any]], int] | None] = ContextVar(
+    "trace_task_track", default=None
+)
+
+
+class TraceRecorder(Tracer):
+    """Record timer spans as Chrome trace events for Perfetto or ``chrome://tracing``.
+
+    Once installed (see :meth:`Tracer.install`), every span opened by
+    :class:`~frostbound.instrumentation.timer.Timer`, :func:`~frostbound.instrumentation.timer.timer`
+    and :func:`~frostbound.instrumentation.timer.timed` emits a begin and an end
+    event carrying the ``perf_counter_ns`` timestamp, the thread id and, inside
+    asyncio, the task name. Spans are also aggregated into the call tree like
+    with a plain :class:`Tracer`.
+
+    Events are stored in preallocated parallel arrays used as a ring buffer:
+    recording an event is a handful of slot assignments with no per-event
+    container allocation, and once ``capacity`` events have been recorded the
+    oldest ones are overwritten. Slots are claimed through ``itertools.count``,
+    whose ``next()`` is atomic, so threads never write to the same slot, and
+    each slot stores its sequence number so stale slots are never exported.
+
+    Each asyncio task is shown as its own track, because concurrent tasks on
+    one thread interleave and would otherwise break begin/end nesting. Span
+    collector metrics (see :func:`~frostbound.instrumentation.tracing.add_span_collector`),
+    such as the GC pauses tagged by a running
+    :class:`~frostbound.instrumentation.gc_monitor.GCMonitor`, are exported as
+    arguments of the end event.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Maximum number of buffered events. Defaults to 65536.
+
+    Examples
+    --------
+    >>> recorder = TraceRecorder().install()
+    >>> with Timer(name="handle_request"):
+    ...     ...
+    >>> recorder.flush("trace.json")  # open in https://ui.perfetto.dev
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        super().__init__()
+        self.capacity = capacity
+        self._sequence = array("q", [-1]) * capacity
+        self._phases = bytearray(capacity)
+        self._timestamps = array("q", bytes(8 * capacity))
+        self._tracks = array("q", bytes(8 * capacity))
+        self._names: list[str | None] = [None] * capacity
+        self._tasks: list[str | None] = [None] * capacity
+        self._labels: list[str | None] = [None] * capacity
+        self._metrics: list[dict[str, int] | None] = [None] * capacity
+        self._counter = itertools.count()
+        # NOTE: Every sequence number below _flushed has been flushed, and so have
+        # those in _exported: events stored after one still being written.
+        self._flushed: int = 0
+        self._exported: set[int] = set()
+        self._export_lock = threading.Lock()
+
+    def start_span(self, name: str) -> Span:
+        span = super().start_span(name)
+        self._record(_BEGIN, name, span.start_ns)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        super().end_span(span)
+        self._record(_END, span.name, span.end_ns, span.metrics)
+
+    def record_begin(self, name: str, timestamp_ns: int) -> None:
+        """Record a begin event that is not tied to a span."""
+        self._record(_BEGIN, name, timestamp_ns)
+
+    def record_end(self, name: str, timestamp_ns: int) -> None:
+        """Record an end event that is not tied to a span."""
+        self._record(_END, name, timestamp_ns)
+
+    def _record(self, phase: int, name: str, timestamp_ns: int, metrics: dict[str, int] | None = None) -> None:
+        sequence = next(self._counter)
+        slot = sequence % self.capacity
+
+        task_name: str | None = None
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            # NOTE: Give each task its own track.
+            task_name = label = task.get_name()
+            task_track = _task_track.get()
+            if task_track is None or task_track[0]() is not task:
+                task_track = (weakref.ref(task), next(_track_ids))
+                _task_track.set(task_track)
+            track = task_track[1]
+        else:
+            thread_track: tuple[int, str] | None = getattr(_thread_tracks, "track", None)
+            if thread_track is None:
+                thread_track = _thread_tracks.track = (next(_track_ids), threading.current_thread().name)
+            track, label = thread_track
+
+        self._phases[slot] = phase
+        self._timestamps[slot] = timestamp_ns
+        self._tracks[slot] = track
+        self._names[slot] = name
+        self._tasks[slot] = task_name
+        self._labels[slot] = label
+        self._metrics[slot] = metrics
+        self._sequence[slot] = sequence
+
+    def events(self) -> list[dict[str, Any]]:
+        """Return buffered events in Chrome trace-event format, oldest first.
+
+        End events whose begin event was overwritten by the ring buffer are
+        dropped so that every track stays properly nested.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Duration events plus ``thread_name`` metadata for every track.
+        """
+        with self._export_lock:
+            return self._events()[0]
+
+    def _events(self) -> tuple[list[dict[str, Any]], int, set[int]]:
+        """Return the events not flushed yet, and the flush state to keep once they are.
+
+        The slots are scanned instead of reading the counter: a sequence number is
+        claimed before its slot is written, so events still being written are
+        skipped, and the mark stops at the first of them so that the next flush
+        picks it up.
+        """
+        # NOTE: Every sequence number below the highest one stored has been claimed.
+        total = max(self._sequence) + 1
+        first = max(self._flushed, total - self.capacity)
+        mark = total
+        exported: set[int] = set()
+
+        pid = os.getpid()
+        track_ids: dict[int, int] = {}
+        track_names: dict[int, str] = {}
+        depths: dict[int, int] = {}
+        events: list[dict[str, Any]] = []
+
+        for index in range(first, total):
+            slot = index % self.capacity
+            sequence = self._sequence[slot]
+            if sequence != index:
+                if sequence < index:
+                    mark = min(mark, index)
+                continue
+            if index in self._exported:
+                continue
+            if mark < total:
+                exported.add(index)
+            name = self._names[slot]
+            if name is None:
+                continue
+
+            tid = track_ids.setdefault(self._tracks[slot], len(track_ids) + 1)
+            task_name = self._tasks[slot]
+            if tid not in track_names:
+                label = self._labels[slot]
+                track_names[tid] = f"task {label}" if task_name is not None else str(label)
+
+            phase = self._phases[slot]
+            if phase == _END:
+                if depths.get(tid, 0) == 0:
+                    continue
+                depths[tid] -= 1
+            else:
+                depths[tid] = depths.get(tid, 0) + 1
+
+            event: dict[str, Any] = {
+                "name": name,
+                "ph": chr(phase),
+                "ts": self._timestamps[slot] / 1_000,
+                "pid": pid,
+                "tid": tid,
+            }
+            metrics = self._metrics[slot]
+            if metrics:
+                event["args"] = dict(metrics)
+            if task_name is not None:
+                event.setdefault("args", {})["task"] = task_name
+            events.append(event)
+
+        metadata: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track_name}}
+            for tid, track_name in track_names.items()
+        ]
+        exported = {index for index in exported | self._exported if index >= mark}
+        return metadata + events, mark, exported
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the buffered events as a Chrome trace-event JSON object."""
+        return {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+
+    def write(self, path: Path | str) -> None:
+        """Write the buffered events to ``path`` as Chrome trace-event JSON."""
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+    def flush(self, path: Path | str) -> None:
+        """Write the buffered events to ``path`` and drop them from the buffer."""
+        # NOTE: Events recorded while exporting are kept for the next flush.
+        with self._export_lock:
+            events, self._flushed, self._exported = self._events()
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(trace, file)
+
+    def clear(self) -> None:
+        """Drop all buffered events."""
+        with self._export_lock:
+            self._flushed = max(self._sequence) + 1
+            self._exported = set()
@@ -0,0 +1,357 @@
+"""Nested span tracing with call-tree aggregation.
+
+Spans are tracked in a :class:`contextvars.ContextVar`, so nesting follows the
+logical flow of execution rather than the call stack of one thread:
+
+- nested ``with Timer(...)`` blocks become parent and child spans;
+- asyncio tasks inherit the span that was current when they were created;
+- threads start with an empty context, unless the callable is wrapped with
+  :func:`propagate_context` (e.g. before handing it to an executor).
+
+Finished spans are aggregated by their path from the root into a call tree
+with call counts, inclusive time and exclusive time (inclusive minus the time
+spent in child spans). Collectors registered with :func:`add_span_collector`
+run around every span, and their metrics are summed per node as well. The
+tree can be exported in the collapsed-stack format understood by
+``flamegraph.pl``, speedscope and similar tools.
+
+Examples
+--------
+>>> tracer = Tracer().install()
+>>> with Timer(name="request"):
+...     with Timer(name="parse"):
+...         ...
+...     with Timer(name="query"):
+...         ...
+>>> print(tracer.collapsed_stacks())
+request 12
+request;parse 85
+request;query 1043
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+import types
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ParamSpec, Self, TypeVar
+
+from frostbound.instrumentation.collectors import Collector, start_collectors, stop_collectors
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("frostbound_current_span", default=None)
+_active_tracer: Tracer | None = None
+_span_collectors: tuple[Collector, ...] = ()
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    """A single timed region in a trace.
+
+    Attributes
+    ----------
+    name : str
+        Name of the region, usually the timer or function name.
+    path : tuple[str, ...]
+        Names of all enclosing spans, from the root to this span.
+    parent : Span | None
+        Enclosing span, or None for a root span.
+    start_ns : int
+        ``time.perf_counter_ns()`` when the span started.
+    end_ns : int
+        ``time.perf_counter_ns()`` when the span ended, 0 while running.
+    child_ns : int
+        Total inclusive time of child spans that have ended.
+    tracer : Tracer
+        Tracer the span reports to when it ends.
+    metrics : dict[str, int] | None
+        Metrics of the span collectors (see :func:`add_span_collector`) once the
+        span has ended, or None if none were registered when it started.
+    """
+
+    name: str
+    path: tuple[str, ...]
+    parent: Span | None
+    start_ns: int
+    tracer: Tracer = field(repr=False)
+    end_ns: int = 0
+    child_ns: int = 0
+    token: contextvars.Token[Span | None] | None = field(default=None, repr=False)
+    metrics: dict[str, int] | None = None
+    collector_states: tuple[tuple[Collector, ...], list[Any]] | None = field(default=None, repr=False)
+
+    @property
+    def duration_ns(self) -> int:
+        """Inclusive duration of the span, 0 while running."""
+        return self.end_ns - self.start_ns if self.end_ns else 0
+
+    def end(self) -> None:
+        """End the span; shorthand for ``span.tracer.end_span(span)``."""
+        self.tracer.end_span(self)
+
+
+@dataclass
+class CallTreeNode:
+    """Aggregated statistics for all spans sharing one path.
+
+    Attributes
+    ----------
+    path : tuple[str, ...]
+        Span names from the root to this node.
+    count : int
+        Number of spans aggregated into this node.
+    inclusive_ns : int
+        Total time spent in these spans, including their children.
+    exclusive_ns : int
+        Total time spent in these spans outside of their children.
+    metrics : dict[str, int]
+        Sum of the span collector metrics of these spans, e.g. ``gc_pause_ns``.
+    """
+
+    path: tuple[str, ...]
+    count: int = 0
+    inclusive_ns: int = 0
+    exclusive_ns: int = 0
+    metrics: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """Name of the innermost span."""
+        return self.path[-1]
+
+    @property
+    def depth(self) -> int:
+        """Nesting depth, 0 for root spans."""
+        return len(self.path) - 1
+
+
+class Tracer:
+    """Collect spans and aggregate them into a per-path call tree.
+
+    A tracer only receives spans from :class:`~frostbound.instrumentation.timer.Timer`
+    and the timing decorators while it is installed with :meth:`install`; spans
+    can also be opened directly with :meth:`span`.
+
+    Notes
+    -----
+    Exclusive time subtracts the inclusive time of children from the parent.
+    When children run concurrently (e.g. ``asyncio.gather`` of several tasks),
+    their combined time can exceed the parent's wall time; the parent's
+    exclusive time is then clamped to 0.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[tuple[str, ...], CallTreeNode] = {}
+        self._lock = threading.Lock()
+
+    def install(self) -> Self:
+        """Make this tracer the one used by timers, replacing any previous one."""
+        global _active_tracer
+        _active_tracer = self
+        return self
+
+    def uninstall(self) -> None:
+        """Stop feeding timer spans into this tracer."""
+        global _active_tracer
+        if _active_tracer is self:
+            _active_tracer = None
+
+    def __enter__(self) -> Self:
+        return self.install()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.uninstall()
+
+    def start_span(self, name: str) -> Span:
+        """Open a span as a child of the current span and make it current.
+
+        Parameters
+        ----------
+        name : str
+            Name of the span.
+
+        Returns
+        -------
+        Span
+            The running span, to be passed to :meth:`end_span`.
+        """
+        parent = _current_span.get()
+        path = (*parent.path, name) if parent is not None else (name,)
+        collectors = _span_collectors
+        states = start_collectors(collectors) if collectors else None
+        span = Span(name=name, path=path, parent=parent, start_ns=time.perf_counter_ns(), tracer=self)
+        if states is not None:
+            span.collector_states = (collectors, states)
+        span.token = _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        """Close a span, restore its parent as current and aggregate it.
+
+        Parameters
+        ----------
+        span : Span
+            Span returned by :meth:`start_span`.
+        """
+        span.end_ns = time.perf_counter_ns()
+        duration = span.end_ns - span.start_ns
+        if span.collector_states is not None:
+            span.metrics = stop_collectors(*span.collector_states)
+            span.collector_states = None
+
+        if span.token is not None:
+            try:
+                _current_span.reset(span.token)
+            except ValueError:
+                # NOTE: The token belongs to another context, e.g. the span was
+                # started in one task and ended in another. Fall back to the parent.
+                _current_span.set(span.parent)
+            span.token = None
+
+        with self._lock:
+            if span.parent is not None:
+                span.parent.child_ns += duration
+            node = self._nodes.get(span.path)
+            if node is None:
+                node = self._nodes[span.path] = CallTreeNode(path=span.path)
+            node.count += 1
+            node.inclusive_ns += duration
+            node.exclusive_ns += max(0, duration - span.child_ns)
+            if span.metrics:
+                for metric, value in span.metrics.items():
+                    node.metrics[metric] = node.metrics.get(metric, 0) + value
+
+    @contextmanager
+    def span(self, name: str) -> Generator[Span]:
+        """Context manager opening a span for the duration of the block."""
+        span = self.start_span(name)
+        try:
+            yield span
+        finally:
+            self.end_span(span)
+
+    def call_tree(self) -> list[CallTreeNode]:
+        """Return the aggregated nodes in depth-first order.
+
+        Returns
+        -------
+        list[CallTreeNode]
+            Copies of the nodes, sorted by path so that every node directly
+            follows its parent.
+        """
+        with self._lock:
+            nodes = [
+                CallTreeNode(
+                    path=n.path,
+                    count=n.count,
+                    inclusive_ns=n.inclusive_ns,
+                    exclusive_ns=n.exclusive_ns,
+                    metrics=dict(n.metrics),
+                )
+                for n in self._nodes.values()
+            ]
+        return sorted(nodes, key=lambda node: node.path)
+
+    def collapsed_stacks(self, unit_ns: int = 1_000) -> str:
+        """Export exclusive times in collapsed-stack (flame graph) format.
+
+        Parameters
+        ----------
+        unit_ns : int, optional
+            Nanoseconds per reported unit. Defaults to 1000 (microseconds).
+
+        Returns
+        -------
+        str
+            One ``root;child;leaf value`` line per node with a non-zero value.
+        """
+        lines: list[str] = []
+        for node in self.call_tree():
+            value = node.exclusive_ns // unit_ns
+            if value > 0:
+                lines.append(f"{';'.join(node.path)} {value}")
+        return "\n".join(lines)
+
+    def write_collapsed_stacks(self, path: Path | str, unit_ns: int = 1_000) -> None:
+        """Write :meth:`collapsed_stacks` to a file."""
+        Path(path).write_text(self.collapsed_stacks(unit_ns) + "\n", encoding="utf-8")
+
+    def reset(self) -> None:
+        """Discard all aggregated spans."""
+        with self._lock:
+            self._nodes.clear()
+
+
+def active_tracer() -> Tracer | None:
+    """Return the installed tracer, or None if tracing is disabled."""
+    return _active_tracer
+
+
+def start_span(name: str) -> Span | None:
+    """Open a span on the installed tracer, or return None if tracing is disabled.
+
+    End the returned span with :meth:`Span.end`.
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return None
+    return tracer.start_span(name)
+
+
+def add_span_collector(collector: Collector) -> None:
+    """Run ``collector`` around every span started from now on.
+
+    Its metrics end up in :attr:`Span.metrics`, in the call tree and in
+    exported trace events. Used by
+    :class:`~frostbound.instrumentation.gc_monitor.GCMonitor` to tag spans with
+    the GC pauses that overlapped them.
+    """
+    global _span_collectors
+    if collector not in _span_collectors:
+        _span_collectors = (*_span_collectors, collector)
+
+
+def remove_span_collector(collector: Collector) -> None:
+    """Stop running ``collector`` around new spans."""
+    global _span_collectors
+    _span_collectors = tuple(c for c in _span_collectors if c is not collector)
+
+
+def current_span() -> Span | None:
+    """Return the span that is current in this context, if any."""
+    return _current_span.get()
+
+
+def propagate_context(func: Callable[P, R]) -> Callable[P, R]:
+    """Bind ``func`` to a copy of the current context.
+
+    Use this when handing work to a thread so that spans opened there become
+    children of the current span.
+
+    Examples
+    --------
+    >>> with Timer(name="batch"):
+    ...     executor.submit(propagate_context(process_item), item)
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        # NOTE: A Context can only be entered by one thread at a time, so each
+        # call runs in its own copy of the captured context.
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,279 @@
+"""Histograms over sliding time windows.
+
+A :class:`WindowedHistogram` keeps a ring of per-interval
+:class:`~frostbound.instrumentation.histogram.LogHistogram` instances, e.g.
+30 intervals of 10 seconds. Values are recorded into the histogram of the
+current interval, and the interval that falls out of the ring is cleared
+when it is reused, so memory stays bounded no matter how long the process
+runs. Queries merge the intervals inside the requested window, e.g. "p99
+over the last 5 minutes", in O(intervals x buckets), optionally weighting
+older intervals with an exponential decay.
+
+:class:`WindowedHistogramRegistry` creates windowed histograms, so timers
+record into them unchanged.
+
+Examples
+--------
+>>> registry = WindowedHistogramRegistry(interval_seconds=10.0, intervals=30)
+>>> with Timer(name="handler", registry=registry):
+...     handle()
+>>> registry.histogram("handler").percentile(0.99, window_seconds=300.0)
+>>> registry.histogram("handler").percentile(0.99, half_life_seconds=60.0)
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable, Iterator
+from typing import Callable, cast
+
+from frostbound.instrumentation.histogram import (
+    DEFAULT_SUB_BUCKET_BITS,
+    HistogramRegistry,
+    HistogramSnapshot,
+    LogHistogram,
+)
+
+DEFAULT_INTERVAL_SECONDS = 10.0
+DEFAULT_INTERVALS = 30
+
+
+class WindowedHistogram(LogHistogram):
+    """:class:`LogHistogram` answering queries over a sliding time window.
+
+    Parameters
+    ----------
+    interval_seconds : float, optional
+        Resolution of the window. Defaults to 10.0.
+    intervals : int, optional
+        Number of intervals kept; the longest window is
+        ``interval_seconds * intervals``. Defaults to 30 (5 minutes).
+    sub_bucket_bits : int, optional
+        Precision of the histograms. Defaults to 7.
+    clock : Callable[[], float], optional
+        Monotonic clock in seconds. Defaults to ``time.monotonic``.
+
+    Notes
+    -----
+    Windows are rounded up to whole intervals, and include the current,
+    partial one: with 10 second intervals, a 60 second window covers between
+    50 and 60 seconds of past values plus the current interval.
+
+    The inherited statistics (:attr:`count`, :meth:`percentile`,
+    :meth:`snapshot`) cover the whole ring unless a window is given.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        intervals: int = DEFAULT_INTERVALS,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval_seconds <= 0 or intervals < 1:
+            raise ValueError("interval_seconds must be positive and intervals at least 1")
+        super().__init__(sub_bucket_bits)
+        self.interval_seconds = interval_seconds
+        self.intervals = intervals
+        self._clock = clock
+        self._ring = [LogHistogram(sub_bucket_bits) for _ in range(intervals)]
+        self._epochs = [-1] * intervals
+        self._current = self._ring[0]
+        self._next_rotation = -math.inf
+
+    @property
+    def count(self) -> int:
+        """Number of values recorded within the whole ring."""
+        return sum(histogram.count for histogram, _ in self._intervals(None))
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value into the current interval, see :meth:`LogHistogram.record`."""
+        if self._clock() >= self._next_rotation:
+            self._rotate()
+        self._current.record(value, count)
+
+    def record_many(self, values: Iterable[int], count: int = 1) -> None:
+        """Record several values into the current interval."""
+        if self._clock() >= self._next_rotation:
+            self._rotate()
+        self._current.record_many(values, count)
+
+    def merge(self, other: LogHistogram) -> None:
+        """Add all values recorded in ``other`` to the current interval."""
+        if self._clock() >= self._next_rotation:
+            self._rotate()
+        self._current.merge(other.window() if isinstance(other, WindowedHistogram) else other)
+
+    def window(self, window_seconds: float | None = None) -> LogHistogram:
+        """Merge the intervals of the last ``window_seconds`` (default: all) into one histogram."""
+        merged = LogHistogram(self.sub_bucket_bits)
+        for histogram, _ in self._intervals(window_seconds):
+            merged.merge(histogram)
+        return merged
+
+    def percentile(
+        self,
+        quantile: float,
+        window_seconds: float | None = None,
+        half_life_seconds: float | None = None,
+    ) -> int:
+        """Estimate the value at ``quantile`` over a window.
+
+        Parameters
+        ----------
+        quantile : float
+            Between 0 and 1.
+        window_seconds : float | None, optional
+            Only consider the last ``window_seconds``. Defaults to the whole ring.
+        half_life_seconds : float | None, optional
+            Weight each interval by ``0.5 ** (age / half_life_seconds)``, so
+            recent values dominate without older ones dropping out abruptly.
+        """
+        if half_life_seconds is None:
+            return self.window(window_seconds).percentile(quantile)
+
+        weights, total, smallest, largest = self._weighted_counts(window_seconds, half_life_seconds)
+        if total <= 0:
+            return 0
+        target = quantile * total
+        cumulative = 0.0
+        for index, weight in enumerate(weights):
+            cumulative += weight
+            if weight and cumulative >= target:
+                lowest, highest = self.bucket_bounds(index)
+                return min(max((lowest + highest) // 2, smallest), largest)
+        return largest
+
+    def fraction_above(
+        self,
+        threshold: int,
+        window_seconds: float | None = None,
+        half_life_seconds: float | None = None,
+    ) -> float:
+        """Return the fraction of values in the window above ``threshold``.
+
+        Values sharing the threshold's bucket count as below it, so the
+        result is accurate to the bucket resolution.
+        """
+        weights, total, _, _ = self._weighted_counts(window_seconds, half_life_seconds)
+        if total <= 0:
+            return 0.0
+        return sum(weights[self.bucket_index(max(0, threshold)) + 1 :]) / total
+
+    def snapshot(self, reset: bool = False, window_seconds: float | None = None) -> HistogramSnapshot:
+        """Summarize the values of the last ``window_seconds`` (default: all).
+
+        Parameters
+        ----------
+        reset : bool, optional
+            Clear every interval after taking the snapshot.
+        window_seconds : float | None, optional
+            Only consider the last ``window_seconds``.
+        """
+        snapshot = self.window(window_seconds).snapshot()
+        if reset:
+            self.reset()
+        return snapshot
+
+    def reset(self) -> None:
+        """Clear all intervals."""
+        with self._lock:
+            for histogram in self._ring:
+                histogram.reset()
+            self._epochs = [-1] * self.intervals
+            self._next_rotation = -math.inf
+
+    def _rotate(self) -> None:
+        """Make the interval of the current time the one recorded into."""
+        with self._lock:
+            now = self._clock()
+            if now < self._next_rotation:
+                return
+            epoch = int(now // self.interval_seconds)
+            slot = epoch % self.intervals
+            if self._epochs[slot] != epoch:
+                # NOTE: The slot still holds the interval one full ring ago, or older.
+                self._ring[slot].reset()
+                self._epochs[slot] = epoch
+            self._current = self._ring[slot]
+            self._next_rotation = (epoch + 1) * self.interval_seconds
+
+    def _intervals(self, window_seconds: float | None) -> Iterator[tuple[LogHistogram, int]]:
+        """Yield the histograms within the window and their age in intervals."""
+        current = int(self._clock() // self.interval_seconds)
+        span = self.intervals
+        if window_seconds is not None:
+            span = min(span, max(1, math.ceil(window_seconds / self.interval_seconds)))
+        with self._lock:
+            epochs = list(self._epochs)
+        for slot, epoch in enumerate(epochs):
+            age = current - epoch
+            if epoch >= 0 and 0 <= age < span:
+                yield self._ring[slot], age
+
+    def _weighted_counts(
+        self, window_seconds: float | None, half_life_seconds: float | None
+    ) -> tuple[list[float], float, int, int]:
+        """Return decayed bucket weights, their total, and the smallest and largest value."""
+        weights: list[float] = []
+        smallest, largest = math.inf, 0
+        for histogram, age in self._intervals(window_seconds):
+            decay = 1.0 if half_life_seconds is None else 0.5 ** (age * self.interval_seconds / half_life_seconds)
+            with histogram._lock:
+                counts = list(histogram._counts)
+                if histogram._count:
+                    smallest, largest = min(smallest, histogram._min), max(largest, histogram._max)
+            if len(counts) > len(weights):
+                weights.extend([0.0] * (len(counts) - len(weights)))
+            for index, bucket_count in enumerate(counts):
+                if bucket_count:
+                    weights[index] += bucket_count * decay
+        return weights, sum(weights), 0 if smallest == math.inf else int(smallest), largest
+
+
+class WindowedHistogramRegistry(HistogramRegistry):
+    """:class:`HistogramRegistry` creating :class:`WindowedHistogram` instances.
+
+    Reporting with :meth:`start_reporting` should pass ``reset=False``, since
+    the window already discards old values.
+
+    Parameters
+    ----------
+    interval_seconds : float, optional
+        Resolution of the windows. Defaults to 10.0.
+    intervals : int, optional
+        Number of intervals kept per histogram. Defaults to 30.
+    sub_bucket_bits : int, optional
+        Precision of the histograms. Defaults to 7.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        intervals: int = DEFAULT_INTERVALS,
+        sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS,
+    ) -> None:
+        super().__init__(sub_bucket_bits)
+        self.interval_seconds = interval_seconds
+        self.intervals = intervals
+
+    def histogram(self, name: str) -> WindowedHistogram:
+        """Return the windowed histogram called ``name``, creating it if needed."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    name, WindowedHistogram(self.interval_seconds, self.intervals, self.sub_bucket_bits)
+                )
+        return cast(WindowedHistogram, histogram)
+
+    def window_snapshot(self, window_seconds: float | None = None) -> dict[str, HistogramSnapshot]:
+        """Snapshot every histogram over the last ``window_seconds`` (default: all)."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        return {
+            name: histogram.snapshot(window_seconds=window_seconds)
+            for name, histogram in histograms
+            if isinstance(histogram, WindowedHistogram)
+        }
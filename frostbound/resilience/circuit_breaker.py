@@ -3,7 +3,8 @@ from __future__ import annotations
 import inspect
 import logging
 import time
-from contextlib import contextmanager
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import aclosing, asynccontextmanager, contextmanager
 from enum import Enum, auto
 from functools import wraps
 from typing import Any, Callable, Generator, Generic, ParamSpec, TypeVar, cast, overload
@@ -165,13 +166,113 @@ class CircuitBreakerError(Exception):
         super().__init__(self.message)
 
 
+class RejectionLogAggregator:
+    """
+    Rate-limited logger for calls rejected by an open circuit.
+
+    Instead of one log line per rejected call, rejections are counted and a
+    single summary line is emitted at most once per interval.
+
+    Parameters
+    ----------
+    interval_seconds : float, default=10.0
+        Minimum time in seconds between two summary log lines
+    """
+
+    def __init__(self, interval_seconds: float = 10.0) -> None:
+        """
+        Initialize a new rejection log aggregator.
+
+        Parameters
+        ----------
+        interval_seconds : float, default=10.0
+            Minimum time in seconds between two summary log lines
+        """
+        self.interval_seconds = interval_seconds
+        self.rejected_count: int = 0
+        self.total_rejected_count: int = 0
+        self._window_start: float = 0
+        self._next_log_time: float = 0
+
+    def record(self, now: float) -> None:
+        """
+        Record a rejected call, logging a summary if the interval has elapsed.
+
+        Parameters
+        ----------
+        now : float
+            Current time as returned by ``time.time()``
+        """
+        self.rejected_count += 1
+        self.total_rejected_count += 1
+        if now < self._next_log_time:
+            return
+
+        if self._window_start:
+            logger.warning(
+                f"Circuit breaker rejected {self.rejected_count} calls in the last {now - self._window_start:.2f}s"
+            )
+        else:
+            logger.warning("Circuit breaker is open, rejecting calls")
+        self.rejected_count = 0
+        self._window_start = now
+        self._next_log_time = now + self.interval_seconds
+
+
+class _TimedIterator(Generic[T]):
+    """
+    Iterator proxy adding up the time the wrapped iterator spends producing items.
+
+    Forwards ``send``, ``throw`` and ``close`` so that ``yield from`` a proxy
+    behaves like ``yield from`` the wrapped generator, while the time the
+    consumer spends between two items is left out of ``elapsed``.
+    """
+
+    def __init__(self, iterator: Iterator[T]) -> None:
+        self._iterator = iterator
+        self.elapsed = 0.0
+
+    def __iter__(self) -> _TimedIterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        start_time = time.monotonic()
+        try:
+            return next(self._iterator)
+        finally:
+            self.elapsed += time.monotonic() - start_time
+
+    def send(self, value: Any) -> T:
+        start_time = time.monotonic()
+        try:
+            return cast(Generator[T, Any, Any], self._iterator).send(value)
+        finally:
+            self.elapsed += time.monotonic() - start_time
+
+    def throw(self, error: BaseException) -> T:
+        throw = getattr(self._iterator, "throw", None)
+        if throw is None:
+            raise error
+        start_time = time.monotonic()
+        try:
+            return cast(T, throw(error))
+        finally:
+            self.elapsed += time.monotonic() - start_time
+
+    def close(self) -> None:
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
+
+
 class CircuitBreaker(Generic[R]):
     """
     Circuit breaker implementation to prevent cascading failures.
 
     This class provides a circuit breaker pattern implementation that can be used
-    as a decorator or a context manager. Supports both synchronous and asynchronous
-    functions.
+    as a decorator or a context manager. Supports synchronous and asynchronous
+    functions as well as sync and async generators; generators are protected for
+    the whole lifetime of the stream rather than only for their creation.
 
     Parameters
     ----------
@@ -181,6 +282,18 @@ class CircuitBreaker(Generic[R]):
         Time in seconds before attempting to close circuit
     fallback : callable, optional
         Optional fallback function to call when circuit is open
+    slow_call_threshold_seconds : float, optional
+        Calls (or fully consumed streams) that take at least this long are
+        recorded as failures even if they return normally. Disabled by default.
+    fast_reject : bool, default=False
+        Reject calls to an open circuit in :meth:`execute` and
+        :meth:`execute_async` with one state check: a plain
+        :class:`CircuitBreakerError` is raised (or the fallback called
+        directly) without formatting a message, and rejections are logged
+        through a :class:`RejectionLogAggregator` instead of once per call. A
+        fallback returning a constant acts as a sentinel result.
+    rejection_log_interval_seconds : float, default=10.0
+        Minimum time between two rejection summary log lines in fast-reject mode
     """
 
     def __init__(
@@ -188,6 +301,9 @@ class CircuitBreaker(Generic[R]):
         failure_threshold: int = 5,
         reset_timeout_seconds: float = 30.0,
         fallback: Callable[..., R] | None = None,
+        slow_call_threshold_seconds: float | None = None,
+        fast_reject: bool = False,
+        rejection_log_interval_seconds: float = 10.0,
     ) -> None:
         """
         Initialize a new circuit breaker.
@@ -200,12 +316,27 @@ class CircuitBreaker(Generic[R]):
             Time in seconds before attempting to close circuit
         fallback : callable, optional
             Optional fallback function to call when circuit is open
+        slow_call_threshold_seconds : float, optional
+            Duration at or above which a successful call is recorded as a failure
+        fast_reject : bool, default=False
+            Whether to reject calls to an open circuit without per-call logging
+        rejection_log_interval_seconds : float, default=10.0
+            Minimum time between two rejection summary log lines in fast-reject mode
         """
         self.state = CircuitBreakerState(
             failure_threshold=failure_threshold,
             reset_timeout_seconds=reset_timeout_seconds,
         )
         self.fallback = fallback
+        self.slow_call_threshold_seconds = slow_call_threshold_seconds
+        self.fast_reject = fast_reject
+        self.rejections = RejectionLogAggregator(interval_seconds=rejection_log_interval_seconds)
+
+    @overload
+    def __call__(self, func: Callable[P, AsyncIterator[T]]) -> Callable[P, AsyncGenerator[T]]: ...
+
+    @overload
+    def __call__(self, func: Callable[P, Iterator[T]]) -> Callable[P, Generator[T]]: ...
 
     @overload
     def __call__(self, func: Callable[P, R]) -> Callable[P, R]: ...
@@ -227,6 +358,28 @@ class CircuitBreaker(Generic[R]):
         callable
             Decorated function
         """
+        # NOTE: Generator checks must come first: async generator functions are
+        # not coroutine functions, and both kinds only start running on iteration.
+        # The wrappers are generator functions themselves so that inspect, and
+        # decorators stacked on top such as timed, still see a generator function.
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            async def async_gen_wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncGenerator[Any]:
+                async with aclosing(self.stream_async(func, *args, **kwargs)) as stream:
+                    async for item in stream:
+                        yield item
+
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def gen_wrapper(*args: P.args, **kwargs: P.kwargs) -> Generator[Any]:
+                yield from self.stream(func, *args, **kwargs)
+
+            return gen_wrapper
+
         if inspect.iscoroutinefunction(func):
 
             @wraps(func)
@@ -265,6 +418,13 @@ class CircuitBreaker(Generic[R]):
         CircuitBreakerError
             If circuit is open
         """
+        if self.fast_reject and self._should_fast_reject():
+            if self.fallback:
+                return self.fallback(*args, **kwargs)
+            # NOTE: A fresh error per rejection: a shared instance raised from
+            # several threads would mix their tracebacks and keep frames alive.
+            raise CircuitBreakerError()
+
         if not self.state.should_execute():
             logger.warning(f"Circuit breaker preventing execution of {func.__name__}")
 
@@ -274,13 +434,14 @@ class CircuitBreaker(Generic[R]):
 
             raise CircuitBreakerError(f"Circuit breaker is open for {func.__name__}")
 
+        start_time = time.monotonic()
         try:
             result = func(*args, **kwargs)
-            self.state.record_success()
-            return result
         except Exception:
             self.state.record_failure()
             raise
+        self._record_completion(time.monotonic() - start_time)
+        return result
 
     async def execute_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> R:
         """
@@ -305,6 +466,13 @@ class CircuitBreaker(Generic[R]):
         CircuitBreakerError
             If circuit is open
         """
+        if self.fast_reject and self._should_fast_reject():
+            if self.fallback:
+                if inspect.iscoroutinefunction(self.fallback):
+                    return cast(R, await self.fallback(*args, **kwargs))
+                return self.fallback(*args, **kwargs)
+            raise CircuitBreakerError()
+
         # NOTE: Check if circuit should allow execution
         if not self.state.should_execute():
             logger.warning(f"Circuit breaker preventing execution of {func.__name__}")
@@ -317,13 +485,14 @@ class CircuitBreaker(Generic[R]):
 
             raise CircuitBreakerError(f"Circuit breaker is open for {func.__name__}")
 
+        start_time = time.monotonic()
         try:
             result = await func(*args, **kwargs)
-            self.state.record_success()
-            return cast(R, result)
         except Exception:
             self.state.record_failure()
             raise
+        self._record_completion(time.monotonic() - start_time)
+        return cast(R, result)
 
     @contextmanager
     def context(self) -> Generator[CircuitBreakerState]:
@@ -344,21 +513,221 @@ class CircuitBreaker(Generic[R]):
             logger.warning("Circuit breaker preventing execution in context")
             raise CircuitBreakerError("Circuit breaker is open")
 
+        start_time = time.monotonic()
+        success = False
+        try:
+            yield self.state
+            success = True
+        finally:
+            if success:
+                self._record_completion(time.monotonic() - start_time)
+            else:
+                self.state.record_failure()
+
+    @asynccontextmanager
+    async def acontext(self) -> AsyncGenerator[CircuitBreakerState]:
+        """
+        Async context manager for circuit breaker.
+
+        Behaves like :meth:`context` but can be used with ``async with`` so the
+        protected block may await.
+
+        Yields
+        ------
+        CircuitBreakerState
+            The circuit breaker state
+
+        Raises
+        ------
+        CircuitBreakerError
+            If circuit is open
+
+        Examples
+        --------
+        >>> breaker = CircuitBreaker(failure_threshold=3)
+        >>> async def fetch() -> bytes:
+        ...     async with breaker.acontext():
+        ...         return await client.get("/health")
+        """
+        if not self.state.should_execute():
+            logger.warning("Circuit breaker preventing execution in async context")
+            raise CircuitBreakerError("Circuit breaker is open")
+
+        start_time = time.monotonic()
         success = False
         try:
             yield self.state
             success = True
         finally:
             if success:
-                self.state.record_success()
+                self._record_completion(time.monotonic() - start_time)
             else:
                 self.state.record_failure()
 
+    def stream(self, func: Callable[..., Iterator[T]], *args: Any, **kwargs: Any) -> Generator[T]:
+        """
+        Iterate a generator with circuit breaker protection.
+
+        The circuit is checked when iteration starts. Items are passed through as
+        they are produced, so the stream is never buffered. An exception raised
+        partway through the stream is recorded as a failure; exhausting the
+        stream records a success (or a failure if producing its items took
+        ``slow_call_threshold_seconds`` or longer in total; the time the consumer
+        spends between two items is not counted). Closing the stream early
+        records nothing, since the dependency neither failed nor completed.
+
+        Parameters
+        ----------
+        func : callable
+            Generator function to execute
+        *args : tuple
+            Positional arguments
+        **kwargs : dict
+            Keyword arguments
+
+        Yields
+        ------
+        T
+            Items produced by the generator
+
+        Raises
+        ------
+        CircuitBreakerError
+            If circuit is open
+        """
+        if not self.state.should_execute():
+            logger.warning(f"Circuit breaker preventing execution of {func.__name__}")
+
+            if self.fallback:
+                logger.info(f"Using fallback for {func.__name__}")
+                yield from cast(Iterator[T], self.fallback(*args, **kwargs))
+                return
+
+            raise CircuitBreakerError(f"Circuit breaker is open for {func.__name__}")
+
+        iterator = _TimedIterator(iter(func(*args, **kwargs)))
+        try:
+            # NOTE: `yield from` forwards send()/throw()/close() to the wrapped generator.
+            yield from iterator
+        except Exception:
+            self.state.record_failure()
+            raise
+        self._record_completion(iterator.elapsed)
+
+    async def stream_async(self, func: Callable[..., AsyncIterator[T]], *args: Any, **kwargs: Any) -> AsyncGenerator[T]:
+        """
+        Iterate an async generator with circuit breaker protection.
+
+        Async counterpart of :meth:`stream` with the same accounting rules.
+        The fallback, if any, may return either an async or a sync iterable.
+
+        Parameters
+        ----------
+        func : callable
+            Async generator function to execute
+        *args : tuple
+            Positional arguments
+        **kwargs : dict
+            Keyword arguments
+
+        Yields
+        ------
+        T
+            Items produced by the async generator
+
+        Raises
+        ------
+        CircuitBreakerError
+            If circuit is open
+        """
+        if not self.state.should_execute():
+            logger.warning(f"Circuit breaker preventing execution of {func.__name__}")
+
+            if self.fallback:
+                logger.info(f"Using fallback for {func.__name__}")
+                fallback_result = self.fallback(*args, **kwargs)
+                if isinstance(fallback_result, AsyncIterator):
+                    async for item in cast(AsyncIterator[T], fallback_result):
+                        yield item
+                else:
+                    for item in cast(Iterator[T], fallback_result):
+                        yield item
+                return
+
+            raise CircuitBreakerError(f"Circuit breaker is open for {func.__name__}")
+
+        iterator = func(*args, **kwargs)
+        # NOTE: Only the time spent waiting for the next item counts towards the
+        # slow-call threshold, not the time the consumer takes between items.
+        elapsed = 0.0
+        try:
+            while True:
+                start_time = time.monotonic()
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    elapsed += time.monotonic() - start_time
+                yield item
+        except Exception:
+            self.state.record_failure()
+            raise
+        finally:
+            # NOTE: Make sure the wrapped generator is finalized even when the
+            # consumer stops early, instead of leaving it to the garbage collector.
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        self._record_completion(elapsed)
+
+    def _should_fast_reject(self) -> bool:
+        """
+        Check whether a call can be rejected without consulting the full state machine.
+
+        Only an open circuit whose reset timeout has not yet elapsed is rejected
+        here, and the clock is read only in that case. Everything else (closed,
+        half-open, or due for a test call) goes through the regular path.
+
+        Returns
+        -------
+        bool
+            True if the call should be rejected.
+        """
+        state = self.state
+        if state.state is not CircuitState.OPEN:
+            return False
+
+        now = time.time()
+        if now - state.last_failure_time >= state.reset_timeout_seconds:
+            return False
+
+        self.rejections.record(now)
+        return True
+
+    def _record_completion(self, elapsed: float) -> None:
+        """
+        Record a call that finished without raising.
+
+        Parameters
+        ----------
+        elapsed : float
+            Duration of the call in seconds
+        """
+        threshold = self.slow_call_threshold_seconds
+        if threshold is not None and elapsed >= threshold:
+            logger.warning(f"Circuit breaker recording slow call ({elapsed:.2f}s >= {threshold:.2f}s) as failure")
+            self.state.record_failure()
+        else:
+            self.state.record_success()
+
 
 def circuit_breaker(
     failure_threshold: int = 5,
     reset_timeout_seconds: float = 30.0,
     fallback: Callable[..., Any] | None = None,
+    slow_call_threshold_seconds: float | None = None,
+    fast_reject: bool = False,
 ) -> CircuitBreaker[Any]:
     """
     Create a circuit breaker decorator.
@@ -373,6 +742,10 @@ def circuit_breaker(
         Time in seconds before attempting to close circuit
     fallback : callable, optional
         Optional fallback function to call when circuit is open
+    slow_call_threshold_seconds : float, optional
+        Duration at or above which a successful call is recorded as a failure
+    fast_reject : bool, default=False
+        Whether to reject calls to an open circuit without per-call logging
 
     Returns
     -------
@@ -390,9 +763,16 @@ def circuit_breaker(
     ... async def my_async_function():
     ...     # Async function implementation
     ...     pass
+
+    >>> @circuit_breaker(slow_call_threshold_seconds=5.0)
+    ... async def stream_rows():
+    ...     async for row in cursor:
+    ...         yield row
     """
     return CircuitBreaker(
         failure_threshold=failure_threshold,
         reset_timeout_seconds=reset_timeout_seconds,
         fallback=fallback,
+        slow_call_threshold_seconds=slow_call_threshold_seconds,
+        fast_reject=fast_reject,
     )
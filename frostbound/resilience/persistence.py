@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import types
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Self
+
+from frostbound.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerState, CircuitState
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CircuitBreakerSnapshot:
+    """
+    Point-in-time copy of a circuit breaker's state.
+
+    Attributes
+    ----------
+    state : str
+        Name of the :class:`CircuitState` at snapshot time.
+    failure_count : int
+        Consecutive failures recorded at snapshot time.
+    last_failure_time : float
+        Wall-clock timestamp (``time.time()``) of the last recorded failure.
+    saved_at : float
+        Wall-clock timestamp at which the snapshot was taken.
+    """
+
+    state: str
+    failure_count: int
+    last_failure_time: float
+    saved_at: float
+
+    @classmethod
+    def capture(cls, state: CircuitBreakerState, now: float | None = None) -> CircuitBreakerSnapshot:
+        """
+        Take a snapshot of a circuit breaker state.
+
+        Parameters
+        ----------
+        state : CircuitBreakerState
+            State to capture.
+        now : float, optional
+            Timestamp to record as ``saved_at``. Defaults to ``time.time()``.
+
+        Returns
+        -------
+        CircuitBreakerSnapshot
+            The captured snapshot.
+        """
+        return cls(
+            state=state.state.name,
+            failure_count=state.failure_count,
+            last_failure_time=state.last_failure_time,
+            saved_at=time.time() if now is None else now,
+        )
+
+    @classmethod
+    def from_dict(cls, data: object) -> CircuitBreakerSnapshot:
+        """
+        Build a snapshot from its JSON form, checking every field.
+
+        Parameters
+        ----------
+        data : object
+            Decoded JSON object, as written by :meth:`CircuitBreakerStore.save`.
+
+        Returns
+        -------
+        CircuitBreakerSnapshot
+            The validated snapshot.
+
+        Raises
+        ------
+        ValueError
+            If ``data`` is not a snapshot: not an object, missing or unexpected
+            fields, or fields of the wrong type.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"expected an object, got {type(data).__name__}")
+        names = [field.name for field in fields(cls)]
+        if missing := [name for name in names if name not in data]:
+            raise ValueError(f"missing fields {missing}")
+        if unexpected := sorted(set(data) - set(names)):
+            raise ValueError(f"unexpected fields {unexpected}")
+        snapshot = cls(**data)
+        if not isinstance(snapshot.state, str):
+            raise ValueError(f"state must be a string, got {snapshot.state!r}")
+        if not isinstance(snapshot.failure_count, int) or isinstance(snapshot.failure_count, bool):
+            raise ValueError(f"failure_count must be an integer, got {snapshot.failure_count!r}")
+        for name in ("last_failure_time", "saved_at"):
+            value = getattr(snapshot, name)
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite number, got {value!r}")
+        return snapshot
+
+
+class CircuitBreakerStore:
+    """
+    Persist circuit breaker states to a local file so they survive restarts.
+
+    Registered breakers are snapshotted by a background thread every
+    ``snapshot_interval_seconds`` and once more at shutdown. Request threads
+    never touch the file: they only mutate the in-memory breaker state, which the
+    writer thread reads. Each write goes to a temporary file in the same directory
+    followed by ``os.replace``, so readers never observe a torn file.
+
+    On :meth:`register`, a previously saved snapshot for the same name is applied
+    with time-aware decay:
+
+    - snapshots older than ``max_age_seconds`` are ignored;
+    - an open (or half-open) circuit is restored as open with its original
+      ``last_failure_time``, so the usual ``reset_timeout_seconds`` still measures
+      from the real last failure and a test call is allowed once it has elapsed;
+    - a closed circuit's failure count is halved every
+      ``failure_half_life_seconds`` since the last failure.
+
+    Parameters
+    ----------
+    path : Path or str
+        File used to store the snapshots.
+    snapshot_interval_seconds : float, default=10.0
+        Interval between background snapshots.
+    failure_half_life_seconds : float, default=60.0
+        Half-life applied to the failure count of restored closed circuits.
+    max_age_seconds : float, default=3600.0
+        Snapshots older than this are discarded on restore.
+
+    Examples
+    --------
+    >>> store = CircuitBreakerStore("/var/lib/myapp/breakers.json")
+    >>> payments = CircuitBreaker(failure_threshold=5)
+    >>> store.register("payments", payments)  # warm-starts from the last run
+    >>> store.start()  # periodic snapshots, plus a final one at exit
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        snapshot_interval_seconds: float = 10.0,
+        failure_half_life_seconds: float = 60.0,
+        max_age_seconds: float = 3600.0,
+    ) -> None:
+        """
+        Initialize a new circuit breaker store.
+
+        Parameters
+        ----------
+        path : Path or str
+            File used to store the snapshots.
+        snapshot_interval_seconds : float, default=10.0
+            Interval between background snapshots.
+        failure_half_life_seconds : float, default=60.0
+            Half-life applied to the failure count of restored closed circuits.
+        max_age_seconds : float, default=3600.0
+            Snapshots older than this are discarded on restore.
+        """
+        self.path = Path(path)
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.failure_half_life_seconds = failure_half_life_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self._states: dict[str, CircuitBreakerState] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loaded: dict[str, CircuitBreakerSnapshot] | None = None
+
+    def register(self, name: str, breaker: CircuitBreaker[Any] | CircuitBreakerState, restore: bool = True) -> None:
+        """
+        Register a breaker for persistence, restoring its saved state if any.
+
+        Parameters
+        ----------
+        name : str
+            Stable name identifying the breaker across restarts.
+        breaker : CircuitBreaker or CircuitBreakerState
+            Breaker (or bare state) to persist.
+        restore : bool, default=True
+            Whether to apply a previously saved snapshot immediately.
+        """
+        state = breaker.state if isinstance(breaker, CircuitBreaker) else breaker
+        with self._lock:
+            self._states[name] = state
+
+        if not restore:
+            return
+
+        snapshot = self.load().get(name)
+        if snapshot is not None:
+            self.apply(state, snapshot)
+
+    def unregister(self, name: str) -> None:
+        """
+        Stop persisting a breaker.
+
+        Parameters
+        ----------
+        name : str
+            Name the breaker was registered under.
+        """
+        with self._lock:
+            self._states.pop(name, None)
+
+    def snapshot(self) -> dict[str, CircuitBreakerSnapshot]:
+        """
+        Capture snapshots of all registered breakers.
+
+        Returns
+        -------
+        dict[str, CircuitBreakerSnapshot]
+            Snapshots keyed by breaker name.
+        """
+        now = time.time()
+        with self._lock:
+            states = list(self._states.items())
+        return {name: CircuitBreakerSnapshot.capture(state, now) for name, state in states}
+
+    def save(self) -> None:
+        """
+        Atomically write snapshots of all registered breakers to :attr:`path`.
+
+        Snapshots already in the file for breakers not registered here, such as
+        those of another process sharing the file or of a breaker not registered
+        yet, are kept unless older than ``max_age_seconds``.
+        """
+        now = time.time()
+        # NOTE: Re-read rather than reuse load()'s cache, so that snapshots written
+        # by other processes since startup are not dropped.
+        snapshots = {
+            name: snapshot
+            for name, snapshot in self._read().items()
+            if 0 <= now - snapshot.saved_at <= self.max_age_seconds
+        }
+        snapshots.update(self.snapshot())
+        payload = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "breakers": {name: asdict(snapshot) for name, snapshot in snapshots.items()},
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path | None = None
+        replaced = False
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                encoding="utf-8",
+                dir=self.path.parent,
+                prefix=f".{self.path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as tmp_file:
+                tmp_path = Path(tmp_file.name)
+                json.dump(payload, tmp_file)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, self.path)
+            replaced = True
+        finally:
+            if tmp_path is not None and not replaced:
+                tmp_path.unlink(missing_ok=True)
+
+    def load(self) -> dict[str, CircuitBreakerSnapshot]:
+        """
+        Read the snapshots stored in :attr:`path`.
+
+        The file is read once and cached. A missing, unreadable or incompatible
+        file yields no snapshots, and a malformed entry is skipped, so that
+        startup is never blocked by it.
+
+        Returns
+        -------
+        dict[str, CircuitBreakerSnapshot]
+            Snapshots keyed by breaker name.
+        """
+        if self._loaded is None:
+            self._loaded = self._read()
+        return self._loaded
+
+    def apply(self, state: CircuitBreakerState, snapshot: CircuitBreakerSnapshot, now: float | None = None) -> None:
+        """
+        Apply a snapshot to a breaker state with time-aware decay.
+
+        Parameters
+        ----------
+        state : CircuitBreakerState
+            State to update in place.
+        snapshot : CircuitBreakerSnapshot
+            Snapshot to apply.
+        now : float, optional
+            Current wall-clock time. Defaults to ``time.time()``.
+        """
+        now = time.time() if now is None else now
+        age = now - snapshot.saved_at
+        if age < 0 or age > self.max_age_seconds:
+            logger.info(f"Discarding circuit breaker snapshot aged {age:.1f}s")
+            return
+
+        try:
+            saved_state = CircuitState[snapshot.state]
+        except KeyError:
+            logger.warning(f"Discarding circuit breaker snapshot with unknown state {snapshot.state!r}")
+            return
+
+        state.last_failure_time = snapshot.last_failure_time
+
+        if saved_state != CircuitState.CLOSED:
+            # NOTE: A half-open probe in flight at shutdown never reported back, so
+            # treat it as still open; should_execute() lets the next probe through
+            # once reset_timeout_seconds has passed since the last failure.
+            state.state = CircuitState.OPEN
+            state.failure_count = max(snapshot.failure_count, state.failure_threshold)
+            logger.info(f"Restored open circuit breaker (last failure {now - snapshot.last_failure_time:.1f}s ago)")
+            return
+
+        since_failure = max(0.0, now - snapshot.last_failure_time)
+        decay = 0.5 ** (since_failure / self.failure_half_life_seconds) if self.failure_half_life_seconds > 0 else 0.0
+        state.state = CircuitState.CLOSED
+        state.failure_count = min(int(snapshot.failure_count * decay), max(state.failure_threshold - 1, 0))
+
+    def restore(self) -> None:
+        """
+        Apply saved snapshots to every registered breaker.
+        """
+        snapshots = self.load()
+        with self._lock:
+            states = list(self._states.items())
+        for name, state in states:
+            snapshot = snapshots.get(name)
+            if snapshot is not None:
+                self.apply(state, snapshot)
+
+    def start(self) -> None:
+        """
+        Start periodic background snapshots and register a final save at exit.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="circuit-breaker-store", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Stop background snapshots and write a final snapshot.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.stop)
+        self._save_quietly()
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _read(self) -> dict[str, CircuitBreakerSnapshot]:
+        snapshots: dict[str, CircuitBreakerSnapshot] = {}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return snapshots
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable circuit breaker snapshot file {self.path}: {e}")
+            return snapshots
+
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_FORMAT_VERSION:
+            logger.warning(f"Ignoring circuit breaker snapshot file {self.path} with unsupported format")
+            return snapshots
+
+        breakers = payload.get("breakers", {})
+        if not isinstance(breakers, dict):
+            logger.warning(f"Ignoring circuit breaker snapshot file {self.path} with malformed breakers")
+            return snapshots
+
+        for name, data in breakers.items():
+            try:
+                snapshots[name] = CircuitBreakerSnapshot.from_dict(data)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring malformed snapshot for circuit breaker {name!r}: {e}")
+
+        return snapshots
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.snapshot_interval_seconds):
+            self._save_quietly()
+
+    def _save_quietly(self) -> None:
+        try:
+            self.save()
+        except OSError as e:
+            logger.warning(f"Failed to save circuit breaker snapshots to {self.path}: {e}")
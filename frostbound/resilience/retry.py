@@ -74,7 +74,8 @@ class Statistics:
     start_time : float
         Timestamp when retry operation started.
     execution_times : list[float]
-        List of execution times for each attempt.
+        List of execution times for each attempt, in seconds. Failed attempts
+        are included, up to the moment their exception was raised.
     """
 
     attempts: int = 0
@@ -97,7 +98,7 @@ class Statistics:
     @property
     def average_execution_time(self) -> float:
         """
-        Average execution time of attempts.
+        Average execution time of attempts, failed ones included.
 
         Returns
         -------
@@ -951,8 +952,9 @@ class Retry(Generic[R, E]):
             state_for_hooks = cast(RetryState[object, Exception], state)
             self.policy.execute_before_hooks(state_for_hooks, *args, **kwargs)
 
+            execution_time: float | None = None
+            start_time = time.time()
             try:
-                start_time = time.time()
                 result = fn(*args, **kwargs)
                 execution_time = time.time() - start_time
 
@@ -971,6 +973,10 @@ class Retry(Generic[R, E]):
                 self.policy.logger.debug(f"Retrying after attempt {state.attempts} due to result condition")
 
             except Exception as e:
+                if execution_time is None:
+                    # NOTE: Failed attempts are timed too, so that after hooks see
+                    # the duration of every attempt, timeouts included.
+                    state.statistics.execution_times.append(time.time() - start_time)
                 state.last_exception = e
                 state.last_result = None
 
@@ -1040,8 +1046,9 @@ class Retry(Generic[R, E]):
             state_for_hooks = cast(RetryState[object, Exception], state)
             self.policy.execute_before_hooks(state_for_hooks, *args, **kwargs)
 
+            execution_time: float | None = None
+            start_time = time.time()
             try:
-                start_time = time.time()
                 result = await fn(*args, **kwargs)
                 execution_time = time.time() - start_time
 
@@ -1060,6 +1067,10 @@ class Retry(Generic[R, E]):
                 self.policy.logger.debug(f"Retrying after attempt {state.attempts} due to result condition")
 
             except Exception as e:
+                if execution_time is None:
+                    # NOTE: Failed attempts are timed too, so that after hooks see
+                    # the duration of every attempt, timeouts included.
+                    state.statistics.execution_times.append(time.time() - start_time)
                 state.last_exception = e
                 state.last_result = None
 
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments.types import StorageKey
+
+
+class CoreOnlyStorage:
+    """Backend implementing only the core StorageBackend methods."""
+
+    def __init__(self) -> None:
+        self.data: dict[StorageKey, bytes] = {}
+
+    def save(self, key: StorageKey, path: Path) -> None:
+        self.data[key] = path.read_bytes()
+
+    def load(self, key: StorageKey, path: Path) -> None:
+        path.write_bytes(self.data[key])
+
+    def exists(self, key: StorageKey) -> bool:
+        return key in self.data
+
+    def delete(self, key: StorageKey) -> None:
+        self.data.pop(key, None)
+
+    def list(self, prefix: StorageKey) -> list[StorageKey]:
+        return sorted(key for key in self.data if key.startswith(prefix))
+
+
+@pytest.fixture
+def core_only_storage() -> CoreOnlyStorage:
+    return CoreOnlyStorage()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments import content_store
+from frostbound.experiments.constants import IngestMode
+from frostbound.experiments.content_store import ContentAddressedStorage
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> Iterator[ContentAddressedStorage]:
+    with ContentAddressedStorage(tmp_path / "cas") as storage:
+        yield storage
+
+
+@pytest.fixture
+def chunked(tmp_path: Path) -> Iterator[ContentAddressedStorage]:
+    with ContentAddressedStorage(tmp_path / "cas", chunk_size=4) as storage:
+        yield storage
+
+
+def _blob_files(storage: ContentAddressedStorage) -> list[Path]:
+    return [path for path in (storage.base_dir / "blobs").rglob("*") if path.is_file()]
+
+
+def test_identical_content_is_stored_once(storage: ContentAddressedStorage, tmp_path: Path) -> None:
+    source = tmp_path / "model.bin"
+    source.write_bytes(b"weights")
+    assert storage.ingest("a/model.bin", source) is not IngestMode.DEDUPLICATED
+    assert storage.ingest("b/model.bin", source) is IngestMode.DEDUPLICATED
+    storage.put_bytes("c/model.bin", b"weights")
+
+    assert storage.stats() == {"keys": 3, "objects": 1, "blobs": 1, "logical_bytes": 21, "stored_bytes": 7}
+    assert storage.checksum("a/model.bin") == f"sha256:{hashlib.sha256(b'weights').hexdigest()}"
+    assert storage.list("b") == ["b/model.bin"]
+
+
+def test_blobs_are_deleted_with_their_last_key(storage: ContentAddressedStorage) -> None:
+    storage.put_bytes("a", b"content")
+    storage.put_bytes("b", b"content")
+    storage.delete("a")
+    assert storage.get_bytes("b") == b"content"
+    storage.put_bytes("b", b"other")
+    assert storage.stats()["blobs"] == 1
+    assert [path.read_bytes() for path in _blob_files(storage)] == [b"other"]
+    with pytest.raises(FileNotFoundError):
+        storage.checksum("a")
+
+
+def test_chunks_are_shared_between_keys(chunked: ContentAddressedStorage) -> None:
+    chunked.put_bytes("a", b"aaaabbbbcccc")
+    chunked.put_bytes("b", b"aaaaXXXXcccc")
+    stats = chunked.stats()
+    assert stats["objects"] == 2
+    assert stats["blobs"] == 4
+    assert stats["stored_bytes"] == 16
+    with chunked.open_read("b") as file:
+        assert file.read(6) == b"aaaaXX"
+        assert file.read() == b"XXcccc"
+
+    chunked.delete("a")
+    assert chunked.stats()["blobs"] == 3
+    assert chunked.get_bytes("b") == b"aaaaXXXXcccc"
+
+
+def test_chunk_deleted_while_writing_is_restored(tmp_path: Path) -> None:
+    with (
+        ContentAddressedStorage(tmp_path / "cas", chunk_size=4) as writer,
+        ContentAddressedStorage(tmp_path / "cas", chunk_size=4) as deleter,
+    ):
+        writer.put_bytes("a", b"aaaabbbb")
+        with writer.open_write("b") as file:
+            file.write(b"aaaacccc")
+            file.flush()
+            deleter.delete("a")
+        assert writer.get_bytes("b") == b"aaaacccc"
+        assert writer.stats()["blobs"] == 2
+
+
+def test_source_changed_while_ingesting_stores_copied_content(
+    storage: ContentAddressedStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "model.bin"
+    source.write_bytes(b"before")
+
+    def ingest_changed(_path: Path, destination: Path, _modes: object) -> IngestMode:
+        destination.write_bytes(b"after")
+        return IngestMode.COPY
+
+    monkeypatch.setattr(content_store, "ingest_file", ingest_changed)
+    storage.ingest("model.bin", source)
+    assert storage.get_bytes("model.bin") == b"after"
+    assert storage.checksum("model.bin") == f"sha256:{hashlib.sha256(b'after').hexdigest()}"
+
+
+def test_invalid_chunk_size_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ContentAddressedStorage(tmp_path, chunk_size=0)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from frostbound.experiments.durability import AtomicFile, GroupCommitter, is_temp_path
+
+
+def _replace(temp: Path, target: Path) -> None:
+    os.replace(temp, target)
+
+
+def test_atomic_file_replaces_target_on_close(tmp_path: Path) -> None:
+    target = tmp_path / "nested" / "file.bin"
+    with AtomicFile(target, _replace, fsync=True) as file:
+        file.write(b"content")
+        assert is_temp_path(file.temp_path)
+        assert not target.exists()
+    assert target.read_bytes() == b"content"
+    assert list(target.parent.iterdir()) == [target]
+
+
+def test_atomic_file_discard_keeps_target(tmp_path: Path) -> None:
+    target = tmp_path / "file.bin"
+    target.write_bytes(b"old")
+    file = AtomicFile(target, _replace)
+    file.write(b"new")
+    file.discard()
+    assert target.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_group_commit_batches_and_supersedes_writes(tmp_path: Path) -> None:
+    committer = GroupCommitter(interval_seconds=60.0)
+    target = tmp_path / "file.bin"
+    for content in (b"first", b"second"):
+        with AtomicFile(target, committer.submit) as file:
+            file.write(content)
+    assert committer.is_pending(target)
+    with committer.open(target) as file:
+        assert file.read() == b"second"
+
+    committer.sync()
+    assert target.read_bytes() == b"second"
+    assert list(tmp_path.iterdir()) == [target]
+    committer.close()
+    with pytest.raises(RuntimeError):
+        committer.submit(tmp_path / "temp", target)
+
+
+def test_group_commit_fsyncs_each_file_and_directory_once(tmp_path: Path) -> None:
+    committer = GroupCommitter(interval_seconds=60.0)
+    targets = [tmp_path / f"file{index}" for index in range(3)]
+    for target in targets:
+        with AtomicFile(target, committer.submit) as file:
+            file.write(b"content")
+    with (
+        mock.patch("frostbound.experiments.durability.fsync_path") as fsync_path,
+        mock.patch("frostbound.experiments.durability.fsync_directory") as fsync_directory,
+    ):
+        committer.sync()
+    assert fsync_path.call_count == 3
+    fsync_directory.assert_called_once_with(tmp_path)
+    committer.close()
+
+
+def test_failed_commit_is_raised_by_sync(tmp_path: Path) -> None:
+    committer = GroupCommitter(interval_seconds=60.0)
+    with AtomicFile(tmp_path / "file.bin", committer.submit) as file:
+        file.write(b"content")
+    with mock.patch("os.replace", side_effect=OSError("read-only")), pytest.raises(OSError, match="read-only"):
+        committer.sync()
+    assert list(tmp_path.iterdir()) == []
+    committer.close()
+
+
+def test_sync_returns_after_the_pending_write_was_discarded(tmp_path: Path) -> None:
+    committer = GroupCommitter(interval_seconds=60.0)
+    target = tmp_path / "file.bin"
+    with AtomicFile(target, committer.submit) as file:
+        file.write(b"content")
+    committer.discard(target)
+    synced = threading.Thread(target=committer.sync, daemon=True)
+    synced.start()
+    synced.join(5.0)
+    assert not synced.is_alive()
+    assert list(tmp_path.iterdir()) == []
+    committer.close()
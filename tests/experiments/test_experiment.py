@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments import experiment as experiment_module
+from frostbound.experiments.experiment import Experiment
+from frostbound.experiments.metric_log import MetricLogReader
+from frostbound.experiments.models import FileWriteOptions
+from frostbound.experiments.storage import InMemoryStorage, LocalFileStorage
+from frostbound.experiments.writer import BackgroundWriter
+
+from .conftest import CoreOnlyStorage
+
+
+def test_save_text_honours_encoding_options() -> None:
+    storage = InMemoryStorage()
+    experiment = Experiment("run", storage)
+    options = FileWriteOptions(encoding="ascii", newline="\r\n", extra_kwargs={"errors": "replace"})
+    key = experiment.save_text("héllo\nworld", "notes.txt", file_options=options)
+    assert storage.get_bytes(key) == b"h?llo\r\nworld"
+
+
+def test_exclusive_mode_refuses_to_overwrite() -> None:
+    experiment = Experiment("run", InMemoryStorage())
+    experiment.save_text("first", "notes.txt", file_options=FileWriteOptions(mode="x"))
+    with pytest.raises(FileExistsError):
+        experiment.save_dict({"a": 1}, "notes.txt", file_options=FileWriteOptions(mode="x"))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [FileWriteOptions(mode="a"), FileWriteOptions(mode="wb"), FileWriteOptions(extra_kwargs={"closefd": False})],
+)
+def test_unsupported_file_options_are_rejected(options: FileWriteOptions) -> None:
+    with pytest.raises(ValueError):
+        Experiment("run", InMemoryStorage()).save_text("text", "notes.txt", file_options=options)
+
+
+def test_core_only_backend_stores_everything(core_only_storage: CoreOnlyStorage) -> None:
+    backend = core_only_storage
+    experiment = Experiment("run", backend)
+    experiment.record_metric("loss", 0.5)
+    experiment.save_dict({"lr": 0.1}, "config.json")
+    experiment.complete()
+    assert json.loads(backend.data["run/config.json"]) == {"lr": 0.1}
+    assert "run/metrics/series.bin" in backend.data
+
+
+def test_metric_history_is_written_on_complete() -> None:
+    storage = InMemoryStorage()
+    with BackgroundWriter() as writer:
+        experiment = Experiment("run", storage, writer=writer)
+        for step, value in enumerate([0.9, 0.5, 0.3]):
+            experiment.record_metric("loss", value, step=step * 10)
+        experiment.flush()
+        assert not storage.exists("run/metrics/series.bin")
+        experiment.complete()
+    assert storage.get_bytes("run/metrics/loss.txt") == b"0.3"
+    with MetricLogReader(storage.get_bytes("run/metrics/series.bin")) as log:
+        assert list(log.series("loss", start_step=10).values) == [0.5, 0.3]
+
+
+def test_metric_history_is_appended_on_flush(tmp_path: Path) -> None:
+    path = tmp_path / "run/metrics/series.bin"
+    experiment = Experiment("run", LocalFileStorage(tmp_path))
+    experiment.record_metric("loss", 0.9)
+    experiment.record_metric("loss", 0.5)
+    experiment.flush()
+    with MetricLogReader.open(path) as log:
+        assert list(log.series("loss").values) == [0.9, 0.5]
+    experiment.record_metric("loss", 0.3)
+    experiment.record_metric("accuracy", 0.7)
+    experiment.complete()
+    with MetricLogReader.open(path) as log:
+        assert [len(block) for block in log.blocks("loss")] == [2, 1]
+        assert list(log.series("loss").values) == [0.9, 0.5, 0.3]
+        assert list(log.series("accuracy").values) == [0.7]
+
+
+def test_metric_history_is_appended_every_few_points(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(experiment_module, "_SERIES_APPEND_POINTS", 2)
+    path = tmp_path / "run/metrics/series.bin"
+    storage = LocalFileStorage(tmp_path, durability="group_commit")
+    experiment = Experiment("run", storage)
+    for step in range(5):
+        experiment.record_metric("loss", step / 10)
+    with MetricLogReader.open(path) as log:
+        assert list(log.series("loss").steps) == [0, 1, 2, 3]
+    storage.close()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from frostbound.experiments.constants import IngestMode
+from frostbound.experiments.ingest import ingest_file
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    path = tmp_path / "source.bin"
+    path.write_bytes(os.urandom(100_000))
+    return path
+
+
+def test_first_working_mode_is_used(source: Path, tmp_path: Path) -> None:
+    destination = tmp_path / "destination.bin"
+    mode = ingest_file(source, destination)
+    assert mode in (IngestMode.REFLINK, IngestMode.COPY_FILE_RANGE, IngestMode.COPY)
+    assert destination.read_bytes() == source.read_bytes()
+
+
+def test_hardlink_shares_the_file(source: Path, tmp_path: Path) -> None:
+    destination = tmp_path / "destination.bin"
+    destination.write_bytes(b"old")
+    assert ingest_file(source, destination, [IngestMode.HARDLINK]) is IngestMode.HARDLINK
+    assert os.path.samefile(source, destination)
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range() is not available")
+def test_copy_file_range_copying_nothing_falls_back(source: Path, tmp_path: Path) -> None:
+    destination = tmp_path / "destination.bin"
+    with mock.patch("os.copy_file_range", return_value=0):
+        mode = ingest_file(source, destination, [IngestMode.COPY_FILE_RANGE, IngestMode.COPY])
+    assert mode is IngestMode.COPY
+    assert destination.read_bytes() == source.read_bytes()
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range() is not available")
+def test_copy_file_range_truncated_copy_raises(source: Path, tmp_path: Path) -> None:
+    with mock.patch("os.copy_file_range", side_effect=[1_000, 0]), pytest.raises(OSError, match="truncated"):
+        ingest_file(source, tmp_path / "destination.bin", [IngestMode.COPY_FILE_RANGE, IngestMode.COPY])
+
+
+def test_no_supported_mode_raises(source: Path, tmp_path: Path) -> None:
+    with mock.patch("os.link", side_effect=OSError("unsupported")), pytest.raises(OSError, match="None of"):
+        ingest_file(source, tmp_path / "destination.bin", [IngestMode.HARDLINK])
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments.metric_log import MetricLogReader, MetricLogWriter
+from frostbound.experiments.series import MetricSeries
+
+
+def _write(path: Path, key: str, steps: list[int], append: bool = False) -> None:
+    with MetricLogWriter(path.open("r+b") if append else path.open("wb")) as log:
+        log.append(key, steps=steps, timestamps=[float(step) for step in steps], values=[step / 10 for step in steps])
+
+
+def test_round_trip_and_step_ranges(tmp_path: Path) -> None:
+    path = tmp_path / "series.bin"
+    series = MetricSeries("loss")
+    for step in range(100):
+        series.append(step / 100, step, 1_000.0 + step)
+    with MetricLogWriter(path.open("wb")) as log:
+        log.append_series(series)
+        log.append("accuracy", steps=[0], timestamps=[0.0], values=[0.5])
+
+    with MetricLogReader.open(path) as log:
+        assert log.keys() == ["accuracy", "loss"]
+        assert log.count("loss") == 100
+        selected = log.series("loss", start_step=10, stop_step=13)
+        assert list(selected.steps) == [10, 11, 12]
+        assert list(selected.values) == [0.1, 0.11, 0.12]
+        with pytest.raises(KeyError):
+            log.count("missing")
+
+
+def test_append_adds_blocks(tmp_path: Path) -> None:
+    path = tmp_path / "series.bin"
+    _write(path, "loss", [0, 1])
+    _write(path, "loss", [2, 3], append=True)
+    with MetricLogReader.open(path) as log:
+        assert [len(block) for block in log.blocks("loss")] == [2, 2]
+        assert list(log.series("loss").steps) == [0, 1, 2, 3]
+
+
+def test_torn_append_loses_only_new_points(tmp_path: Path) -> None:
+    path = tmp_path / "series.bin"
+    _write(path, "loss", [0, 1])
+    file = path.open("r+b")
+    writer = MetricLogWriter(file)
+    writer.append("loss", steps=[2], timestamps=[2.0], values=[0.2])
+    file.close()
+
+    with MetricLogReader(path.read_bytes()) as log:
+        assert list(log.series("loss").steps) == [0, 1]
+    _write(path, "loss", [5], append=True)
+    with MetricLogReader.open(path) as log:
+        assert list(log.series("loss").steps) == [0, 1, 5]
+
+
+def test_incomplete_log_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        MetricLogReader(b"FBML" + bytes(100))
+
+
+def test_mismatched_columns_are_rejected(tmp_path: Path) -> None:
+    with MetricLogWriter((tmp_path / "series.bin").open("wb")) as log, pytest.raises(ValueError):
+        log.append("loss", steps=[0, 1], timestamps=[0.0], values=[0.0])
+
+
+def test_to_numpy_returns_columns(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    path = tmp_path / "series.bin"
+    _write(path, "loss", [0, 1, 2])
+    _write(path, "loss", [3], append=True)
+    with MetricLogReader.open(path) as log:
+        columns = log.to_numpy("loss", start_step=1)
+        assert columns["steps"].tolist() == [1, 2, 3]
+        assert columns["values"].tolist() == [0.1, 0.2, 0.3]
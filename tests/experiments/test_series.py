@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+from frostbound.experiments.experiment import Experiment
+from frostbound.experiments.series import MetricSeries
+from frostbound.experiments.storage import InMemoryStorage
+
+
+def test_series_round_trips_through_dict() -> None:
+    series = MetricSeries("loss")
+    series.append(0.9, step=0, timestamp=1.0)
+    series.append(0.7, step=5, timestamp=2.0)
+    assert (len(series), series.last_step, series.nbytes) == (2, 5, 48)
+    restored = MetricSeries.from_dict("loss", series.to_dict())
+    assert restored.to_dict() == {"steps": [0, 5], "timestamps": [1.0, 2.0], "values": [0.9, 0.7]}
+    with pytest.raises(ValueError):
+        MetricSeries.from_dict("loss", {"steps": [0], "timestamps": [], "values": [1.0]})
+
+
+def test_record_metric_keeps_the_history() -> None:
+    experiment = Experiment("run", InMemoryStorage())
+    experiment.record_metric("loss", 0.9)
+    experiment.record_metric("loss", 0.5)
+    experiment.record_metric("loss", 0.3, step=10, timestamp=123.0)
+    series = experiment.metric_series("loss")
+    assert (list(series.steps), list(series.values)) == ([0, 1, 10], [0.9, 0.5, 0.3])
+    assert series.timestamps[-1] == 123.0
+    assert experiment.metrics["loss"] == 0.3
+    series.append(0.1, step=11, timestamp=124.0)
+    assert len(experiment.metric_series("loss")) == 3
+    with pytest.raises(KeyError):
+        experiment.metric_series("accuracy")
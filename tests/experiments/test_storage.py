@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments.constants import Durability, IngestMode
+from frostbound.experiments.durability import is_temp_path
+from frostbound.experiments.protocols import ExtendedStorageBackend, SeekableStorageBackend
+from frostbound.experiments.storage import InMemoryStorage, LegacyStorageAdapter, LocalFileStorage, extend_storage
+
+from .conftest import CoreOnlyStorage
+
+
+@pytest.fixture(params=list(Durability))
+def local_storage(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[LocalFileStorage]:
+    storage = LocalFileStorage(tmp_path / "store", durability=request.param, commit_interval_seconds=60.0)
+    yield storage
+    storage.close()
+
+
+def _temp_files(directory: Path) -> list[Path]:
+    return [path for path in directory.rglob("*") if is_temp_path(path)]
+
+
+def test_local_storage_round_trip(local_storage: LocalFileStorage, tmp_path: Path) -> None:
+    local_storage.put_bytes("run/metrics/loss.txt", b"0.5")
+    assert local_storage.exists("run/metrics/loss.txt")
+    assert local_storage.get_bytes("run/metrics/loss.txt") == b"0.5"
+    assert local_storage.list("run") == ["run/metrics/loss.txt"]
+
+    source = tmp_path / "model.bin"
+    source.write_bytes(b"weights")
+    assert local_storage.ingest("run/artifacts/model.bin", source) in IngestMode
+    local_storage.load("run/artifacts/model.bin", tmp_path / "loaded.bin")
+    assert (tmp_path / "loaded.bin").read_bytes() == b"weights"
+
+    local_storage.delete("run/metrics/loss.txt")
+    assert not local_storage.exists("run/metrics/loss.txt")
+    local_storage.sync()
+    assert local_storage.list("") == ["run/artifacts/model.bin"]
+    assert _temp_files(local_storage.base_dir) == []
+
+
+def test_group_commit_reads_its_own_writes_before_committing(tmp_path: Path) -> None:
+    with_committer = LocalFileStorage(tmp_path, durability="group_commit", commit_interval_seconds=60.0)
+    with_committer.put_bytes("key", b"pending")
+    assert not (tmp_path / "key").exists()
+    assert with_committer.get_bytes("key") == b"pending"
+    assert with_committer.list("") == ["key"]
+    with_committer.sync()
+    assert (tmp_path / "key").read_bytes() == b"pending"
+    with_committer.close()
+
+
+def test_sync_after_deleting_a_pending_write_returns(tmp_path: Path) -> None:
+    storage = LocalFileStorage(tmp_path, durability="group_commit", commit_interval_seconds=60.0)
+    storage.put_bytes("key", b"pending")
+    storage.delete("key")
+    storage.sync()
+    assert not storage.exists("key")
+    storage.close()
+
+
+def test_discarded_write_keeps_previous_content(tmp_path: Path) -> None:
+    storage = LocalFileStorage(tmp_path)
+    storage.put_bytes("key", b"old")
+    with pytest.raises(RuntimeError), storage.open_write("key") as file:
+        file.write(b"new")
+        raise RuntimeError("interrupted")
+    assert storage.get_bytes("key") == b"old"
+    assert _temp_files(tmp_path) == []
+
+
+def test_missing_key_raises_file_not_found(tmp_path: Path) -> None:
+    for storage in (LocalFileStorage(tmp_path), InMemoryStorage()):
+        with pytest.raises(FileNotFoundError):
+            storage.get_bytes("missing")
+
+
+def test_extend_storage_wraps_core_only_backends(core_only_storage: CoreOnlyStorage) -> None:
+    memory = InMemoryStorage()
+    assert extend_storage(memory) is memory
+    adapter = extend_storage(core_only_storage)
+    assert isinstance(adapter, LegacyStorageAdapter)
+    assert isinstance(adapter, ExtendedStorageBackend)
+
+
+def test_legacy_adapter_falls_back_to_core_methods(
+    core_only_storage: CoreOnlyStorage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    temp_dir = tmp_path / "tmp"
+    temp_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+    backend = core_only_storage
+    adapter = LegacyStorageAdapter(backend)
+
+    adapter.put_bytes("a", b"bytes")
+    with adapter.open_write("b") as file:
+        file.write(b"stream")
+    source = tmp_path / "c"
+    source.write_bytes(b"file")
+    assert adapter.ingest("c", source) is IngestMode.COPY
+
+    assert backend.data == {"a": b"bytes", "b": b"stream", "c": b"file"}
+    assert adapter.get_bytes("b") == b"stream"
+    with adapter.open_read("a") as file:
+        assert file.read() == b"bytes"
+    assert adapter.checksum("a") is None
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_open_append_updates_the_file_in_place(tmp_path: Path) -> None:
+    storage = LocalFileStorage(tmp_path, durability="fsync")
+    with storage.open_append("run/log") as file:
+        file.write(b"head")
+    with storage.open_append("run/log") as file:
+        assert file.read() == b"head"
+        file.write(b"tail")
+    assert storage.get_bytes("run/log") == b"headtail"
+    assert isinstance(storage, SeekableStorageBackend)
+    assert not isinstance(InMemoryStorage(), SeekableStorageBackend)
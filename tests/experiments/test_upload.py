@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from frostbound.experiments.upload import ArtifactProgress, ArtifactUploadError, save_in_parallel, scan_files
+
+
+def _files(count: int) -> list[tuple[Path, str, int]]:
+    return [(Path(f"file{index}"), f"key{index}", index) for index in range(count)]
+
+
+def test_results_and_errors_are_collected() -> None:
+    def save(_source_file: Path, _storage_key: str, size_bytes: int) -> int:
+        if size_bytes == 3:
+            raise OSError("disk full")
+        return size_bytes
+
+    results, errors = save_in_parallel(_files(6), save, max_workers=3)
+    assert results == {f"key{index}": index for index in (0, 1, 2, 4, 5)}
+    assert list(errors) == [Path("file3")]
+    assert isinstance(errors[Path("file3")], OSError)
+
+
+def test_progress_is_reported_for_every_file() -> None:
+    reports: list[ArtifactProgress] = []
+    save_in_parallel(_files(5), lambda *_: None, max_workers=2, on_progress=reports.append)
+    assert sorted(report.completed for report in reports) == [1, 2, 3, 4, 5]
+    assert max(report.bytes_completed for report in reports) == 10
+    assert all(report.failed == 0 and report.error is None for report in reports)
+    assert all(report.total in (None, 5) for report in reports)
+
+
+def test_interrupt_from_save_is_raised_after_other_files() -> None:
+    saved: list[str] = []
+
+    def save(_source_file: Path, storage_key: str, size_bytes: int) -> None:
+        if size_bytes == 0:
+            raise KeyboardInterrupt
+        saved.append(storage_key)
+
+    with pytest.raises(KeyboardInterrupt):
+        save_in_parallel(_files(4), save, max_workers=1)
+    assert saved == ["key1", "key2", "key3"]
+
+
+def test_exit_from_progress_callback_is_raised() -> None:
+    def on_progress(_progress: ArtifactProgress) -> None:
+        raise SystemExit(2)
+
+    with pytest.raises(SystemExit):
+        save_in_parallel(_files(2), lambda *_: None, on_progress=on_progress)
+
+
+def test_errors_in_progress_callback_are_ignored() -> None:
+    def on_progress(_progress: ArtifactProgress) -> None:
+        raise ValueError("bad callback")
+
+    results, errors = save_in_parallel(_files(2), lambda *_: True, on_progress=on_progress)
+    assert results == {"key0": True, "key1": True}
+    assert errors == {}
+
+
+def test_scan_files_skips_directory_links_and_records_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "sub" / "locked").mkdir(parents=True)
+    (tmp_path / "a.txt").write_bytes(b"abc")
+    (tmp_path / "sub" / "b.txt").write_bytes(b"b")
+    (tmp_path / "link.txt").symlink_to(tmp_path / "a.txt")
+    (tmp_path / "sub_link").symlink_to(tmp_path / "sub", target_is_directory=True)
+
+    scandir = os.scandir
+
+    def failing_scandir(path: Path) -> object:
+        if Path(path).name == "locked":
+            raise PermissionError("denied")
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", failing_scandir)
+    errors: dict[Path, BaseException] = {}
+    files = dict(scan_files(tmp_path, errors))
+    assert files == {tmp_path / "a.txt": 3, tmp_path / "link.txt": 3, tmp_path / "sub" / "b.txt": 1}
+    assert list(errors) == [tmp_path / "sub" / "locked"]
+
+
+def test_upload_error_message_names_first_failure() -> None:
+    error = ArtifactUploadError({Path("b"): OSError("full"), Path("a"): ValueError("bad")}, ["run/artifacts/c"])
+    assert list(error.errors) == [Path("a"), Path("b")]
+    assert str(error) == "Failed to save 2 of 3 files, first 'a': ValueError: bad"
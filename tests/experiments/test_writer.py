@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import functools
+import gc
+import threading
+import weakref
+from unittest import mock
+
+import pytest
+
+from frostbound.experiments.writer import BackgroundWriter, _WriteQueue
+
+
+def test_queued_write_is_replaced_by_later_one() -> None:
+    written: list[int] = []
+    with BackgroundWriter(flush_interval_seconds=60.0) as writer:
+        for value in range(100):
+            writer.submit("loss", functools.partial(written.append, value))
+        writer.flush()
+    assert written == [99]
+
+
+def test_full_batch_is_written_without_waiting() -> None:
+    done = threading.Event()
+    with BackgroundWriter(max_batch=2, flush_interval_seconds=60.0) as writer:
+        writer.submit("a", lambda: None)
+        writer.submit("b", done.set)
+        assert done.wait(5.0)
+
+
+def test_flush_raises_first_write_error_once() -> None:
+    def fail() -> None:
+        raise OSError("disk full")
+
+    with BackgroundWriter() as writer:
+        writer.submit("a", fail)
+        with pytest.raises(OSError, match="disk full"):
+            writer.flush()
+        writer.flush()
+
+
+def test_write_raising_base_exception_does_not_stop_the_writer() -> None:
+    def exit_() -> None:
+        raise SystemExit(1)
+
+    written: list[str] = []
+    with BackgroundWriter() as writer:
+        writer.submit("a", exit_)
+        with pytest.raises(SystemExit):
+            writer.flush()
+        writer.submit("b", lambda: written.append("b"))
+        writer.flush()
+    assert written == ["b"]
+
+
+def test_close_writes_everything_and_rejects_new_writes() -> None:
+    written: list[str] = []
+    writer = BackgroundWriter(flush_interval_seconds=60.0)
+    writer.submit("a", lambda: written.append("a"))
+    writer.close()
+    assert written == ["a"]
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit("b", lambda: None)
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_flush_and_submit_raise_once_the_thread_died() -> None:
+    with mock.patch.object(_WriteQueue, "_next_batch", side_effect=RuntimeError("broken")):
+        writer = BackgroundWriter(max_pending=1)
+        writer._queue._thread.join(5.0)
+    with pytest.raises(RuntimeError, match="stopped"):
+        writer.submit("a", lambda: None)
+    writer._queue._pending["a"] = lambda: None
+    with pytest.raises(RuntimeError, match="1 writes not written"):
+        writer.flush()
+    writer.close()
+
+
+def test_abandoned_writer_is_collected_and_flushed() -> None:
+    written: list[str] = []
+    writer = BackgroundWriter(flush_interval_seconds=60.0)
+    writer.submit("a", functools.partial(written.append, "a"))
+    thread = writer._queue._thread
+    reference = weakref.ref(writer)
+    del writer
+    gc.collect()
+    assert reference() is None
+    thread.join(5.0)
+    assert not thread.is_alive()
+    assert written == ["a"]
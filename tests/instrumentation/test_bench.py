@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+from pathlib import Path
+
+import pytest
+
+from frostbound.instrumentation.bench import BenchmarkResult, BenchmarkRunner, compare, load_results
+
+
+def _result(name: str, samples: list[float]) -> BenchmarkResult:
+    return BenchmarkResult.from_samples(name, loops=1, samples=samples)
+
+
+def test_statistics_reject_outliers() -> None:
+    result = _result("noisy", [1.0, 1.1, 0.9, 1.0, 1.05, 0.95, 50.0])
+    assert result.outliers == 1
+    assert 50.0 not in result.samples
+    assert result.median == pytest.approx(1.0)
+    assert result.ci_low <= result.median <= result.ci_high
+    with pytest.raises(ValueError):
+        _result("empty", [])
+
+
+def test_clearly_different_samples_are_significant() -> None:
+    baseline = _result("baseline", [1.0 + index / 100 for index in range(20)])
+    candidate = _result("candidate", [2.0 + index / 100 for index in range(20)])
+    comparison = compare(baseline, candidate)
+    assert comparison.significant
+    assert comparison.p_value < 0.001
+    assert comparison.ratio == pytest.approx(2.095 / 1.095)
+
+
+def test_identical_distributions_are_not_significant() -> None:
+    samples = [1.0 + (index % 5) / 100 for index in range(20)]
+    comparison = compare(_result("first", samples), _result("second", list(reversed(samples))))
+    assert not comparison.significant
+    assert comparison.ratio == pytest.approx(1.0)
+
+
+def test_runner_calibrates_and_restores_gc() -> None:
+    runner = BenchmarkRunner(repeats=5, warmup=1, target_sample_seconds=0.001)
+    result = runner.run(lambda: sum(range(100)), name="sum")
+    assert result.loops > 1
+    assert len(result.samples) + result.outliers == 5
+    assert runner.results == [result]
+    assert gc.isenabled()
+
+
+def test_run_async_works_inside_a_running_loop() -> None:
+    runner = BenchmarkRunner(repeats=3, warmup=0, target_sample_seconds=0.001)
+
+    async def noop() -> None:
+        await asyncio.sleep(0)
+
+    async def main() -> BenchmarkResult:
+        return runner.run_async(noop)
+
+    assert asyncio.run(main()).name == "noop"
+
+
+def test_results_round_trip_through_json(tmp_path: Path) -> None:
+    runner = BenchmarkRunner(repeats=3, warmup=0)
+    first = runner.run(lambda: None, name="first", loops=10)
+    second = runner.run(lambda: None, name="second", loops=10)
+    runner.compare(first, second)
+    path = tmp_path / "bench.json"
+    runner.write_json(path)
+    assert load_results(path) == {"first": first, "second": second}
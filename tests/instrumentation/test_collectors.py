@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+
+from frostbound.instrumentation.collectors import (
+    Collector,
+    CPUTimeCollector,
+    RSSCollector,
+    TracemallocCollector,
+    default_collectors,
+    start_collectors,
+    stop_collectors,
+)
+from frostbound.instrumentation.histogram import HistogramRegistry
+from frostbound.instrumentation.timer import Timer
+
+
+class _BrokenCollector:
+    def start(self) -> Any:
+        raise RuntimeError("unavailable")
+
+    def stop(self, _state: Any) -> dict[str, int]:
+        raise AssertionError("stop() called after a failed start()")
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_cpu_time_collector_measures_busy_block() -> None:
+    timer: Timer[None] = Timer(name="spin", collectors=[CPUTimeCollector()])
+    with timer:
+        _spin(0.02)
+    assert timer.metrics["cpu_thread_ns"] > 10_000_000
+    assert timer.metrics["cpu_process_ns"] >= timer.metrics["cpu_thread_ns"] // 2
+
+
+def test_tracemalloc_collector_stops_tracing_it_started() -> None:
+    assert not tracemalloc.is_tracing()
+    timer: Timer[None] = Timer(collectors=[TracemallocCollector()])
+    with timer:
+        data = [bytearray(1_000) for _ in range(100)]
+    assert timer.metrics["tracemalloc_peak_bytes"] >= 100_000
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_collectors_are_stopped_when_the_timed_function_raises() -> None:
+    timer: Timer[None] = Timer(collectors=[TracemallocCollector()])
+
+    @timer
+    def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fail()
+    assert not tracemalloc.is_tracing()
+
+
+def test_failing_collector_is_skipped() -> None:
+    collectors: list[Collector] = [_BrokenCollector(), CPUTimeCollector()]
+    metrics = stop_collectors(collectors, start_collectors(collectors))
+    assert set(metrics) == {"cpu_process_ns", "cpu_thread_ns"}
+
+
+def test_metrics_are_recorded_into_histograms() -> None:
+    registry = HistogramRegistry()
+    with Timer(name="block", registry=registry, collectors=default_collectors()):
+        _spin(0.001)
+    assert "block" in registry.names()
+    assert "block.cpu_thread_ns" in registry.names()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="RSS is only read on Linux")
+def test_rss_collectors_do_not_hold_file_descriptors() -> None:
+    RSSCollector().rss_bytes()
+    open_fds = len(os.listdir("/proc/self/fd"))
+    for _ in range(100):
+        with Timer(collectors=default_collectors()):
+            pass
+    assert len(os.listdir("/proc/self/fd")) == open_fds
+    assert (RSSCollector().rss_bytes() or 0) > 0
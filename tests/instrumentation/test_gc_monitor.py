@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import gc
+import time
+
+from frostbound.instrumentation.gc_monitor import GCMonitor, GCPause
+from frostbound.instrumentation.histogram import HistogramRegistry
+from frostbound.instrumentation.timer import Timer
+from frostbound.instrumentation.tracing import Tracer
+
+
+def test_collections_are_recorded_per_generation() -> None:
+    registry = HistogramRegistry()
+    pauses: list[GCPause] = []
+    with GCMonitor(registry=registry, on_pause=pauses.append) as monitor:
+        gc.collect(0)
+        gc.collect(2)
+    assert monitor.collections[0] >= 1
+    assert monitor.collections[2] >= 1
+    assert {pause.generation for pause in pauses} >= {0, 2}
+    assert registry.snapshot()["gc.gen2"].count == monitor.collections[2]
+    assert not monitor.running
+
+
+def test_overlapping_returns_pauses_within_interval() -> None:
+    with GCMonitor(registry=HistogramRegistry()) as monitor:
+        start_ns = time.perf_counter_ns()
+        gc.collect()
+        end_ns = time.perf_counter_ns()
+    assert monitor.overlapping(start_ns, end_ns)
+    assert monitor.overlapping(end_ns, end_ns + 1) == []
+
+
+def test_collector_tags_timer_metrics() -> None:
+    with GCMonitor(registry=HistogramRegistry()) as monitor:
+        timer: Timer[None] = Timer(collectors=[monitor.collector()])
+        with timer:
+            gc.collect(2)
+    assert timer.metrics["gc_gen2_collections"] >= 1
+    assert timer.metrics["gc_pause_ns"] > 0
+
+
+def test_spans_are_tagged_only_while_running() -> None:
+    monitor = GCMonitor(registry=HistogramRegistry())
+    with Tracer() as tracer:
+        with monitor, tracer.span("tagged"):
+            gc.collect()
+        with tracer.span("untagged"):
+            gc.collect()
+    metrics = {node.name: node.metrics for node in tracer.call_tree()}
+    assert metrics["tagged"]["gc_collections"] >= 1
+    assert metrics["untagged"] == {}
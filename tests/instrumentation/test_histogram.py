@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from frostbound.instrumentation.histogram import HistogramRegistry, LogHistogram
+from frostbound.instrumentation.sampling import Sampler
+from frostbound.instrumentation.timer import Timer, timed
+
+
+def test_percentiles_are_within_bucket_resolution() -> None:
+    histogram = LogHistogram()
+    histogram.record_many(range(1, 10_001))
+    snapshot = histogram.snapshot()
+    assert snapshot.count == 10_000
+    assert snapshot.sum == sum(range(1, 10_001))
+    assert (snapshot.min, snapshot.max) == (1, 10_000)
+    assert snapshot.p50 == pytest.approx(5_000, rel=0.01)
+    assert snapshot.p99 == pytest.approx(9_900, rel=0.01)
+
+
+def test_weighted_record_and_reset() -> None:
+    histogram = LogHistogram()
+    histogram.record(1_000, count=100)
+    assert histogram.snapshot(reset=True).count == 100
+    assert histogram.count == 0
+
+
+def test_merge() -> None:
+    first, second = LogHistogram(), LogHistogram()
+    first.record(10)
+    second.record_many([20, 30])
+    first.merge(second)
+    assert first.snapshot().count == 3
+    with pytest.raises(ValueError):
+        first.merge(LogHistogram(sub_bucket_bits=3))
+
+
+def test_timed_keeps_results_and_records_durations() -> None:
+    registry = HistogramRegistry()
+
+    @timed(name="parse", registry=registry)
+    def parse(text: str) -> int:
+        return int(text)
+
+    @timed(name="fetch", registry=registry)
+    async def fetch() -> str:
+        return "ok"
+
+    assert [parse("1"), parse("2")] == [1, 2]
+    assert asyncio.run(fetch()) == "ok"
+    snapshot = registry.snapshot()
+    assert (snapshot["parse"].count, snapshot["fetch"].count) == (2, 1)
+
+
+def test_sampler_every_nth_call_extrapolates() -> None:
+    sampler = Sampler(every=10)
+    weights = [sampler.tick() for _ in range(100)]
+    assert sum(1 for weight in weights if weight) == 10
+    assert sum(weights) == 100
+
+
+def test_sampler_probability_is_seedable() -> None:
+    def weights() -> list[int]:
+        sampler = Sampler(probability=0.1, seed=7)
+        return [sampler.tick() for _ in range(1_000)]
+
+    first = weights()
+    assert first == weights()
+    assert 50 < sum(1 for weight in first if weight) < 150
+
+
+@pytest.mark.parametrize(("every", "probability"), [(0, None), (None, 0.0), (None, 1.5)])
+def test_sampler_rejects_invalid_rates(every: int | None, probability: float | None) -> None:
+    with pytest.raises(ValueError):
+        Sampler().configure(every=every, probability=probability)
+
+
+def test_configure_sampling_reaches_existing_timers() -> None:
+    registry = HistogramRegistry()
+    timer: Timer[None] = Timer(name="parse", registry=registry, sample_every=1_000)
+    registry.configure_sampling("parse", every=1)
+    with timer:
+        pass
+    assert registry.snapshot()["parse"].count == 1
+
+
+def test_clear_keeps_samplers() -> None:
+    registry = HistogramRegistry()
+    timer: Timer[None] = Timer(name="parse", registry=registry, sample_every=1_000)
+    registry.clear()
+    assert registry.names() == []
+    registry.configure_sampling("parse", every=1)
+    assert timer.sampler is registry.sampler("parse")
+    assert timer.sampler.every == 1
+
+
+def test_timed_function_records_weighted_samples() -> None:
+    registry = HistogramRegistry()
+
+    timer: Timer[int] = Timer(name="step", registry=registry, sample_every=5)
+
+    @timer
+    def step() -> int:
+        return 1
+
+    results = [step() for _ in range(20)]
+    assert all(result == 1 for result, _ in results)
+    assert registry.snapshot()["step"].count == 20
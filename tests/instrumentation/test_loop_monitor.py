@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from frostbound.instrumentation.histogram import HistogramRegistry
+from frostbound.instrumentation.loop_monitor import BlockingEvent, LoopMonitor
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.2)
+
+
+def test_blocking_call_is_reported_with_its_stack() -> None:
+    registry = HistogramRegistry()
+    reported: list[BlockingEvent] = []
+
+    async def main() -> LoopMonitor:
+        monitor = LoopMonitor(
+            registry=registry, interval_seconds=0.01, slow_threshold_seconds=0.05, on_blocking=reported.append
+        )
+        async with monitor:
+            await asyncio.sleep(0.03)
+            _block_the_loop()
+            await asyncio.sleep(0.05)
+        return monitor
+
+    monitor = asyncio.run(main())
+    events = monitor.blocking_events()
+    assert reported == events
+    assert len(events) == 1
+    assert events[0].duration_seconds >= 0.15
+    assert events[0].stack is not None and "_block_the_loop" in events[0].stack
+    snapshot = registry.snapshot()
+    assert snapshot["asyncio.loop_lag.blocked"].count == 1
+    assert snapshot["asyncio.loop_lag"].count > 1
+
+
+def test_idle_loop_reports_nothing() -> None:
+    registry = HistogramRegistry()
+
+    async def main() -> LoopMonitor:
+        async with LoopMonitor(registry=registry, interval_seconds=0.01, slow_threshold_seconds=0.1) as monitor:
+            await asyncio.sleep(0.1)
+        return monitor
+
+    assert asyncio.run(main()).blocking_events() == []
+    assert registry.snapshot()["asyncio.loop_lag.blocked"].count == 0
+
+
+def test_blocking_events_are_logged_without_callback(caplog: pytest.LogCaptureFixture) -> None:
+    async def main() -> None:
+        async with LoopMonitor(registry=HistogramRegistry(), interval_seconds=0.01, slow_threshold_seconds=0.05):
+            await asyncio.sleep(0.02)
+            _block_the_loop()
+            await asyncio.sleep(0.03)
+
+    with caplog.at_level("WARNING"):
+        asyncio.run(main())
+    assert any("Event loop blocked" in record.getMessage() for record in caplog.records)
+
+
+def test_start_requires_a_running_loop() -> None:
+    with pytest.raises(RuntimeError):
+        LoopMonitor().start()
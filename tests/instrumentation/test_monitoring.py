@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from frostbound.instrumentation.histogram import HistogramRegistry
+from frostbound.instrumentation.monitoring import CallMonitor
+
+pytestmark = pytest.mark.skipif(not hasattr(sys, "monitoring"), reason="sys.monitoring requires Python 3.12")
+
+
+def _factorial(n: int) -> int:
+    return 1 if n <= 1 else n * _factorial(n - 1)
+
+
+def _numbers() -> Iterator[int]:
+    yield from range(3)
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+def test_recursive_calls_are_counted_and_timed() -> None:
+    registry = HistogramRegistry()
+    name = f"{__name__}._factorial"
+    with CallMonitor(registry=registry).add_function(_factorial) as monitor:
+        assert _factorial(5) == 120
+        _factorial(3)
+    assert monitor.call_counts() == {name: 8}
+    assert registry.snapshot()[name].count == 8
+
+
+def test_generators_are_counted_but_not_timed() -> None:
+    registry = HistogramRegistry()
+    name = f"{__name__}._numbers"
+    with CallMonitor(registry=registry).add_function(_numbers) as monitor:
+        assert list(_numbers()) == [0, 1, 2]
+    # NOTE: PY_START fires on every resumption of the generator frame.
+    assert monitor.call_counts()[name] >= 1
+    assert name not in registry.names()
+
+
+def test_raising_calls_end_their_measurement() -> None:
+    registry = HistogramRegistry()
+    with CallMonitor(registry=registry).add_function(_fail).add_function(_factorial) as monitor:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                _fail()
+        _factorial(1)
+    assert monitor.call_counts() == {f"{__name__}._fail": 2, f"{__name__}._factorial": 1}
+
+
+def test_buffers_of_ended_threads_are_dropped() -> None:
+    monitor = CallMonitor(registry=HistogramRegistry()).add_function(_factorial)
+    with monitor:
+        for _ in range(5):
+            thread = threading.Thread(target=_factorial, args=(3,))
+            thread.start()
+            thread.join()
+        assert len(monitor._buffers) <= 1
+        monitor.flush()
+        assert monitor._buffers == []
+    assert monitor.call_counts() == {f"{__name__}._factorial": 15}
+
+
+def test_functions_without_code_are_rejected() -> None:
+    with pytest.raises(TypeError):
+        CallMonitor().add_function(len)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+
+from frostbound.instrumentation.profiler import ProfileResult, SamplingProfiler
+from frostbound.instrumentation.timer import Timer
+
+
+def _slow_block() -> None:
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_slow_block_is_sampled() -> None:
+    results: list[ProfileResult] = []
+    profiler = SamplingProfiler(interval_seconds=0.001, on_profile=results.append)
+    session = profiler.begin("slow")
+    _slow_block()
+    result = profiler.end(session)
+    assert result is not None
+    assert result.samples > 0
+    assert results == [result]
+    assert any("_slow_block" in stack for stack in result.stacks)
+    stack, count = result.stacks.most_common(1)[0]
+    assert result.collapsed_stacks().splitlines()[0] == f"{stack} {count}"
+
+
+def test_fast_block_is_not_sampled() -> None:
+    profiler = SamplingProfiler(threshold_seconds=10.0)
+    assert profiler.end(profiler.begin("fast")) is None
+
+
+def test_timer_keeps_profile_across_fast_blocks() -> None:
+    profiler = SamplingProfiler(interval_seconds=0.001, threshold_seconds=0.01)
+    timer: Timer[None] = Timer(name="step", profiler=profiler)
+    with timer:
+        _slow_block()
+    profile = timer.profile
+    assert profile is not None
+    with timer:
+        pass
+    assert timer.profile is profile
+
+
+def test_timed_function_profile() -> None:
+    profiler = SamplingProfiler(interval_seconds=0.001)
+    timer: Timer[None] = Timer(profiler=profiler)
+    timer(_slow_block)()
+    assert timer.profile is not None
+    assert timer.profile.name == "_slow_block"
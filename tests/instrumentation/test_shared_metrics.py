@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from frostbound.instrumentation.shared_metrics import SharedHistogramRegistry
+
+_registry: SharedHistogramRegistry | None = None
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> Iterator[SharedHistogramRegistry]:
+    global _registry
+    _registry = SharedHistogramRegistry(tmp_path / "metrics", slots=8, max_metrics=4)
+    yield _registry
+    _registry.close()
+    _registry = None
+
+
+def _work(value: int) -> None:
+    assert _registry is not None
+    _registry.counter("jobs").add()
+    _registry.counter("units").add(value)
+    _registry.histogram("work").record(value)
+
+
+# NOTE: Daemon threads left by other tests only trip the fork warning.
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+def test_counters_are_summed_across_a_fork_pool(registry: SharedHistogramRegistry) -> None:
+    registry.counter("jobs").add(100)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        pool.map(_work, range(1, 41), chunksize=1)
+    assert registry.collect_counters() == {"jobs": 140, "units": 820}
+    work = registry.collect_snapshot()["work"]
+    assert (work.count, work.sum, work.min, work.max) == (40, 820, 1, 40)
+    # NOTE: The inherited snapshot only covers this process.
+    assert "work" not in registry.snapshot()
+
+
+def test_registries_on_the_same_file_see_each_other(registry: SharedHistogramRegistry, tmp_path: Path) -> None:
+    registry.histogram("latency").record_many([10, 20, 30])
+    reader = SharedHistogramRegistry(tmp_path / "metrics")
+    try:
+        assert (reader.slots, reader.max_metrics) == (8, 4)
+        assert reader.collect_snapshot()["latency"].count == 3
+    finally:
+        reader.close()
+
+
+def test_metrics_past_the_limit_fall_back_to_private_memory(
+    registry: SharedHistogramRegistry, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level("WARNING"):
+        for index in range(6):
+            registry.counter(f"counter.{index}").add(index)
+    assert [registry.counter(f"counter.{index}").value for index in range(6)] == list(range(6))
+    assert registry.collect_counters() == {f"counter.{index}": index for index in range(4)}
+    assert caplog.records
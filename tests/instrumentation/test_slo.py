@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from frostbound.instrumentation.slo import SloObjective, SloStatus, SloTracker
+from frostbound.instrumentation.windows import WindowedHistogramRegistry
+from frostbound.resilience.retry import ExponentialBackoff, Retry, RetryPolicy, StopAfterAttempt
+
+
+def _tracker(
+    on_breach: Callable[[SloStatus], None] | None = None, on_recover: Callable[[SloStatus], None] | None = None
+) -> SloTracker:
+    registry = WindowedHistogramRegistry(interval_seconds=60.0, intervals=5)
+    return SloTracker(registry, on_breach=on_breach, on_recover=on_recover)
+
+
+def _policy(tracker: SloTracker) -> RetryPolicy:
+    return RetryPolicy(
+        stop=[StopAfterAttempt(3)],
+        wait=ExponentialBackoff(base_delay=0.0, jitter=0.0),
+        after_hooks=[tracker.retry_hook("fetch")],
+    )
+
+
+def test_breach_and_recover_callbacks() -> None:
+    breaches: list[SloStatus] = []
+    recoveries: list[SloStatus] = []
+    tracker = _tracker(on_breach=breaches.append, on_recover=recoveries.append)
+    objective = SloObjective("handler", threshold_ns=1_000, quantile=0.9, window_seconds=60.0)
+    tracker.add(objective)
+    histogram = tracker.registry.histogram("handler")
+
+    histogram.record_many([100] * 8 + [1_000_000] * 2)
+    (status,) = tracker.check()
+    assert status.breached
+    assert status.burn_rate == pytest.approx(2.0)
+    assert tracker.check()[0].breached
+    assert len(breaches) == 1
+
+    histogram.reset()
+    histogram.record_many([100] * 10)
+    assert not tracker.check()[0].breached
+    assert [status.objective for status in recoveries] == [objective]
+
+
+def test_min_count_prevents_breach() -> None:
+    tracker = _tracker()
+    tracker.add(SloObjective("handler", threshold_ns=1_000, window_seconds=60.0, min_count=5))
+    tracker.registry.histogram("handler").record(1_000_000)
+    assert not tracker.check()[0].breached
+
+
+def test_retry_hook_records_failed_attempts() -> None:
+    tracker = _tracker()
+    calls = 0
+
+    def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise ConnectionError("timeout")
+        return "ok"
+
+    assert Retry(policy=_policy(tracker))(fetch)() == "ok"
+    assert tracker.registry.histogram("fetch").count == 3
+
+
+def test_retry_hook_records_failed_async_attempts() -> None:
+    tracker = _tracker()
+
+    async def fetch() -> str:
+        raise ConnectionError("timeout")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(Retry(policy=_policy(tracker))(fetch)())
+    assert tracker.registry.histogram("fetch").count == 3
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+
+from frostbound.instrumentation.histogram import HistogramRegistry
+from frostbound.instrumentation.timer import Timer, timed, timer
+
+
+def _numbers() -> Iterator[int]:
+    yield from range(3)
+
+
+async def _anumbers() -> AsyncIterator[int]:
+    for number in range(3):
+        await asyncio.sleep(0)
+        yield number
+
+
+async def _collect(stream: AsyncIterator[int]) -> list[int]:
+    return [item async for item in stream]
+
+
+def _assert_streams(registry: HistogramRegistry, name: str, streams: int) -> None:
+    snapshot = registry.snapshot()
+    assert snapshot[f"{name}.first_item"].count == streams
+    assert snapshot[f"{name}.item"].count == 3 * streams
+    assert snapshot[f"{name}.items"].count == streams
+    assert snapshot[f"{name}.items"].sum == 3 * streams
+
+
+def test_timed_records_sync_and_async_streams() -> None:
+    registry = HistogramRegistry()
+    numbers = timed(name="sync", registry=registry)(_numbers)
+    anumbers = timed(name="async", registry=registry)(_anumbers)
+    assert list(numbers()) == [0, 1, 2]
+    assert list(numbers()) == [0, 1, 2]
+    assert asyncio.run(_collect(anumbers())) == [0, 1, 2]
+    _assert_streams(registry, "sync", streams=2)
+    _assert_streams(registry, "async", streams=1)
+
+
+def test_timer_times_the_stream_rather_than_its_creation() -> None:
+    registry = HistogramRegistry()
+    numbers = timer(_numbers, registry=registry)
+    anumbers = timer(_anumbers, registry=registry)
+    stream = numbers()
+    assert registry.snapshot()["_numbers.items"].count == 0
+    assert list(stream) == [0, 1, 2]
+    assert asyncio.run(_collect(anumbers())) == [0, 1, 2]
+    _assert_streams(registry, "_numbers", streams=1)
+    _assert_streams(registry, "_anumbers", streams=1)
+
+
+def test_timer_instance_decorates_generators() -> None:
+    registry = HistogramRegistry()
+    numbers = Timer[None](name="sync", registry=registry)(_numbers)
+    anumbers = Timer[None](name="async", registry=registry)(_anumbers)
+    assert list(numbers()) == [0, 1, 2]
+    assert asyncio.run(_collect(anumbers())) == [0, 1, 2]
+    _assert_streams(registry, "sync", streams=1)
+    _assert_streams(registry, "async", streams=1)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from frostbound.instrumentation.timer import Timer
+from frostbound.instrumentation.trace_events import TraceRecorder
+from frostbound.instrumentation.tracing import (
+    Tracer,
+    add_span_collector,
+    current_span,
+    propagate_context,
+    remove_span_collector,
+)
+
+
+class _CountingCollector:
+    def start(self) -> int:
+        return 0
+
+    def stop(self, _state: int) -> dict[str, int]:
+        return {"calls": 1}
+
+
+def _durations(recorder: TraceRecorder) -> list[dict[str, Any]]:
+    return [event for event in recorder.events() if event["ph"] in "BE"]
+
+
+def test_nested_timers_build_call_tree() -> None:
+    with Tracer() as tracer:
+        for _ in range(2):
+            with Timer(name="request"), Timer(name="parse"):
+                pass
+    tree = tracer.call_tree()
+    assert [(node.path, node.count) for node in tree] == [(("request",), 2), (("request", "parse"), 2)]
+    assert tree[0].inclusive_ns >= tree[1].inclusive_ns
+    assert current_span() is None
+
+
+def test_timers_do_not_trace_without_installed_tracer() -> None:
+    tracer = Tracer()
+    with Timer(name="request"):
+        pass
+    assert tracer.call_tree() == []
+
+
+def test_propagate_context_nests_spans_from_threads() -> None:
+    def item() -> None:
+        with Timer(name="item"):
+            pass
+
+    with Tracer() as tracer, tracer.span("batch"), ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(propagate_context(item)).result()
+    assert [node.path for node in tracer.call_tree()] == [("batch",), ("batch", "item")]
+
+
+def test_span_collectors_are_summed_per_node() -> None:
+    collector = _CountingCollector()
+    add_span_collector(collector)
+    try:
+        with Tracer() as tracer:
+            for _ in range(3):
+                with tracer.span("step"):
+                    pass
+    finally:
+        remove_span_collector(collector)
+    assert tracer.call_tree()[0].metrics == {"calls": 3}
+
+
+def test_recorder_exports_nested_events(tmp_path: Path) -> None:
+    with TraceRecorder() as recorder, Timer(name="outer"), Timer(name="inner"):
+        pass
+    events = _durations(recorder)
+    assert [(event["name"], event["ph"]) for event in events] == [
+        ("outer", "B"),
+        ("inner", "B"),
+        ("inner", "E"),
+        ("outer", "E"),
+    ]
+    path = tmp_path / "trace.json"
+    recorder.flush(path)
+    flushed = json.loads(path.read_text())["traceEvents"]
+    assert [event["ph"] for event in flushed] == ["M", "B", "B", "E", "E"]
+    assert recorder.events() == []
+
+
+def test_ring_buffer_drops_unmatched_end_events() -> None:
+    recorder = TraceRecorder(capacity=3)
+    with recorder.span("outer"):
+        for _ in range(2):
+            with recorder.span("inner"):
+                pass
+    events = _durations(recorder)
+    assert [(event["name"], event["ph"]) for event in events] == [("inner", "B"), ("inner", "E")]
+
+
+def test_threads_and_tasks_get_their_own_tracks() -> None:
+    recorder = TraceRecorder()
+
+    def work() -> None:
+        with recorder.span("thread"):
+            pass
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    async def task() -> None:
+        with recorder.span("task"):
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        await asyncio.gather(task(), task())
+
+    asyncio.run(main())
+    events = _durations(recorder)
+    assert len({event["tid"] for event in events}) == 4
+    assert all("task" in event["args"] for event in events if event["name"] == "task")
+
+
+def test_span_collector_metrics_are_exported_on_end_events() -> None:
+    collector = _CountingCollector()
+    add_span_collector(collector)
+    try:
+        recorder = TraceRecorder()
+        with recorder.span("step"):
+            pass
+    finally:
+        remove_span_collector(collector)
+    end = _durations(recorder)[-1]
+    assert end["args"] == {"calls": 1}
+
+
+def test_reading_events_does_not_consume_the_buffer() -> None:
+    recorder = TraceRecorder(capacity=4)
+    with recorder.span("step"):
+        pass
+    for _ in range(5):
+        recorder.events()
+    assert len(_durations(recorder)) == 2
+
+
+def test_flush_keeps_events_still_being_recorded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    recorder = TraceRecorder()
+    claimed, release = threading.Event(), threading.Event()
+    current_task = asyncio.current_task
+
+    def slow_current_task() -> asyncio.Task[Any] | None:
+        # NOTE: Called between claiming a slot and writing it.
+        if threading.current_thread().name == "slow":
+            claimed.set()
+            release.wait(timeout=10)
+        return current_task()
+
+    monkeypatch.setattr(asyncio, "current_task", slow_current_task)
+    slow = threading.Thread(target=recorder.record_begin, args=("slow", 0), name="slow")
+    slow.start()
+    assert claimed.wait(timeout=10)
+    with recorder.span("fast"):
+        pass
+
+    def flushed_names() -> list[str]:
+        path = tmp_path / "trace.json"
+        recorder.flush(path)
+        return [event["name"] for event in json.loads(path.read_text())["traceEvents"] if event["ph"] != "M"]
+
+    assert flushed_names() == ["fast", "fast"]
+    release.set()
+    slow.join()
+    assert flushed_names() == ["slow"]
+    assert flushed_names() == []
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, NoReturn
+
+import pytest
+
+from frostbound.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerError,
+    CircuitState,
+    RejectionLogAggregator,
+)
+
+
+def _fail() -> NoReturn:
+    raise ValueError("boom")
+
+
+def _open(breaker: CircuitBreaker[Any]) -> None:
+    for _ in range(breaker.state.failure_threshold):
+        with pytest.raises(ValueError):
+            breaker.execute(_fail)
+    assert breaker.state.is_open
+
+
+def test_opens_after_threshold_and_rejects() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=2)
+    _open(breaker)
+    with pytest.raises(CircuitBreakerError, match="_fail"):
+        breaker.execute(_fail)
+
+
+def test_half_open_after_reset_timeout_then_closes_on_success() -> None:
+    breaker: CircuitBreaker[int] = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0.0)
+    _open(breaker)
+    assert breaker.execute(lambda: 1) == 1
+    assert breaker.state.state is CircuitState.CLOSED
+
+
+def test_slow_call_is_recorded_as_failure() -> None:
+    breaker: CircuitBreaker[None] = CircuitBreaker(failure_threshold=1, slow_call_threshold_seconds=0.01)
+    breaker.execute(time.sleep, 0.02)
+    assert breaker.state.is_open
+
+
+def test_stream_records_failure_raised_midway() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1)
+
+    def numbers() -> Iterator[int]:
+        yield 1
+        raise ValueError("boom")
+
+    stream = breaker(numbers)()
+    assert next(stream) == 1
+    with pytest.raises(ValueError):
+        next(stream)
+    assert breaker.state.is_open
+
+
+def test_stream_ignores_time_spent_by_the_consumer() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1, slow_call_threshold_seconds=0.05)
+
+    def numbers() -> Iterator[int]:
+        yield from range(3)
+
+    for _ in breaker.stream(numbers):
+        time.sleep(0.03)
+    assert breaker.state.is_closed
+
+
+def test_stream_counts_time_spent_producing_items() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1, slow_call_threshold_seconds=0.02)
+
+    def numbers() -> Iterator[int]:
+        for number in range(2):
+            time.sleep(0.015)
+            yield number
+
+    assert list(breaker.stream(numbers)) == [0, 1]
+    assert breaker.state.is_open
+
+
+def test_stream_closed_early_records_nothing() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1)
+    closed = []
+
+    def numbers() -> Iterator[int]:
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    stream = breaker.stream(numbers)
+    next(stream)
+    stream.close()
+    assert closed == [True]
+    assert breaker.state.failure_count == 0
+
+
+def test_stream_async_ignores_time_spent_by_the_consumer() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1, slow_call_threshold_seconds=0.05)
+
+    async def numbers() -> AsyncIterator[int]:
+        for number in range(3):
+            yield number
+
+    async def consume() -> list[int]:
+        items = []
+        async for item in breaker(numbers)():
+            items.append(item)
+            await asyncio.sleep(0.03)
+        return items
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    assert breaker.state.is_closed
+
+
+def test_decorated_generators_stay_generator_functions() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker()
+
+    @breaker
+    def numbers() -> Iterator[int]:
+        yield from range(3)
+
+    @breaker
+    async def async_numbers() -> AsyncIterator[int]:
+        for number in range(3):
+            yield number
+
+    async def consume() -> list[int]:
+        return [item async for item in async_numbers()]
+
+    assert inspect.isgeneratorfunction(numbers)
+    assert inspect.isasyncgenfunction(async_numbers)
+    assert list(numbers()) == [0, 1, 2]
+    assert asyncio.run(consume()) == [0, 1, 2]
+
+
+def test_async_stream_closed_early_closes_the_generator() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1)
+    closed = []
+
+    @breaker
+    async def numbers() -> AsyncIterator[int]:
+        try:
+            for number in range(10):
+                yield number
+        finally:
+            closed.append(True)
+
+    async def consume() -> None:
+        stream = numbers()
+        await anext(stream)
+        await stream.aclose()
+
+    asyncio.run(consume())
+    assert closed == [True]
+    assert breaker.state.failure_count == 0
+
+
+def test_fast_reject_raises_fresh_errors() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1, fast_reject=True)
+    _open(breaker)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(CircuitBreakerError) as info:
+            breaker.execute(_fail)
+        errors.append(info.value)
+    assert errors[0] is not errors[1]
+    assert breaker.rejections.total_rejected_count == 2
+
+
+def test_fast_reject_uses_fallback() -> None:
+    breaker: CircuitBreaker[str] = CircuitBreaker(failure_threshold=1, fast_reject=True, fallback=lambda: "cached")
+    with pytest.raises(ValueError):
+        breaker.execute(_fail)
+    assert breaker.execute(_fail) == "cached"
+
+
+def test_fast_reject_async() -> None:
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1, fast_reject=True)
+    _open(breaker)
+
+    async def call() -> None:
+        await breaker.execute_async(asyncio.sleep, 0)
+
+    with pytest.raises(CircuitBreakerError):
+        asyncio.run(call())
+
+
+def test_rejection_log_aggregator_summarizes_per_interval(caplog: pytest.LogCaptureFixture) -> None:
+    aggregator = RejectionLogAggregator(interval_seconds=10.0)
+    with caplog.at_level("WARNING"):
+        for now in (100.0, 101.0, 102.0, 111.0):
+            aggregator.record(now)
+    assert len(caplog.records) == 2
+    assert "rejected 3 calls" in caplog.records[1].getMessage()
+    assert aggregator.total_rejected_count == 4
+    assert aggregator.rejected_count == 0
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from frostbound.resilience.circuit_breaker import CircuitBreaker, CircuitState
+from frostbound.resilience.persistence import SNAPSHOT_FORMAT_VERSION, CircuitBreakerSnapshot, CircuitBreakerStore
+
+
+def _snapshot(**overrides: object) -> dict[str, object]:
+    now = time.time()
+    data: dict[str, object] = {"state": "OPEN", "failure_count": 5, "last_failure_time": now, "saved_at": now}
+    data.update(overrides)
+    return data
+
+
+def _write(path: Path, breakers: object) -> None:
+    path.write_text(json.dumps({"version": SNAPSHOT_FORMAT_VERSION, "breakers": breakers}))
+
+
+def test_save_and_restore_open_circuit(tmp_path: Path) -> None:
+    path = tmp_path / "breakers.json"
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=1)
+    breaker.state.record_failure()
+    store = CircuitBreakerStore(path)
+    store.register("payments", breaker)
+    store.save()
+
+    restored: CircuitBreaker[object] = CircuitBreaker(failure_threshold=3)
+    CircuitBreakerStore(path).register("payments", restored)
+    assert restored.state.state is CircuitState.OPEN
+    assert restored.state.failure_count == 3
+    assert restored.state.last_failure_time == breaker.state.last_failure_time
+
+
+def test_closed_failure_count_decays() -> None:
+    store = CircuitBreakerStore("unused.json", failure_half_life_seconds=10.0)
+    breaker: CircuitBreaker[object] = CircuitBreaker(failure_threshold=10)
+    snapshot = CircuitBreakerSnapshot(state="CLOSED", failure_count=8, last_failure_time=100.0, saved_at=100.0)
+    store.apply(breaker.state, snapshot, now=120.0)
+    assert breaker.state.is_closed
+    assert breaker.state.failure_count == 2
+
+
+def test_stale_snapshot_is_ignored() -> None:
+    store = CircuitBreakerStore("unused.json", max_age_seconds=60.0)
+    breaker: CircuitBreaker[object] = CircuitBreaker()
+    snapshot = CircuitBreakerSnapshot(state="OPEN", failure_count=5, last_failure_time=0.0, saved_at=0.0)
+    store.apply(breaker.state, snapshot, now=61.0)
+    assert breaker.state.is_closed
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        ["OPEN"],
+        {"state": "OPEN"},
+        _snapshot(extra=1),
+        _snapshot(state=1),
+        _snapshot(failure_count=True),
+        _snapshot(failure_count="5"),
+        _snapshot(saved_at=float("nan")),
+        _snapshot(last_failure_time=None),
+    ],
+)
+def test_from_dict_rejects_malformed_snapshots(data: object) -> None:
+    with pytest.raises(ValueError):
+        CircuitBreakerSnapshot.from_dict(data)
+
+
+def test_load_skips_malformed_entries(tmp_path: Path) -> None:
+    path = tmp_path / "breakers.json"
+    _write(path, {"good": _snapshot(), "bad": _snapshot(failure_count="many")})
+    assert list(CircuitBreakerStore(path).load()) == ["good"]
+
+
+@pytest.mark.parametrize(
+    "content", ["not json", json.dumps({"version": 999}), json.dumps({"version": 1, "breakers": []})]
+)
+def test_load_ignores_unusable_files(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "breakers.json"
+    path.write_text(content)
+    assert CircuitBreakerStore(path).load() == {}
+
+
+def test_failed_save_leaves_no_temp_file(tmp_path: Path) -> None:
+    store = CircuitBreakerStore(tmp_path / "breakers.json")
+    store.register("payments", CircuitBreaker(), restore=False)
+    with mock.patch("os.replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+        store.save()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stop_writes_final_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "breakers.json"
+    with CircuitBreakerStore(path, snapshot_interval_seconds=60.0) as store:
+        store.register("payments", CircuitBreaker(), restore=False)
+    assert set(json.loads(path.read_text())["breakers"]) == {"payments"}
+
+
+def test_save_keeps_snapshots_of_other_breakers(tmp_path: Path) -> None:
+    path = tmp_path / "breakers.json"
+    _write(path, {"search": _snapshot(), "expired": _snapshot(saved_at=0.0)})
+    store = CircuitBreakerStore(path)
+    store.register("payments", CircuitBreaker())
+    # NOTE: Written by another process after this one loaded the file.
+    _write(path, {"search": _snapshot(), "expired": _snapshot(saved_at=0.0), "ledger": _snapshot()})
+    store.save()
+    assert set(json.loads(path.read_text())["breakers"]) == {"search", "ledger", "payments"}
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from frostbound.resilience.retry import ExponentialBackoff, Retry, RetryError, RetryPolicy, StopAfterAttempt
+
+
+def _policy() -> RetryPolicy:
+    return RetryPolicy(stop=[StopAfterAttempt(3)], wait=ExponentialBackoff(base_delay=0.0, jitter=0.0), reraise=False)
+
+
+def test_failed_attempts_count_in_execution_times() -> None:
+    def fetch() -> str:
+        time.sleep(0.01)
+        raise ConnectionError("timeout")
+
+    with pytest.raises(RetryError) as info:
+        Retry(policy=_policy())(fetch)()
+    statistics = info.value.state.statistics
+    assert statistics.attempts == 3
+    assert len(statistics.execution_times) == 3
+    assert statistics.average_execution_time >= 0.01